@@ -0,0 +1,265 @@
+"""
+Benchmark cases. Every case takes a repeat scale factor (1.0 = default sample count) and returns a measure() dict.
+All cases run on the CPU and never import pygame.
+"""
+import os
+import random
+import tempfile
+import numpy as np
+import torch
+from physics.vec2 import vec2
+from physics.aabb import aabb
+from physics.circle import circle
+from game.breakout_sim import breakout_sim, paddle_move, WinState
+from game.constants import *
+import learning.agent as agent_module
+from learning.agent import Agent, to_state_vector, to_reward, BATCH_SIZE, STATE_SIZE
+from learning.encoder import StateEncoder
+from learning.env import SyncVectorEnv, AsyncVectorEnv
+from game.vector_sim import vector_sim
+from display.raster import pixel_renderer, vector_pixel_renderer
+from learning.inference import InferencePolicy
+from learning.model import QTrainer
+from harness import case, measure
+
+CPU = torch.device('cpu')
+SIM_BRICK_ROWS = (1, BRICK_ROWS, 12, 24)
+SIM_STEPS_PER_SAMPLE = 500
+SEED = 0
+NO_EXPLORATION_GAMES = 10**9
+VECTOR_ENVS = 16
+VECTOR_WORKERS = 4
+
+def _n(base: int, scale: float) -> int:
+    return max(1, round(base * scale))
+
+def _seed_everything(seed: int = SEED):
+    random.seed(seed)
+    np.random.seed(seed)
+    torch.manual_seed(seed)
+
+def _make_game(brick_rows: int = BRICK_ROWS, continuous: bool = True) -> breakout_sim:
+    return breakout_sim(size=SCREEN_SIZE, brick_rows=brick_rows, brick_size=BRICK_SIZE, paddle_size=PADDLE_SIZE,
+                        ball_radius=BALL_RADIUS, paddle_vel=PADDLE_SPEED, continuous=continuous)
+
+def _make_agent() -> Agent:
+    agent = Agent(device=CPU, act_device=CPU, seed=SEED)
+    agent.n_games = NO_EXPLORATION_GAMES  # always take the model's action
+    return agent
+
+def _count_constructions(classes, fn) -> dict:
+    """Run fn with the constructors of classes wrapped to count instances; returns {class name: count}."""
+    counts = {cls.__name__: 0 for cls in classes}
+    originals = {cls: cls.__init__ for cls in classes}
+    for cls, original in originals.items():
+        def counting_init(self, *args, _original=original, _name=cls.__name__, **kwargs):
+            counts[_name] += 1
+            _original(self, *args, **kwargs)
+        cls.__init__ = counting_init
+    try:
+        fn()
+    finally:
+        for cls, original in originals.items():
+            cls.__init__ = original
+    return counts
+
+def _sim_stepper(brick_rows: int, continuous: bool, dt: float):
+    """A callable running SIM_STEPS_PER_SAMPLE ball-tracking steps, starting a new game whenever one ends."""
+    game = _make_game(brick_rows, continuous)
+    left, stay, right = paddle_move.LEFT, paddle_move.STAY, paddle_move.RIGHT
+
+    def run():
+        for _ in range(SIM_STEPS_PER_SAMPLE):
+            dx = game.ball.position.x - game.paddle.position.x
+            game.step(dt, left if dx < 0 else right if dx > 0 else stay)
+            if game.win_state != WinState.ONGOING:
+                game.reset()
+    return run
+
+def _register_sim_cases():
+    for rows in SIM_BRICK_ROWS:
+        @case(f"sim.step[continuous,rows={rows}]")
+        def sim_step(scale: float, rows=rows) -> dict:
+            run = _sim_stepper(rows, continuous=True, dt=TRAIN_SIM_DT)
+            result = measure(run, repeats=_n(30, scale))
+            return _per_step(result)
+
+_register_sim_cases()
+
+@case(f"sim.step[discrete,rows={BRICK_ROWS}]")
+def sim_step_discrete(scale: float) -> dict:
+    run = _sim_stepper(BRICK_ROWS, continuous=False, dt=SIM_DT)
+    result = _per_step(measure(run, repeats=_n(30, scale)))
+    counts = _count_constructions([vec2, aabb, circle], _sim_stepper(BRICK_ROWS, continuous=False, dt=SIM_DT))
+    result['allocations_per_step'] = {name: n / SIM_STEPS_PER_SAMPLE for name, n in counts.items()}
+    return result
+
+def _per_step(result: dict) -> dict:
+    """Rescale a result timed over SIM_STEPS_PER_SAMPLE steps to per-step figures."""
+    for key in ('median_us', 'p99_us', 'min_us'):
+        result[key] /= SIM_STEPS_PER_SAMPLE
+    result['ops_per_sec'] *= SIM_STEPS_PER_SAMPLE
+    result['number'] *= SIM_STEPS_PER_SAMPLE
+    return result
+
+def _mid_game() -> breakout_sim:
+    """A game a few hundred ticks in, so some bricks are gone."""
+    _seed_everything()
+    game = _make_game()
+    for i in range(300):
+        game.step(TRAIN_SIM_DT, paddle_move.LEFT if i % 2 else paddle_move.RIGHT)
+        if game.win_state != WinState.ONGOING:
+            break
+    return game
+
+@case("to_state_vector")
+def bench_to_state_vector(scale: float) -> dict:
+    game = _mid_game()
+    return measure(lambda: to_state_vector(game.game_state()), repeats=_n(50, scale), number=200)
+
+@case("StateEncoder.encode")
+def bench_encoder(scale: float) -> dict:
+    encoder = StateEncoder(_mid_game())
+    return measure(encoder.encode, repeats=_n(50, scale), number=1000)
+
+@case("to_reward")
+def bench_to_reward(scale: float) -> dict:
+    game = _mid_game()
+    old = game.game_state()
+    game.step(TRAIN_SIM_DT, paddle_move.STAY)
+    new = game.game_state()
+    return measure(lambda: to_reward(new, old), repeats=_n(50, scale), number=1000)
+
+@case("Agent.get_action")
+def bench_get_action(scale: float) -> dict:
+    _seed_everything()
+    game = _mid_game()
+    encoder = StateEncoder(game)
+    agent = _make_agent()
+    state = encoder.encode().copy()
+    game_state = game.game_state()
+    return measure(lambda: agent.get_action(state, game_state), repeats=_n(50, scale), number=100)
+
+@case("InferencePolicy.act_one[numpy]")
+def bench_policy_numpy(scale: float) -> dict:
+    policy = InferencePolicy(_make_agent().model, backend='numpy')
+    state = np.random.default_rng(SEED).random(STATE_SIZE, dtype=np.float32)
+    return measure(lambda: policy.act_one(state), repeats=_n(50, scale), number=100)
+
+@case("InferencePolicy.act[eager,batch=64]")
+def bench_policy_batch(scale: float) -> dict:
+    policy = InferencePolicy(_make_agent().model, backend='eager', max_batch=64)
+    states = np.random.default_rng(SEED).random((64, STATE_SIZE), dtype=np.float32)
+    return measure(lambda: policy.act(states), repeats=_n(50, scale), number=20)
+
+def _random_batch(rng: np.random.Generator, n: int) -> tuple:
+    return (rng.random((n, STATE_SIZE), dtype=np.float32), rng.integers(0, 3, n), rng.random(n, dtype=np.float32),
+            rng.random((n, STATE_SIZE), dtype=np.float32), rng.random(n) < 0.01)
+
+@case(f"Agent.train_long_memory[batch={BATCH_SIZE}]")
+def bench_train_long_memory(scale: float) -> dict:
+    _seed_everything()
+    agent = _make_agent()
+    agent.memory.extend(*_random_batch(np.random.default_rng(SEED), 10 * BATCH_SIZE))
+    return measure(agent.train_long_memory, repeats=_n(30, scale), warmup=3)
+
+def _loop_train_step(trainer: QTrainer, state, action, reward, next_state, done):
+    # The pre-vectorisation QTrainer.train_step, kept as a baseline for the batched version
+    device = trainer._device
+    state = torch.tensor(np.array(state), dtype=torch.float, device=device)
+    next_state = torch.tensor(np.array(next_state), dtype=torch.float, device=device)
+    action = torch.tensor(np.array(action), dtype=torch.long, device=device)
+    reward = torch.tensor(np.array(reward), dtype=torch.float, device=device)
+    pred = trainer.model(state)
+    target = pred.clone()
+    for idx in range(len(done)):
+        q_new = reward[idx]
+        if not done[idx]:
+            q_new = reward[idx] + trainer.gamma * torch.max(trainer.model(next_state[idx]))
+        target[idx][action[idx].item()] = q_new
+    trainer.optimizer.zero_grad()
+    loss = trainer.criterion(target, pred)
+    loss.backward()
+    trainer.optimizer.step()
+
+@case(f"QTrainer.train_step.loop_baseline[batch={BATCH_SIZE}]")
+def bench_loop_train_step(scale: float) -> dict:
+    _seed_everything()
+    trainer = _make_agent().trainer
+    batch = _random_batch(np.random.default_rng(SEED), BATCH_SIZE)
+    return measure(lambda: _loop_train_step(trainer, *batch), repeats=_n(5, scale))
+
+@case("pixel_renderer.render[84x84]")
+def bench_pixel_renderer(scale: float) -> dict:
+    renderer = pixel_renderer(_mid_game())
+    return measure(renderer.render, repeats=_n(30, scale), number=200)
+
+@case(f"vector_pixel_renderer.render[n={VECTOR_ENVS},84x84]")
+def bench_vector_pixel_renderer(scale: float) -> dict:
+    sim = vector_sim(VECTOR_ENVS, SCREEN_SIZE, BRICK_ROWS, BRICK_SIZE, PADDLE_SIZE, BALL_RADIUS, PADDLE_SPEED, BALL_INITIAL_VEL)
+    rng = np.random.default_rng(SEED)
+    for _ in range(500):  # spread the games out and break some bricks
+        sim.step(SIM_DT, rng.integers(-1, 2, VECTOR_ENVS))
+    renderer = vector_pixel_renderer(sim)
+    result = measure(renderer.render, repeats=_n(30, scale), number=50)
+    result['frames_per_sec'] = VECTOR_ENVS * result['ops_per_sec']
+    return result
+
+def _bench_vector_env(vec, scale: float) -> dict:
+    """Time vec.step with random actions (no copies), reporting env steps per second across all games."""
+    rng = np.random.default_rng(SEED)
+    actions = rng.integers(0, 3, (64, vec.num_envs))
+    i = [0]
+
+    def step():
+        vec.step(actions[i[0] % len(actions)])
+        i[0] += 1
+    with vec:
+        vec.reset(seed=SEED)
+        result = measure(step, repeats=_n(30, scale), number=20)
+    result['env_steps_per_sec'] = vec.num_envs * result['ops_per_sec']
+    return result
+
+@case(f"SyncVectorEnv.step[n={VECTOR_ENVS}]")
+def bench_sync_vector_env(scale: float) -> dict:
+    return _bench_vector_env(SyncVectorEnv(VECTOR_ENVS, copy=False), scale)
+
+@case(f"AsyncVectorEnv.step[n={VECTOR_ENVS},workers={VECTOR_WORKERS}]")
+def bench_async_vector_env(scale: float) -> dict:
+    return _bench_vector_env(AsyncVectorEnv(VECTOR_ENVS, num_workers=VECTOR_WORKERS, copy=False), scale)
+
+@case("train.episode[seed=0]")
+def bench_train_episode(scale: float) -> dict:
+    """One full train() episode from a fresh model, counting env steps through breakout_sim.step_n."""
+    steps = [0]
+    original_step_n = breakout_sim.step_n
+
+    def counting_step_n(self, dt, action, n):
+        broken, gs = original_step_n(self, dt, action, n)
+        steps[0] += 1
+        return broken, gs
+
+    def episode():
+        # a clean directory per repeat, so no repeat loads the model or checkpoint an earlier one saved
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as scratch:
+            os.chdir(scratch)
+            try:
+                _seed_everything()
+                agent_module.train(device=CPU, act_device=CPU, plot_mode='none', stats_log=None, seed=SEED)
+            finally:
+                os.chdir(cwd)
+
+    episodes = _n(3, scale)
+    breakout_sim.step_n = counting_step_n
+    saved_episodes = agent_module.NUM_EPISODES
+    agent_module.NUM_EPISODES = 1
+    try:
+        result = measure(episode, repeats=episodes, warmup=0)
+    finally:
+        breakout_sim.step_n = original_step_n
+        agent_module.NUM_EPISODES = saved_episodes
+    env_steps = steps[0] / episodes
+    result['env_steps_per_episode'] = env_steps
+    result['env_steps_per_sec'] = env_steps * result['ops_per_sec']
+    return result
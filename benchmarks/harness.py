@@ -0,0 +1,39 @@
+"""
+Timing helpers for the benchmark suite.
+
+A case is a function returning a measure() result dict; @case registers it under a name in CASES.
+"""
+import math
+from statistics import median
+from time import perf_counter
+
+CASES = {}
+
+def case(name: str):
+    def register(fn):
+        CASES[name] = fn
+        return fn
+    return register
+
+def percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile, q in [0, 100]."""
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+def measure(fn, repeats: int, number: int = 1, warmup: int = 1, **extra) -> dict:
+    """
+    Call fn() warmup times, then time repeats samples of number calls each.
+    Times are reported per call in microseconds; ops_per_sec is derived from the median. Extra keys are passed through.
+    """
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeats):
+        start = perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((perf_counter() - start) / number * 1e6)
+    med = median(samples)
+    return dict(repeats=repeats, number=number, median_us=med, p99_us=percentile(samples, 99), min_us=min(samples),
+                ops_per_sec=1e6 / med if med > 0 else float('inf'), **extra)
@@ -0,0 +1,107 @@
+"""
+Headless benchmark runner. Times the sim, state encoding, reward, action selection, replay training and a full
+training episode on the CPU, prints median / p99 / ops per second and saves the results as JSON.
+
+Run:
+    PYTHONPATH=src python benchmarks/run.py                       # everything, results in benchmarks/results/
+    PYTHONPATH=src python benchmarks/run.py -k sim.step --scale 0.2
+    PYTHONPATH=src python benchmarks/run.py --compare benchmarks/results/<older>.json
+"""
+import os
+import sys
+
+# CPU only, no window: set before torch / matplotlib are imported, and make any pygame import fail loudly
+os.environ['CUDA_VISIBLE_DEVICES'] = ''
+os.environ['BREAKOUT_DEVICE'] = 'cpu'
+os.environ['BREAKOUT_ACT_DEVICE'] = 'cpu'
+os.environ.setdefault('MPLBACKEND', 'Agg')
+sys.modules['pygame'] = None
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import subprocess
+import tempfile
+from datetime import datetime
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+def _git_revision() -> str:
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+def _metadata(threads: int) -> dict:
+    import numpy as np
+    import torch
+    return dict(revision=_git_revision(), timestamp=datetime.now().isoformat(timespec='seconds'), python=platform.python_version(),
+                numpy=np.__version__, torch=torch.__version__, machine=platform.machine(), processor=platform.processor(),
+                cpu_count=os.cpu_count(), torch_threads=threads)
+
+def _print_row(name: str, result: dict, baseline: dict | None = None):
+    line = f"{name:<48} median {result['median_us']:>12.2f} us   p99 {result['p99_us']:>12.2f} us   {result['ops_per_sec']:>12.1f} /s"
+    if baseline is not None:
+        line += f"   x{baseline['median_us'] / result['median_us']:.2f} vs baseline"
+    print(line)
+
+def run_cases(names: list[str], scale: float, verbose: bool):
+    """Yield (name, result) for each case, run from a scratch directory."""
+    from harness import CASES
+    # Cases may create ./model or ./plots; keep them out of the working tree
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as scratch:
+        os.chdir(scratch)
+        try:
+            for name in names:
+                quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+                with quiet:
+                    result = CASES[name](scale)
+                yield name, result
+        finally:
+            os.chdir(cwd)
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the CPU benchmark suite.")
+    parser.add_argument('-k', '--filter', default='', help='Only run cases whose name contains this substring')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every case\'s sample count (e.g. 0.2 for a quick run)')
+    parser.add_argument('--threads', type=int, default=1, help='torch intra-op threads (default 1 for stable numbers)')
+    parser.add_argument('--out', default=None, help='JSON output path (default: benchmarks/results/<timestamp>-<revision>.json)')
+    parser.add_argument('--compare', default=None, help='Earlier JSON result to compare medians against')
+    parser.add_argument('--list', action='store_true', help='List case names and exit')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Show output printed by the code under test')
+    args = parser.parse_args()
+
+    import torch
+    import cases  # registers the cases
+    from harness import CASES
+
+    names = [name for name in CASES if args.filter in name]
+    if args.list:
+        print("\n".join(names))
+        return
+    torch.set_num_threads(args.threads)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+
+    meta = _metadata(args.threads)
+    results = {}
+    for name, result in run_cases(names, args.scale, args.verbose):
+        results[name] = result
+        _print_row(name, result, baseline.get(name))
+
+    out = args.out or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{meta['revision']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, 'w') as f:
+        json.dump(dict(meta=meta, scale=args.scale, results=results), f, indent=2)
+    print(f"Saved {out}")
+
+if __name__ == "__main__":
+    main()
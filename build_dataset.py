@@ -0,0 +1,35 @@
+"""
+Generate an offline transition dataset for train_agent.py --dataset.
+
+Run:
+    PYTHONPATH=src python build_dataset.py DIR -n 1000000 --workers 4
+"""
+import argparse
+import os
+from time import time
+from learning.agent import ACTION_REPEAT
+from learning.dataset import build_dataset, SHARD_SIZE, RANDOM_MOVES
+
+def main():
+    parser = argparse.ArgumentParser(description="Play the scripted policy headlessly and store its transitions as memory-mapped shards.")
+    parser.add_argument('directory', help='Output directory')
+    parser.add_argument('-n', '--transitions', type=int, required=True, help='Number of transitions to generate')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Worker processes (0 = generate in this process)')
+    parser.add_argument('--shard-size', type=int, default=SHARD_SIZE, help='Transitions per shard')
+    parser.add_argument('--seed', type=int, default=0, help='Shard k plays from seed + k')
+    parser.add_argument('--action-repeat', type=int, default=ACTION_REPEAT, help='Sim ticks per transition')
+    parser.add_argument('--random-moves', type=float, default=RANDOM_MOVES, help='Share of random moves mixed into the scripted policy')
+    args = parser.parse_args()
+    if args.action_repeat < 1:
+        parser.error("--action-repeat must be at least 1")
+
+    start = time()
+    meta = build_dataset(args.directory, args.transitions, num_workers=args.workers, shard_size=args.shard_size, seed=args.seed,
+                         action_repeat=args.action_repeat, random_moves=args.random_moves)
+    elapsed = time() - start
+    episodes = sum(s['episodes'] for s in meta['shards'])
+    print(f"{meta['transitions']} transitions in {len(meta['shards'])} shards ({episodes} finished episodes), "
+          f"{elapsed:.1f}s, {meta['transitions'] / elapsed:.0f} transitions/s")
+
+if __name__ == "__main__":
+    main()
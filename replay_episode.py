@@ -0,0 +1,45 @@
+"""
+Inspect episodes recorded with train_agent.py --record DIR.
+
+Run:
+    PYTHONPATH=src python replay_episode.py DIR --list               # one line per episode
+    PYTHONPATH=src python replay_episode.py DIR -e 3 --speed 4       # watch episode 3 at 4x
+    PYTHONPATH=src python replay_episode.py DIR --check              # re-simulate every episode headlessly
+"""
+import argparse
+from game.recording import episode_recording
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay or verify recorded Breakout episodes.")
+    parser.add_argument('directory', help='Recording directory')
+    parser.add_argument('-e', '--episode', type=int, default=-1, help='Episode to show (default: the last one)')
+    parser.add_argument('--speed', type=float, default=1.0, help='Playback speed relative to game time (0 = no waiting)')
+    parser.add_argument('--list', action='store_true', help='List the recorded episodes and exit')
+    parser.add_argument('--check', action='store_true', help='Re-simulate episodes from seed + moves and report any divergence')
+    args = parser.parse_args()
+
+    recording = episode_recording(args.directory)
+    episodes = range(len(recording))
+    if args.list:
+        for i in episodes:
+            e = recording.episodes[i]
+            print(f"{i:5d} seed={e['seed']} steps={e['steps']} t={e['game_time']:.2f} bricks={e['bricks_broken']} {e['result']}")
+        return
+    if args.check:
+        selected = episodes if args.episode == -1 else [args.episode]
+        diverged = 0
+        for i in selected:
+            step = recording.resimulate(i)
+            if step is not None:
+                diverged += 1
+                print(f"episode {i}: diverges at step {step} of {recording.episodes[i]['steps']}")
+        print(f"{len(selected) - diverged}/{len(selected)} episodes reproduce exactly")
+        return
+
+    from display.replay import replay_episode
+    import pygame
+    replay_episode(recording, episodes[args.episode], speed=args.speed)
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
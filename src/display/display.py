@@ -8,6 +8,9 @@ class breakout_display:
     """
     Lightweight pygame renderer / input helper for breakout_sim.
     Tolerates current inconsistencies in the codebase (vec2 vs aabb for paddle/brick).
+
+    The brick field is drawn once onto a cached background surface and patched per brick as bricks are hit.
+    Each frame only the old and new paddle/ball/status areas are redrawn and pushed with pygame.display.update(rects).
     """
 
     def __init__(self, game: breakout_sim, scale: int = 1, caption: str = "Breakout"):
@@ -29,9 +32,40 @@ class breakout_display:
             "ball": (250, 250, 250),
             "text": (240, 240, 240),
         }
+        self._background = None     # bg + brick field, rebuilt on reset
+        self._dirty_bricks = []     # screen rects of bricks patched since the last frame
+        self._last_rects = []       # paddle/ball/status rects drawn last frame
+        self._status_key = None
+        self._status_surface = None
+        self.game = None
+        self.reset(game)
 
     def reset(self, new_game: breakout_sim):
+        self.close()
         self.game = new_game
+        new_game.brick_hit_listeners.append(self._on_brick_hit)
+        new_game.reset_listeners.append(self._on_reset)
+        self._background = None  # full redraw on the next frame
+
+    def invalidate_brick(self, b):
+        """Repaint one brick on the cached background; it reaches the screen with the next render()."""
+        if not pygame or self._background is None:
+            return
+        color = self.colors["brick"] if b.alive else self.colors["brick_dead"]
+        self._dirty_bricks.append(self._draw_rect(self._brick_top_left(b), self.game.brick_size, color, self._background))
+
+    def _on_brick_hit(self, b):
+        self.invalidate_brick(b)
+
+    def _on_reset(self, game: breakout_sim):
+        self._background = None
+
+    def _build_background(self):
+        self._background = pygame.Surface(self._screen.get_size())
+        self._background.fill(self.colors["bg"])
+        for br in self.game.bricks:
+            color = self.colors["brick"] if br.alive else self.colors["brick_dead"]
+            self._draw_rect(self._brick_top_left(br), self.game.brick_size, color, self._background)
 
     # ------------- helpers -------------
     def _scale_pos(self, v: vec2) -> tuple[int, int]:
@@ -40,20 +74,20 @@ class breakout_display:
     def _draw_aabb(self, box, color):
         if not pygame:
             return
-        self._draw_rect(box.min, box.max - box.min, color)
+        return self._draw_rect(box.min, box.max - box.min, color)
 
-    def _draw_rect(self, top_left: vec2, size: vec2, color):
+    def _draw_rect(self, top_left: vec2, size: vec2, color, surface=None):
         if not pygame:
             return
         x, y = self._scale_pos(top_left)
         w, h = int(size.x * self.scale), int(size.y * self.scale)
-        pygame.draw.rect(self._screen, color, pygame.Rect(x, y, w, h))
+        return pygame.draw.rect(surface or self._screen, color, pygame.Rect(x, y, w, h))
 
     def _draw_ball(self, center: vec2, radius: float, color):
         if not pygame:
             return
         cx, cy = self._scale_pos(center)
-        pygame.draw.circle(self._screen, color, (cx, cy), int(radius * self.scale))
+        return pygame.draw.circle(self._screen, color, (cx, cy), int(radius * self.scale))
 
     def _brick_top_left(self, b) -> vec2:
         # Brick.position may be:
@@ -92,31 +126,49 @@ class breakout_display:
         if not pygame:
             return
         gs = self.game.game_state()
-        self._screen.fill(self.colors["bg"])
-
-        # Draw bricks
-        for br in gs.bricks:
-            top_left = self._brick_top_left(br)
-            color = self.colors["brick"] if br.alive else self.colors["brick_dead"]
-            self._draw_rect(top_left, self.game.brick_size, color)
+        full_redraw = self._background is None
+        if full_redraw:
+            self._build_background()
+            self._screen.blit(self._background, (0, 0))
+            self._dirty_bricks.clear()
+            dirty = []
+        else:
+            # Erase last frame's moving objects and patch changed bricks from the cached background
+            dirty = self._last_rects + self._dirty_bricks
+            for rect in dirty:
+                self._screen.blit(self._background, rect, rect)
+            self._dirty_bricks.clear()
 
         # Draw paddle
-        self._draw_aabb(self.game.paddle.aabb(), self.colors["paddle"])
+        paddle_rect = self._draw_aabb(self.game.paddle.aabb(), self.colors["paddle"])
 
         # Draw ball
         ball_obj = gs.ball
         # ball may expose .position or .shape.center
         center = getattr(ball_obj, "position", getattr(ball_obj.shape, "center", vec2(0, 0)))
         radius = getattr(ball_obj, "radius", getattr(ball_obj.shape, "radius", self.game.ball_radius))
-        self._draw_ball(center, radius, self.colors["ball"])
+        ball_rect = self._draw_ball(center, radius, self.colors["ball"])
+        self._last_rects = [paddle_rect, ball_rect]
 
-        # Status text
+        # Status text, only re-rendered when it changes
         if self._font:
-            status = f"Bricks:{sum(b.alive for b in gs.bricks)}  State:{gs.win_state.name}"
-            txt = self._font.render(status, True, self.colors["text"])
-            self._screen.blit(txt, (6, 4))
-
-        pygame.display.flip()
+            status_key = (gs.num_bricks_left(), gs.win_state)
+            if status_key != self._status_key:
+                status = f"Bricks:{status_key[0]}  State:{status_key[1].name}"
+                self._status_surface = self._font.render(status, True, self.colors["text"])
+                self._status_key = status_key
+            self._last_rects.append(self._screen.blit(self._status_surface, (6, 4)))
+
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update(dirty + self._last_rects)
+
+    def close(self):
+        """Stop listening to the current game."""
+        if self.game is not None and self._on_brick_hit in self.game.brick_hit_listeners:
+            self.game.brick_hit_listeners.remove(self._on_brick_hit)
+            self.game.reset_listeners.remove(self._on_reset)
 
     def run_blocking(self, fps: int = 60):
         """
@@ -0,0 +1,239 @@
+"""
+Headless NumPy rasterizer for pixel observations.
+
+Draws the brick field, paddle and ball into small grayscale uint8 frames (FRAME_HEIGHT x FRAME_WIDTH by default)
+without pygame. The brick field is kept as a cached layer that is patched when a brick breaks, so a frame costs one
+copy of that layer plus two small box fills. Edges are rounded to the nearest pixel, so neighbouring bricks never share
+a pixel and clearing one can't eat into the next.
+
+pixel_renderer follows one breakout_sim, vector_pixel_renderer renders every game of a vector_sim in one batch, and
+frame_stack keeps the last few frames as a (depth, height, width) view for frame-stacked observations.
+"""
+import numpy as np
+from game.breakout_sim import breakout_sim
+from game.vector_sim import vector_sim
+
+FRAME_HEIGHT = 84
+FRAME_WIDTH = 84
+FRAME_STACK = 4
+# Gray levels
+BACKGROUND_LEVEL = 0
+BRICK_LEVEL = 96
+PADDLE_LEVEL = 192
+BALL_LEVEL = 255
+
+def _pixel_span(lo, hi, scale: float, limit: int):
+    """Pixel range [start, stop) covering world range [lo, hi): rounded edges, at least one pixel, clipped to the frame."""
+    start = np.rint(np.asarray(lo) * scale).astype(np.int64)
+    stop = np.maximum(np.rint(np.asarray(hi) * scale).astype(np.int64), start + 1)
+    return np.clip(start, 0, limit), np.clip(stop, 0, limit)
+
+def _span(lo: float, hi: float, scale: float, limit: int) -> tuple[int, int]:
+    """_pixel_span for one range, in plain Python (NumPy's per-call overhead dominates at this size)."""
+    start = round(lo * scale)
+    stop = max(round(hi * scale), start + 1)
+    return min(max(start, 0), limit), min(max(stop, 0), limit)
+
+class _brick_layout:
+    """Pixel boxes of every brick (in breakout_sim.bricks order) and a template of the full field."""
+
+    def __init__(self, x0, y0, x1, y1, sx: float, sy: float, height: int, width: int):
+        self.px0, self.px1 = _pixel_span(x0, x1, sx, width)
+        self.py0, self.py1 = _pixel_span(y0, y1, sy, height)
+        self.ids = np.full((height, width), len(self.px0), dtype=np.int64)  # brick index per pixel, len(...) = none
+        for i in range(len(self.px0)):
+            self.ids[self.py0[i]:self.py1[i], self.px0[i]:self.px1[i]] = i
+        self._levels = np.zeros(len(self.px0) + 1, dtype=np.uint8)
+
+    def layer(self, alive: np.ndarray, out: np.ndarray) -> np.ndarray:
+        """Draw the bricks flagged in alive (one flag per brick) over a blank frame."""
+        levels = self._levels
+        levels[:-1] = np.where(alive, BRICK_LEVEL, BACKGROUND_LEVEL)
+        np.take(levels, self.ids, out=out)
+        return out
+
+    def clear(self, layer: np.ndarray, i: int):
+        layer[self.py0[i]:self.py1[i], self.px0[i]:self.px1[i]] = BACKGROUND_LEVEL
+
+class pixel_renderer:
+    """Renders one breakout_sim into (height, width) uint8 frames, tracking bricks through the sim's listeners."""
+
+    def __init__(self, game: breakout_sim, height: int = FRAME_HEIGHT, width: int = FRAME_WIDTH):
+        self.height = height
+        self.width = width
+        self.sx = width / game.size.x
+        self.sy = height / game.size.y
+        boxes = np.array([[b.box.min.x, b.box.min.y, b.box.max.x, b.box.max.y] for b in game.bricks]).reshape(-1, 4)
+        self.layout = _brick_layout(*boxes.T, self.sx, self.sy, height, width)
+        self.bricks = np.zeros((height, width), dtype=np.uint8)  # cached brick layer
+        self.frame = np.empty((height, width), dtype=np.uint8)
+        self.game = None
+        self.reset(game)
+
+    def reset(self, new_game: breakout_sim):
+        """Follow a (new or reset) game."""
+        self.close()
+        self.game = new_game
+        new_game.brick_hit_listeners.append(self._on_brick_hit)
+        new_game.reset_listeners.append(self._on_reset)
+        self._on_reset(new_game)
+
+    def _on_brick_hit(self, b):
+        self.layout.clear(self.bricks, b.index)
+
+    def _on_reset(self, game: breakout_sim):
+        self.layout.layer(np.array([b.alive for b in game.bricks], dtype=bool), out=self.bricks)
+
+    def render(self, out: np.ndarray | None = None) -> np.ndarray:
+        """Draw the current frame into out, or into an internal buffer that the next call overwrites."""
+        frame = self.frame if out is None else out
+        frame[...] = self.bricks
+        game = self.game
+        box = game.paddle.aabb()
+        x0, x1 = _span(box.min.x, box.max.x, self.sx, self.width)
+        y0, y1 = _span(box.min.y, box.max.y, self.sy, self.height)
+        frame[y0:y1, x0:x1] = PADDLE_LEVEL
+        ball = game.ball
+        r = ball.radius
+        x0, x1 = _span(ball.position.x - r, ball.position.x + r, self.sx, self.width)
+        y0, y1 = _span(ball.position.y - r, ball.position.y + r, self.sy, self.height)
+        frame[y0:y1, x0:x1] = BALL_LEVEL
+        return frame
+
+    def close(self):
+        if self.game is not None and self._on_brick_hit in self.game.brick_hit_listeners:
+            self.game.brick_hit_listeners.remove(self._on_brick_hit)
+            self.game.reset_listeners.remove(self._on_reset)
+        self.game = None
+
+    def __repr__(self):
+        return f"pixel_renderer({self.height}x{self.width})"
+
+def render_all(renderers: list[pixel_renderer], out: np.ndarray | None = None) -> np.ndarray:
+    """Render several sims into one (n, height, width) batch."""
+    if out is None:
+        out = np.empty((len(renderers), renderers[0].height, renderers[0].width), dtype=np.uint8)
+    for i, renderer in enumerate(renderers):
+        renderer.render(out=out[i])
+    return out
+
+class vector_pixel_renderer:
+    """
+    Renders all num_envs games of a vector_sim into a (num_envs, height, width) uint8 batch.
+    Brick layers are cached per game and patched from the bricks that died since the previous render; a game whose
+    bricks came back (it was reset) gets its layer redrawn.
+    """
+
+    def __init__(self, sim: vector_sim, height: int = FRAME_HEIGHT, width: int = FRAME_WIDTH):
+        self.sim = sim
+        self.height = height
+        self.width = width
+        self.sx = width / sim.size.x
+        self.sy = height / sim.size.y
+        x0, y0 = np.meshgrid(sim.brick_x0, sim.brick_y0)
+        x1, y1 = np.meshgrid(sim.brick_x1, sim.brick_y1)
+        self.layout = _brick_layout(x0.ravel(), y0.ravel(), x1.ravel(), y1.ravel(), self.sx, self.sy, height, width)
+        n = sim.num_envs
+        self.bricks = np.empty((n, height, width), dtype=np.uint8)
+        self.frames = np.empty((n, height, width), dtype=np.uint8)
+        self._alive = sim.bricks_alive.reshape(n, -1).copy()
+        for e in range(n):
+            self.layout.layer(self._alive[e], out=self.bricks[e])
+        half_h = sim.paddle_size.y / 2
+        self._paddle_rows = _pixel_span(sim.paddle_y - half_h, sim.paddle_y + half_h, self.sy, height)
+        self._cols = np.arange(width)
+        half_l, r = sim.paddle_size.x / 2, sim.ball_radius
+        self._edges = np.empty((6, n), dtype=np.float64)  # paddle x0, x1, ball x0, x1, y0, y1 per game
+        self._edge_offsets = np.array([-half_l, half_l, -r, r, -r, r])[:, None]
+        self._edge_scales = np.array([self.sx] * 4 + [self.sy] * 2)[:, None]
+        self._edge_limits = np.array([width, width, height])[:, None]
+        # pixel offsets covering the widest / tallest ball box
+        self._ball_dx = np.arange(int(np.ceil(2 * sim.ball_radius * self.sx)) + 1)[None, None, :]
+        self._ball_dy = np.arange(int(np.ceil(2 * sim.ball_radius * self.sy)) + 1)[None, :, None]
+        self._ball_env = np.broadcast_to(np.arange(n)[:, None, None], (n, self._ball_dy.size, self._ball_dx.size))
+
+    def _sync_bricks(self):
+        alive = self.sim.bricks_alive.reshape(self.sim.num_envs, -1)
+        changed = alive != self._alive
+        if not changed.any():
+            return
+        revived = (changed & alive).any(axis=1)
+        for e in np.flatnonzero(revived):
+            self.layout.layer(alive[e], out=self.bricks[e])
+        for e, i in zip(*np.nonzero(changed & ~revived[:, None])):
+            self.layout.clear(self.bricks[e], i)
+        self._alive[...] = alive
+
+    def render(self, out: np.ndarray | None = None) -> np.ndarray:
+        """Draw every game into out, or into an internal batch that the next call overwrites."""
+        sim = self.sim
+        frames = self.frames if out is None else out
+        self._sync_bricks()
+        frames[...] = self.bricks
+
+        # paddle x, ball x and ball y pixel spans for every game in one pass
+        edges = self._edges
+        edges[0:2] = sim.paddle_x
+        edges[2:4] = sim.ball_pos[:, 0]
+        edges[4:6] = sim.ball_pos[:, 1]
+        edges += self._edge_offsets
+        edges *= self._edge_scales
+        pixels = np.rint(edges).astype(np.int64)
+        starts, stops = pixels[0::2], pixels[1::2]
+        np.maximum(stops, starts + 1, out=stops)
+        np.minimum(np.maximum(starts, 0, out=starts), self._edge_limits, out=starts)
+        np.minimum(np.maximum(stops, 0, out=stops), self._edge_limits, out=stops)
+
+        (x0, x1), y0, y1 = pixels[0:2], *self._paddle_rows
+        cols = (self._cols >= x0[:, None]) & (self._cols < x1[:, None])
+        np.copyto(frames[:, y0:y1, :], PADDLE_LEVEL, where=cols[:, None, :])
+
+        x0, x1, y0, y1 = pixels[2:6]
+        # every pixel of every ball box in one scatter
+        ys = y0[:, None, None] + self._ball_dy
+        xs = x0[:, None, None] + self._ball_dx
+        ys, xs = np.broadcast_arrays(ys, xs)
+        inside = (ys < y1[:, None, None]) & (xs < x1[:, None, None])
+        frames[self._ball_env[inside], ys[inside], xs[inside]] = BALL_LEVEL
+        return frames
+
+    def __repr__(self):
+        return f"vector_pixel_renderer(num_envs={self.sim.num_envs}, {self.height}x{self.width})"
+
+class frame_stack:
+    """
+    The last depth frames of one game (frame_shape = (height, width)) or a batch (frame_shape = (n, height, width)).
+
+    Every frame is stored twice, depth slots apart, so the newest depth frames are always one contiguous slice:
+    frames() returns a (depth, height, width) or (n, depth, height, width) view, oldest first, without copying.
+    """
+
+    def __init__(self, frame_shape: tuple[int, ...], depth: int = FRAME_STACK):
+        self.depth = depth
+        self.frame_shape = tuple(frame_shape)
+        batch, image = self.frame_shape[:-2], self.frame_shape[-2:]
+        self._storage = np.zeros(batch + (2 * depth,) + image, dtype=np.uint8)
+        self._head = depth - 1  # slot of the newest frame
+
+    def push(self, frame: np.ndarray) -> np.ndarray:
+        """Append a frame (or a batch of frames) and return the updated stack view."""
+        self._head = (self._head + 1) % self.depth
+        self._storage[..., self._head, :, :] = frame
+        self._storage[..., self._head + self.depth, :, :] = frame
+        return self.frames()
+
+    def reset(self, frame: np.ndarray, mask: np.ndarray | None = None) -> np.ndarray:
+        """Fill the whole history with frame, for every game or only the batch entries selected by mask."""
+        frame = np.asarray(frame)
+        if mask is None:
+            self._storage[...] = frame[..., None, :, :]
+        else:
+            self._storage[mask] = frame[mask][:, None] if frame.ndim == len(self.frame_shape) else frame[None]
+        return self.frames()
+
+    def frames(self) -> np.ndarray:
+        start = self._head + 1
+        return self._storage[..., start:start + self.depth, :, :]
+
+    def __repr__(self):
+        return f"frame_stack(shape={self.frame_shape}, depth={self.depth})"
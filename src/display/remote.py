@@ -0,0 +1,152 @@
+"""
+Renderer running in its own process.
+
+The training process owns a remote_display, whose render() only copies a few floats into a shared-memory snapshot
+(brick flags are kept current from the sim's brick-hit callback; every write, header or brick flag, goes through the
+same sequence-number protocol). A spawned process replays the snapshot onto a
+replica breakout_sim at a fixed frame rate and draws it with breakout_display, so pygame never runs in the trainer.
+"""
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from game.breakout_sim import breakout_sim, WinState
+
+RENDER_FPS = 30
+# Snapshot layout (float64): sequence, ball x, ball y, paddle x, win state, bricks left, then one alive flag per brick.
+# The sequence number is odd while the writer is mid-update so the reader can skip torn frames.
+SEQ, BALL_X, BALL_Y, PADDLE_X, WIN_STATE, BRICKS_LEFT = range(6)
+HEADER_SLOTS = 6
+
+def _sim_config(game: breakout_sim) -> dict:
+    return dict(size=game.size, brick_rows=game.brick_rows, brick_size=game.brick_size, paddle_size=game.paddle_size,
+                ball_radius=game.ball_radius, paddle_vel=game.paddle_vel)
+
+def _apply_snapshot(snapshot: np.ndarray, replica: breakout_sim, alive: np.ndarray, disp) -> None:
+    """Copy a snapshot onto the replica sim, invalidating only the bricks whose flag changed."""
+    replica.ball.position.set(snapshot[BALL_X], snapshot[BALL_Y])
+    replica.paddle.position.x = snapshot[PADDLE_X]
+    replica.paddle._update_box()
+    replica.win_state = WinState(int(snapshot[WIN_STATE]))
+    replica.bricks_left = int(snapshot[BRICKS_LEFT])
+
+    flags = snapshot[HEADER_SLOTS:] != 0.0
+    changed = np.flatnonzero(flags != alive)
+    if not len(changed):
+        return
+    revived = bool(np.any(flags[changed]))
+    for i in changed:
+        b = replica.bricks[i]
+        b.alive = bool(flags[i])
+        if not revived:
+            disp.invalidate_brick(b)
+    alive[:] = flags
+    if revived:
+        disp.reset(replica)  # new game: rebuild the whole brick layer once
+
+def _read_snapshot(snapshot: np.ndarray, frame: np.ndarray) -> bool:
+    """Copy snapshot into frame; False if a write was in progress or happened during the copy (torn frame)."""
+    seq = snapshot[SEQ]
+    if seq % 2:
+        return False
+    frame[:] = snapshot
+    return snapshot[SEQ] == seq
+
+def _render_loop(shm_name: str, config: dict, caption: str, fps: int, stop):
+    import pygame
+    from display.display import breakout_display
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    snapshot = None
+    try:
+        replica = breakout_sim(**config)
+        snapshot = np.ndarray((HEADER_SLOTS + len(replica.bricks),), dtype=np.float64, buffer=shm.buf)
+        alive = np.ones(len(replica.bricks), dtype=bool)
+        disp = breakout_display(replica, scale=1, caption=caption)
+        frame = snapshot.copy()
+        clock = pygame.time.Clock()
+        while not stop.is_set():
+            for ev in pygame.event.get():
+                if ev.type == pygame.QUIT or (ev.type == pygame.KEYDOWN and ev.key == pygame.K_ESCAPE):
+                    pygame.quit()
+                    return  # closing the window only stops rendering, not training
+            if _read_snapshot(snapshot, frame):
+                _apply_snapshot(frame, replica, alive, disp)
+            disp.render()
+            clock.tick(fps)
+        pygame.quit()
+    finally:
+        del snapshot
+        shm.close()
+
+class remote_display:
+    """
+    Drop-in for breakout_display (render / reset) that draws in a separate process.
+    render() costs a handful of array writes; bricks are pushed to the snapshot as they are hit.
+    """
+
+    def __init__(self, game: breakout_sim, caption: str = "Breakout", fps: int = RENDER_FPS):
+        n = HEADER_SLOTS + len(game.bricks)
+        self._shm = shared_memory.SharedMemory(create=True, size=n * np.dtype(np.float64).itemsize)
+        self.snapshot = np.ndarray((n,), dtype=np.float64, buffer=self._shm.buf)
+        self.snapshot[:] = 0.0
+        self.game = None
+        self.reset(game)
+
+        ctx = mp.get_context('spawn')
+        self._stop = ctx.Event()
+        self._process = ctx.Process(target=_render_loop, args=(self._shm.name, _sim_config(game), caption, fps, self._stop),
+                                    daemon=True)
+        self._process.start()
+
+    def reset(self, new_game: breakout_sim):
+        self._detach()
+        self.game = new_game
+        new_game.brick_hit_listeners.append(self._on_brick_hit)
+        new_game.reset_listeners.append(self._on_reset)
+        self._on_reset(new_game)
+
+    def _detach(self):
+        if self.game is not None and self._on_brick_hit in self.game.brick_hit_listeners:
+            self.game.brick_hit_listeners.remove(self._on_brick_hit)
+            self.game.reset_listeners.remove(self._on_reset)
+
+    def _on_brick_hit(self, b):
+        self._begin_write()
+        self.snapshot[HEADER_SLOTS + b.index] = 0.0
+        self._end_write()
+
+    def _on_reset(self, game: breakout_sim):
+        self._begin_write()
+        self.snapshot[HEADER_SLOTS:] = [b.alive for b in game.bricks]
+        self._write_header()
+
+    def _begin_write(self):
+        if self.snapshot[SEQ] % 2 == 0:
+            self.snapshot[SEQ] += 1
+
+    def _write_header(self):
+        game = self.game
+        s = self.snapshot
+        s[BALL_X] = game.ball.position.x
+        s[BALL_Y] = game.ball.position.y
+        s[PADDLE_X] = game.paddle.position.x
+        s[WIN_STATE] = game.win_state.value
+        s[BRICKS_LEFT] = game.bricks_left
+        self._end_write()
+
+    def _end_write(self):
+        self.snapshot[SEQ] += 1  # back to even: snapshot consistent
+
+    def render(self):
+        self._begin_write()
+        self._write_header()
+
+    def close(self):
+        self._stop.set()
+        self._process.join(timeout=5.0)
+        if self._process.is_alive():
+            self._process.terminate()
+        self._detach()
+        del self.snapshot
+        self._shm.close()
+        self._shm.unlink()
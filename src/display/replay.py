@@ -0,0 +1,54 @@
+"""
+Play a recorded episode (game.recording) back through breakout_display.
+
+The recorded ball / paddle states are copied onto a replica sim and bricks are knocked out at the steps they were hit,
+so playback doesn't depend on the sim reproducing the episode. speed scales game time to wall time; frames are drawn
+at most fps times a second and skipped steps are applied without drawing.
+"""
+import time
+from game.breakout_sim import WinState
+from game.recording import episode_recording
+from .display import breakout_display
+
+REPLAY_FPS = 60
+
+def replay_episode(recording: episode_recording, episode: int, speed: float = 1.0, fps: int = REPLAY_FPS, scale: int = 1,
+                   caption: str = "Breakout (Replay)") -> breakout_display:
+    """Show episode at speed x real time (0 = no waiting). Returns the display, still open."""
+    game = recording.make_sim(episode)
+    disp = breakout_display(game, scale=scale, caption=caption)
+    steps = recording.steps(episode)
+    hits = recording.hits(episode)
+    ball_x, ball_y, paddle_x, game_time, bricks_left = (steps[name] for name in
+                                                        ('ball_x', 'ball_y', 'paddle_x', 'game_time', 'bricks_left'))
+    frame_dt = 1.0 / fps
+    start = time.perf_counter()
+    next_frame = start + frame_dt
+    h = 0
+    disp.render()
+    for i in range(len(game_time)):
+        while h < len(hits) and hits[h, 0] == i:
+            b = game.bricks[hits[h, 1]]
+            b.alive = False
+            disp.invalidate_brick(b)
+            h += 1
+        game.ball.position.set(float(ball_x[i]), float(ball_y[i]))
+        game.paddle.position.x = float(paddle_x[i])
+        game.paddle._update_box()
+        game.game_time = float(game_time[i])
+        game.bricks_left = int(bricks_left[i])
+
+        if speed > 0:
+            delay = start + game.game_time / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        now = time.perf_counter()
+        if now >= next_frame or i + 1 == len(game_time):
+            disp.poll_input()
+            disp.render()
+            next_frame = now + frame_dt
+    result = recording.episodes[episode]['result']
+    if result in WinState.__members__:
+        game.win_state = WinState[result]
+    disp.render()
+    return disp
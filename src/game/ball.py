@@ -2,18 +2,21 @@ from physics.circle import circle
 from physics.vec2 import vec2
 
 class ball:
+    __slots__ = ('position', 'velocity', 'radius', 'shape')
+
     def __init__(self, position: vec2, velocity: vec2, radius: float):
-        self.position = position
-        self.velocity = velocity
+        # Own copies: update() and bounce() work in place and must not mutate the caller's vectors
+        self.position = position.copy()
+        self.velocity = velocity.copy()
         self.radius = radius
-        self.shape = circle(center=position, radius=radius)
+        self.shape = circle(center=self.position, radius=radius)
     
     def update(self, dt: float):
-        self.position += self.velocity * dt
+        self.position.scale_add(self.velocity, dt)
         self.shape.center = self.position
     
     def bounce(self, normal: vec2):
-        self.velocity = self.velocity - normal * (2 * self.velocity.dot(normal))
+        self.velocity.scale_add(normal, -(2 * self.velocity.dot(normal)))
 
     def __repr__(self):
         return f"ball(position={self.position}, velocity={self.velocity}, radius={self.radius})"
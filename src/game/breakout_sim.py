@@ -1,10 +1,16 @@
 from .ball import ball
 from .paddle import paddle
 from .brick import brick
-from physics.intersections import intersects
+from .brick_grid import brick_grid
+from physics.intersections import intersects, time_of_impact
 from physics.vec2 import vec2
-from physics.aabb import aabb
+from physics.aabb import aabb, NORMAL_LEFT, NORMAL_RIGHT, NORMAL_TOP, NORMAL_BOTTOM
 from enum import Enum
+from typing import Callable, NamedTuple
+import random
+
+BRICK_TOP_OFFSET = 20  # small gap from the top
+MAX_BOUNCES_PER_STEP = 8  # cap on contacts resolved in one continuous step
 
 class paddle_move(Enum):
     LEFT = -1
@@ -18,37 +24,60 @@ class WinState(Enum):
 
 class GameState:
 
-    def __init__(self, ball: ball, paddle: paddle, bricks: list[brick], win_state: WinState, game_time: float):
+    def __init__(self, ball: ball, paddle: paddle, bricks: list[brick], win_state: WinState, game_time: float,
+                 bricks_left: int | None = None, bricks_broken_this_step: int = 0):
         self.ball = ball
         self.paddle = paddle
         self.bricks = bricks
         self.win_state = win_state
         self.game_time = game_time
+        # Brick count when the state was taken; the bricks list itself is live and keeps changing
+        self.bricks_left = sum(b.alive for b in bricks) if bricks_left is None else bricks_left
+        self.bricks_broken_this_step = bricks_broken_this_step
     
     def __repr__(self):
-        return f"GameState(win_state={self.win_state}, num_bricks_left={sum(b.alive for b in self.bricks)})"
+        return f"GameState(win_state={self.win_state}, num_bricks_left={self.bricks_left})"
 
     def num_bricks_left(self) -> int:
-        return sum(b.alive for b in self.bricks)
+        return self.bricks_left
     
     def num_bricks_total(self) -> int:
         return len(self.bricks)
     
     def num_bricks_broken(self) -> int:
-        return sum(not b.alive for b in self.bricks)
+        return len(self.bricks) - self.bricks_left
+
+class SimSnapshot(NamedTuple):
+    """Everything that changes during a game, as plain numbers. Bit i of alive_mask is brick i."""
+    ball_x: float
+    ball_y: float
+    ball_vx: float
+    ball_vy: float
+    paddle_x: float
+    alive_mask: int
+    game_time: float
+    win_state: int
+    bricks_left: int
+    bricks_broken_this_step: int
 
 class breakout_sim:
     def __init__(self, size: vec2, brick_rows: int, brick_size: vec2, paddle_size: vec2, ball_radius: float, paddle_vel: float,
-                 ball_initial_velocity: vec2 | None = None):
+                 ball_initial_velocity: vec2 | None = None, continuous: bool = False):
+        """
+        continuous: resolve ball collisions with swept time-of-impact tests instead of discrete overlap checks,
+        so the ball can't tunnel through bricks or the paddle and large dt values stay accurate.
+        """
         self.size = size
         self.brick_rows = brick_rows
         self.brick_size = brick_size
         self.paddle_size = paddle_size
         self.ball_radius = ball_radius
         self.paddle_vel = paddle_vel
+        self.continuous = continuous
         self.ball_initial_velocity = ball_initial_velocity or vec2(160, -200)
         self.win_state = WinState.ONGOING
         self.game_time = 0.0
+        self.bricks_broken_this_step = 0  # bricks broken by the last step / step_n call
         
                 # Center ball
         self.ball = ball(
@@ -60,7 +89,7 @@ class breakout_sim:
         paddle_centre = vec2(self.size.x / 2, self.size.y - self.paddle_size.y)
         self.paddle = paddle(position=paddle_centre, length=self.paddle_size.x, height=self.paddle_size.y)
         # Bricks laid out in grid
-        top_offset = 20  # small gap from the top
+        top_offset = BRICK_TOP_OFFSET
         cols = int(self.size.x // self.brick_size.x)
         self.bricks = []
         for row in range(self.brick_rows):
@@ -69,34 +98,140 @@ class breakout_sim:
                 y0 = top_offset + row * self.brick_size.y
                 x1 = x0 + self.brick_size.x
                 y1 = y0 + self.brick_size.y
-                self.bricks.append(brick(box=aabb(vec2(x0, y0), vec2(x1, y1))))
-
+                self.bricks.append(brick(box=aabb(vec2(x0, y0), vec2(x1, y1)), index=len(self.bricks)))
+        self.bricks_left = len(self.bricks)
+        self._alive_mask = (1 << len(self.bricks)) - 1
+        self.brick_grid = brick_grid(origin=vec2(0, top_offset), cell_size=self.brick_size, bricks=self.bricks)
+        self._paddle_bounds = vec2(0, self.size.x)
+        self._nearby_bricks: list[brick] = []  # scratch list reused by every step
+        self._sweep = vec2()  # scratch displacement for continuous steps
+        # Called with each brick as it is destroyed, so observers can update incrementally instead of rescanning
+        self.brick_hit_listeners: list[Callable[[brick], None]] = []
+        # Called with the sim after reset() / restore() replaced its state wholesale
+        self.reset_listeners: list[Callable[['breakout_sim'], None]] = []
+        self._initial = self.snapshot()
 
     def game_state(self) -> GameState:
-        return GameState(ball=self.ball, paddle=self.paddle, bricks=self.bricks, win_state=self.win_state, game_time=self.game_time)
+        return GameState(ball=self.ball, paddle=self.paddle, bricks=self.bricks, win_state=self.win_state, game_time=self.game_time,
+                         bricks_left=self.bricks_left, bricks_broken_this_step=self.bricks_broken_this_step)
+
+    def snapshot(self) -> SimSnapshot:
+        ball = self.ball
+        return SimSnapshot(ball.position.x, ball.position.y, ball.velocity.x, ball.velocity.y, self.paddle.position.x,
+                           self._alive_mask, self.game_time, self.win_state.value, self.bricks_left, self.bricks_broken_this_step)
+
+    def restore(self, snap: SimSnapshot):
+        """Put the sim back into a state from snapshot(). Only bricks whose flag differs are touched."""
+        if snap.alive_mask >> len(self.bricks):
+            raise ValueError(f"Snapshot has more bricks than this sim ({len(self.bricks)})")
+        self.ball.position.set(snap.ball_x, snap.ball_y)
+        self.ball.velocity.set(snap.ball_vx, snap.ball_vy)
+        self.paddle.position.x = snap.paddle_x
+        self.paddle._update_box()
+        self.game_time = snap.game_time
+        self.win_state = WinState(snap.win_state)
+        self.bricks_left = snap.bricks_left
+        self.bricks_broken_this_step = snap.bricks_broken_this_step
+
+        changed = self._alive_mask ^ snap.alive_mask
+        if changed & snap.alive_mask:
+            # Bricks come back: rebuild the grid in index order so queries match a fresh sim
+            for b in self.bricks:
+                b.alive = bool(snap.alive_mask >> b.index & 1)
+            self.brick_grid.clear()
+            for b in self.bricks:
+                if b.alive:
+                    self.brick_grid.insert(b)
+        else:
+            while changed:
+                low = changed & -changed
+                b = self.bricks[low.bit_length() - 1]
+                b.alive = False
+                self.brick_grid.remove(b)
+                changed ^= low
+        self._alive_mask = snap.alive_mask
+        for listener in self.reset_listeners:
+            listener(self)
+
+    def reset(self, seed: int | None = None) -> GameState:
+        """
+        Start a new game on this sim without reallocating it. Without a seed the opening is the same as a fresh sim;
+        with one, the serve direction and the ball's starting x are drawn from it.
+        """
+        start = self._initial
+        if seed is not None:
+            # seed the snapshot itself so reset listeners already see the seeded serve
+            rng = random.Random(seed)
+            ball_vx = -start.ball_vx if rng.random() < 0.5 else start.ball_vx
+            start = start._replace(ball_x=start.ball_x + rng.uniform(-0.25, 0.25) * self.size.x, ball_vx=ball_vx)
+        self.restore(start)
+        return self.game_state()
 
     def step(self, dt: float, paddle_action: paddle_move) -> GameState:
+        self.bricks_broken_this_step = self._advance(dt, paddle_action)
+        return self.game_state()
+
+    def step_n(self, dt: float, paddle_action: paddle_move, n: int) -> tuple[int, GameState]:
+        """
+        Repeat paddle_action for up to n ticks of dt, stopping early once the game is over.
+        Returns the number of bricks broken over those ticks and the final state.
+        """
+        if n < 1:
+            raise ValueError(f"step_n needs at least one tick, got n={n}")
+        broken = 0
+        advance = self._advance
+        for _ in range(n):
+            broken += advance(dt, paddle_action)
+            if self.win_state != WinState.ONGOING:
+                break
+        self.bricks_broken_this_step = broken
+        return broken, self.game_state()
+
+    def _advance(self, dt: float, paddle_action: paddle_move) -> int:
+        """Run one tick and return the number of bricks broken."""
         self.game_time += dt
         # Move paddle
         if paddle_action == paddle_move.LEFT:
-            self.paddle.move(-self.paddle_vel * dt, vec2(0, self.size.x))
+            self.paddle.move(-self.paddle_vel * dt, self._paddle_bounds)
         elif paddle_action == paddle_move.RIGHT:
-            self.paddle.move(self.paddle_vel * dt, vec2(0, self.size.x))
+            self.paddle.move(self.paddle_vel * dt, self._paddle_bounds)
 
+        if self.continuous:
+            broken = self._move_ball_swept(dt)
+        else:
+            broken = self._move_ball_discrete(dt)
+        if self.bricks_left == 0 and self.win_state == WinState.ONGOING:
+            self.win_state = WinState.WON
+        return broken
+
+    def _break_brick(self, brick: brick) -> vec2:
+        normal = brick.hit(self.ball.position)
+        self.bricks_left -= 1
+        self._alive_mask &= ~(1 << brick.index)
+        self.brick_grid.remove(brick)
+        for listener in self.brick_hit_listeners:
+            listener(brick)
+        return normal
+
+    def _move_ball_discrete(self, dt: float) -> int:
         # Update ball position
         self.ball.update(dt)
 
         # Check for paddle collision
-        if intersects(self.ball.shape, self.paddle.aabb()):
-            normal = vec2(0, -1)  # Normal pointing upwards
-            self.ball.position.y = self.paddle.aabb().min.y - self.ball.radius - 1
-            self.ball.bounce(normal)
-
-        # Check for brick collisions
-        for brick in self.bricks:
-            if brick.alive and intersects(self.ball.shape, brick.box):
-                normal = brick.hit(self.ball.position)
+        paddle_box = self.paddle.aabb()
+        if intersects(self.ball.shape, paddle_box):
+            self.ball.position.y = paddle_box.min.y - self.ball.radius - 1
+            self.ball.bounce(NORMAL_TOP)  # Normal pointing upwards
+
+        # Check for brick collisions, only against bricks in the grid cells the ball overlaps
+        broken = 0
+        pos = self.ball.position
+        r = self.ball.radius
+        for brick in self.brick_grid.query(pos.x - r, pos.y - r, pos.x + r, pos.y + r, out=self._nearby_bricks):
+            if intersects(self.ball.shape, brick.box):
+                normal = self._break_brick(brick)
                 self.ball.bounce(normal)
+                broken = 1
                 break  # Only handle one brick collision per step
 
         # Check for wall collisions
@@ -106,5 +241,79 @@ class breakout_sim:
             self.ball.velocity.y *= -1  # Bounce off top wall
         if self.ball.position.y + self.ball.radius > self.size.y:
             self.win_state = WinState.LOST  # Ball fell below paddle
+        return broken
 
-        return self.game_state()
+    def _move_ball_swept(self, dt: float) -> int:
+        ball = self.ball
+        pos = ball.position
+        vel = ball.velocity
+        r = ball.radius
+        paddle_box = self.paddle.aabb()
+        ball.shape.center = pos
+
+        # The paddle may have moved into the ball; push it back out as the discrete rule does
+        if intersects(ball.shape, paddle_box):
+            pos.y = paddle_box.min.y - r - 1
+            if vel.y > 0:
+                ball.bounce(NORMAL_TOP)
+
+        broken = 0
+        remaining = dt
+        for _ in range(MAX_BOUNCES_PER_STEP):
+            d = self._sweep.set(vel.x * remaining, vel.y * remaining)
+            best_t = 2.0
+            best_normal = None
+            best_brick = None
+            lost = False
+
+            # Walls (the ball centre must stay r away from each one)
+            if d.x < 0:
+                t = max(0.0, (r - pos.x) / d.x)
+                if t < best_t:
+                    best_t, best_normal = t, NORMAL_RIGHT
+            elif d.x > 0:
+                t = max(0.0, (self.size.x - r - pos.x) / d.x)
+                if t < best_t:
+                    best_t, best_normal = t, NORMAL_LEFT
+            if d.y < 0:
+                t = max(0.0, (r - pos.y) / d.y)
+                if t < best_t:
+                    best_t, best_normal = t, NORMAL_BOTTOM
+            elif d.y > 0:
+                t = max(0.0, (self.size.y - r - pos.y) / d.y)
+                if t < best_t:
+                    best_t, best_normal, lost = t, None, True
+
+            hit = time_of_impact(ball.shape, d, paddle_box)
+            if hit is not None and hit[0] < best_t:
+                best_t, best_normal = hit
+                lost = False
+
+            # Bricks anywhere along the swept path
+            min_x = min(pos.x, pos.x + d.x) - r
+            max_x = max(pos.x, pos.x + d.x) + r
+            min_y = min(pos.y, pos.y + d.y) - r
+            max_y = max(pos.y, pos.y + d.y) + r
+            for brick in self.brick_grid.query(min_x, min_y, max_x, max_y, out=self._nearby_bricks):
+                hit = time_of_impact(ball.shape, d, brick.box)
+                if hit is not None and hit[0] < best_t:
+                    best_t, best_normal = hit
+                    best_brick = brick
+                    lost = False
+
+            if best_t > 1.0:
+                pos.scale_add(vel, remaining)
+                break
+
+            pos.scale_add(vel, remaining * best_t)
+            remaining -= remaining * best_t
+            if lost:
+                self.win_state = WinState.LOST  # Ball reached the floor
+                break
+            if best_brick is not None:
+                self._break_brick(best_brick)
+                broken += 1
+            ball.bounce(best_normal)
+            if remaining <= 0.0:
+                break
+        return broken
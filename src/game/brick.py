@@ -2,9 +2,12 @@ from physics.aabb import aabb
 from physics.vec2 import vec2
 
 class brick:
-    def __init__(self, box: aabb):
+    __slots__ = ('box', 'alive', 'index')
+
+    def __init__(self, box: aabb, index: int = -1):
         self.box = box
         self.alive = True
+        self.index = index  # position in breakout_sim.bricks
 
     def hit(self, point: vec2):
         self.alive = False
@@ -12,4 +15,4 @@ class brick:
         
 
     def __repr__(self):
-        return f"brick(box={self.box}, alive={self.alive})"
\ No newline at end of file
+        return f"brick(box={self.box}, alive={self.alive})"
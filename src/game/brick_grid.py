@@ -0,0 +1,84 @@
+from math import floor
+from physics.vec2 import vec2
+from .brick import brick
+
+class brick_grid:
+    """
+    Uniform grid over the brick field with cells of brick_size, used to find the bricks near the ball
+    without scanning the whole list. Only live bricks are kept; call remove() when a brick is destroyed.
+    """
+
+    def __init__(self, origin: vec2, cell_size: vec2, bricks: list[brick]):
+        self.origin = origin
+        self.cell_size = cell_size
+        # cells[row][col] -> bricks; nested dicts so lookups don't build tuple keys
+        self.cells: dict[int, dict[int, list[brick]]] = {}
+        self._brick_cells: dict[int, list[tuple[int, int]]] = {}
+        for b in bricks:
+            if b.alive:
+                self.insert(b)
+
+    def _cell_range(self, min_x: float, min_y: float, max_x: float, max_y: float) -> tuple[int, int, int, int]:
+        row0 = floor((min_y - self.origin.y) / self.cell_size.y)
+        row1 = floor((max_y - self.origin.y) / self.cell_size.y)
+        col0 = floor((min_x - self.origin.x) / self.cell_size.x)
+        col1 = floor((max_x - self.origin.x) / self.cell_size.x)
+        return row0, row1, col0, col1
+
+    def insert(self, b: brick):
+        row0, row1, col0, col1 = self._cell_range(b.box.min.x, b.box.min.y, b.box.max.x, b.box.max.y)
+        # A brick exactly one cell wide ends on the next cell's edge; don't register it there
+        if row1 > row0 and self.origin.y + row1 * self.cell_size.y >= b.box.max.y:
+            row1 -= 1
+        if col1 > col0 and self.origin.x + col1 * self.cell_size.x >= b.box.max.x:
+            col1 -= 1
+        keys = [(row, col) for row in range(row0, row1 + 1) for col in range(col0, col1 + 1)]
+        for row, col in keys:
+            self.cells.setdefault(row, {}).setdefault(col, []).append(b)
+        self._brick_cells[id(b)] = keys
+
+    def remove(self, b: brick):
+        for row, col in self._brick_cells.pop(id(b), ()):
+            row_cells = self.cells[row]
+            cell = row_cells[col]
+            cell.remove(b)
+            if not cell:
+                del row_cells[col]
+                if not row_cells:
+                    del self.cells[row]
+
+    def clear(self):
+        self.cells.clear()
+        self._brick_cells.clear()
+
+    def query(self, min_x: float, min_y: float, max_x: float, max_y: float, out: list[brick] | None = None) -> list[brick]:
+        """Return the live bricks in the cells overlapping the given bounds, in row-major cell order.
+        Pass a scratch list as out to reuse it instead of allocating a new one."""
+        origin = self.origin
+        size = self.cell_size
+        row0 = floor((min_y - origin.y) / size.y)
+        row1 = floor((max_y - origin.y) / size.y)
+        col0 = floor((min_x - origin.x) / size.x)
+        col1 = floor((max_x - origin.x) / size.x)
+        if out is None:
+            out = []
+        else:
+            out.clear()
+        cells = self.cells
+        for row in range(row0, row1 + 1):
+            row_cells = cells.get(row)
+            if not row_cells:
+                continue
+            for col in range(col0, col1 + 1):
+                cell = row_cells.get(col)
+                if cell:
+                    for b in cell:
+                        if b not in out:
+                            out.append(b)
+        return out
+
+    def __len__(self):
+        return len(self._brick_cells)
+
+    def __repr__(self):
+        return f"brick_grid(cell_size={self.cell_size}, occupied_cells={sum(len(row) for row in self.cells.values())})"
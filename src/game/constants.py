@@ -8,4 +8,6 @@ BALL_RADIUS       = 8
 PADDLE_SPEED      = 420.0
 BALL_INITIAL_VEL  = vec2(180, -240)
 SIM_HZ            = 200          # fixed simulation rate (physics/logic)
-SIM_DT            = 1.0 / SIM_HZ
\ No newline at end of file
+SIM_DT            = 1.0 / SIM_HZ
+TRAIN_SIM_HZ      = 50           # training step rate; needs continuous collisions to avoid tunnelling
+TRAIN_SIM_DT      = 1.0 / TRAIN_SIM_HZ
@@ -3,17 +3,29 @@ from physics.vec2 import vec2
 from utility.math import clamp
 
 class paddle:
+    __slots__ = ('position', 'length', 'height', '_box')
+
     def __init__(self, position: vec2, length: float, height: float):
         self.position = position
         self.length = length
         self.height = height
+        self._box = aabb(min=vec2(), max=vec2())
+        self._update_box()
 
     def move(self, delta_x: float, bounds: vec2):
         self.position.x += delta_x
         self.position.x = clamp(self.position.x, bounds.x + self.length / 2, bounds.y - self.length / 2)
+        self._update_box()
+
+    def _update_box(self):
+        half_length = self.length / 2
+        half_height = self.height / 2
+        self._box.set(self.position.x - half_length, self.position.y - half_height,
+                      self.position.x + half_length, self.position.y + half_height)
 
     def aabb(self) -> aabb:
-        return aabb(min=vec2(self.position.x - self.length / 2, self.position.y - self.height / 2), max=vec2(self.position.x + self.length / 2, self.position.y + self.height / 2))
+        """The paddle's box. This is a cached instance kept up to date by move(); copy it if you need a snapshot."""
+        return self._box
 
     def __repr__(self):
-        return f"paddle(position={self.position}, length={self.length}, height={self.height})"
\ No newline at end of file
+        return f"paddle(position={self.position}, length={self.length}, height={self.height})"
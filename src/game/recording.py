@@ -0,0 +1,212 @@
+"""
+Episode recording.
+
+An episode_recorder follows one breakout_sim and stores, for every step (one step_n call), the paddle move and the
+resulting ball / paddle state, plus every brick hit as a (step, brick index) event. Rows are appended to in-memory
+lists and written out every chunk_steps steps as one .npy file per column, so recording costs a tuple append per step.
+
+On disk a recording is a directory:
+    index.json                      sim config, dt, action_repeat, the chunks and the finished episodes
+    chunk-000000.<column>.npy       one file per STEP_COLUMNS entry, rows are global step numbers
+    chunk-000000.hits.npy           (n, 2) int32 array of (global step, brick index)
+Chunks are only ever added; index.json is replaced atomically after each chunk, so a crash loses at most the
+buffered steps. episode_recording reads it back memory-mapped and can re-simulate an episode from its seed and
+moves to check that the sim is deterministic.
+"""
+import json
+import os
+import numpy as np
+from physics.vec2 import vec2
+from .breakout_sim import breakout_sim, paddle_move, WinState
+
+RECORDING_VERSION = 1
+CHUNK_STEPS = 65536
+INDEX_FILE = 'index.json'
+# Per-step columns, in row order
+STEP_COLUMNS = (
+    ('move', np.int8),        # paddle_move value: -1 left, 0 stay, 1 right
+    ('ball_x', np.float64),
+    ('ball_y', np.float64),
+    ('ball_vx', np.float64),
+    ('ball_vy', np.float64),
+    ('paddle_x', np.float64),
+    ('game_time', np.float64),
+    ('bricks_left', np.int16),
+)
+
+def sim_config(game: breakout_sim) -> dict:
+    """JSON-friendly constructor arguments that rebuild game's layout."""
+    return dict(size=[game.size.x, game.size.y], brick_rows=game.brick_rows, brick_size=[game.brick_size.x, game.brick_size.y],
+                paddle_size=[game.paddle_size.x, game.paddle_size.y], ball_radius=game.ball_radius, paddle_vel=game.paddle_vel,
+                ball_initial_velocity=[game.ball_initial_velocity.x, game.ball_initial_velocity.y], continuous=game.continuous)
+
+def make_sim(config: dict) -> breakout_sim:
+    kwargs = dict(config)
+    for name in ('size', 'brick_size', 'paddle_size', 'ball_initial_velocity'):
+        kwargs[name] = vec2(*kwargs[name])
+    return breakout_sim(**kwargs)
+
+def _chunk_path(directory: str, chunk: int, column: str) -> str:
+    return os.path.join(directory, f"chunk-{chunk:06d}.{column}.npy")
+
+class episode_recorder:
+    """
+    Records the episodes played on game into directory (appending to an existing recording of the same sim).
+
+    Call begin_episode(seed) after each reset, record(move) after each step_n(dt, move, action_repeat) and
+    end_episode() when the episode is over; close() flushes whatever is buffered.
+    """
+
+    def __init__(self, directory: str, game: breakout_sim, dt: float, action_repeat: int = 1, chunk_steps: int = CHUNK_STEPS):
+        self.directory = directory
+        self.game = game
+        self.chunk_steps = chunk_steps
+        os.makedirs(directory, exist_ok=True)
+        index_path = os.path.join(directory, INDEX_FILE)
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                self.index = json.load(f)
+            if self.index['sim'] != sim_config(game) or self.index['dt'] != dt or self.index['action_repeat'] != action_repeat:
+                raise ValueError(f"{directory} holds a recording of a different sim setup")
+        else:
+            self.index = dict(version=RECORDING_VERSION, sim=sim_config(game), dt=dt, action_repeat=action_repeat, chunks=[],
+                              episodes=[])
+        self.steps = sum(c['steps'] for c in self.index['chunks'])  # global step number of the next row
+        self._rows = []
+        self._hits = []
+        self._pending = []  # finished episodes whose rows are still buffered
+        self._episode = None
+        game.brick_hit_listeners.append(self._on_brick_hit)
+
+    def _on_brick_hit(self, b):
+        if self._episode is not None:
+            self._hits.append((self.steps, b.index))
+
+    def begin_episode(self, seed: int | None = None):
+        """Start recording an episode that began with game.reset(seed)."""
+        if self._episode is not None:
+            self.end_episode()
+        self._episode = dict(seed=seed, start=self.steps)
+
+    def record(self, move: paddle_move):
+        """Append the step just taken with move."""
+        game = self.game
+        ball = game.ball
+        self._rows.append((move.value, ball.position.x, ball.position.y, ball.velocity.x, ball.velocity.y,
+                           game.paddle.position.x, game.game_time, game.bricks_left))
+        self.steps += 1
+        if len(self._rows) >= self.chunk_steps:
+            self.flush()
+
+    def end_episode(self, result: str | None = None):
+        """Close the current episode. result defaults to the sim's win state name (e.g. pass 'TRUNCATED' for a timeout)."""
+        episode, self._episode = self._episode, None
+        if episode is None or episode['start'] == self.steps:
+            return  # nothing was played
+        game = self.game
+        episode.update(steps=self.steps - episode['start'], result=result or game.win_state.name, game_time=game.game_time,
+                       bricks_broken=len(game.bricks) - game.bricks_left)
+        self._pending.append(episode)
+
+    def flush(self):
+        """Write the buffered steps as a new chunk and publish the episodes that are now complete on disk."""
+        if self._rows:
+            chunk = len(self.index['chunks'])
+            columns = list(zip(*self._rows))
+            for (name, dtype), values in zip(STEP_COLUMNS, columns):
+                np.save(_chunk_path(self.directory, chunk, name), np.array(values, dtype=dtype))
+            np.save(_chunk_path(self.directory, chunk, 'hits'), np.array(self._hits, dtype=np.int32).reshape(-1, 2))
+            self.index['chunks'].append(dict(start=self.steps - len(self._rows), steps=len(self._rows), hits=len(self._hits)))
+            self._rows.clear()
+            self._hits.clear()
+        self.index['episodes'].extend(self._pending)
+        self._pending.clear()
+        tmp = os.path.join(self.directory, INDEX_FILE + '.tmp')
+        with open(tmp, 'w') as f:
+            json.dump(self.index, f)
+        os.replace(tmp, os.path.join(self.directory, INDEX_FILE))
+
+    def close(self):
+        """Finish the current episode (if any) and write everything out."""
+        self.end_episode()
+        self.flush()
+        if self._on_brick_hit in self.game.brick_hit_listeners:
+            self.game.brick_hit_listeners.remove(self._on_brick_hit)
+
+    def __repr__(self):
+        return f"episode_recorder({self.directory!r}, steps={self.steps})"
+
+class episode_recording:
+    """Read access to a recording directory. Columns are memory-mapped; an episode spanning chunks is copied."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE)) as f:
+            self.index = json.load(f)
+        self.episodes = self.index['episodes']
+        self.dt = self.index['dt']
+        self.action_repeat = self.index['action_repeat']
+        self._starts = np.array([c['start'] for c in self.index['chunks']], dtype=np.int64)
+        self._columns = {}
+
+    def __len__(self) -> int:
+        return len(self.episodes)
+
+    def _column(self, chunk: int, name: str) -> np.ndarray:
+        key = (chunk, name)
+        if key not in self._columns:
+            self._columns[key] = np.load(_chunk_path(self.directory, chunk, name), mmap_mode='r')
+        return self._columns[key]
+
+    def _range(self, name: str, start: int, stop: int) -> np.ndarray:
+        first = int(np.searchsorted(self._starts, start, side='right')) - 1
+        last = int(np.searchsorted(self._starts, stop - 1, side='right')) - 1 if stop > start else first
+        parts = [self._column(c, name)[max(start - self._starts[c], 0):stop - self._starts[c]] for c in range(first, last + 1)]
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def steps(self, episode: int) -> dict[str, np.ndarray]:
+        """The STEP_COLUMNS arrays of one episode, one row per step."""
+        e = self.episodes[episode]
+        return {name: self._range(name, e['start'], e['start'] + e['steps']) for name, _ in STEP_COLUMNS}
+
+    def hits(self, episode: int) -> np.ndarray:
+        """(n, 2) array of (step within the episode, brick index) for the bricks broken during the episode."""
+        e = self.episodes[episode]
+        start, stop = e['start'], e['start'] + e['steps']
+        chunks = range(max(int(np.searchsorted(self._starts, start, side='right')) - 1, 0),
+                       int(np.searchsorted(self._starts, max(stop - 1, start), side='right')))
+        hits = [h[(h[:, 0] >= start) & (h[:, 0] < stop)] for h in (self._column(c, 'hits') for c in chunks)]
+        hits = np.concatenate(hits) if hits else np.zeros((0, 2), dtype=np.int32)
+        hits[:, 0] -= start
+        return hits
+
+    def make_sim(self, episode: int) -> breakout_sim:
+        """A sim set up and reset like the one the episode was recorded on."""
+        game = make_sim(self.index['sim'])
+        game.reset(self.episodes[episode]['seed'])
+        return game
+
+    def resimulate(self, episode: int) -> int | None:
+        """
+        Replay the episode's moves on a fresh sim from its seed. Returns the first step whose ball, paddle, time or
+        brick count differs from the recording, or None if the whole episode reproduces exactly.
+        """
+        game = self.make_sim(episode)
+        steps = self.steps(episode)
+        moves = [paddle_move(int(m)) for m in steps['move']]
+        recorded = np.column_stack([steps[name] for name, _ in STEP_COLUMNS[1:]])
+        dt, repeat = self.dt, self.action_repeat
+        for i, move in enumerate(moves):
+            game.step_n(dt, move, repeat)
+            ball = game.ball
+            state = (ball.position.x, ball.position.y, ball.velocity.x, ball.velocity.y, game.paddle.position.x,
+                     game.game_time, game.bricks_left)
+            if not np.array_equal(recorded[i], state):
+                return i
+        result = self.episodes[episode]['result']
+        if result in (WinState.WON.name, WinState.LOST.name) and game.win_state.name != result:
+            return len(moves)  # the recorded episode ended here but the replay did not
+        return None
+
+    def __repr__(self):
+        return f"episode_recording({self.directory!r}, episodes={len(self.episodes)})"
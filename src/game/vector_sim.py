@@ -0,0 +1,157 @@
+import numpy as np
+from physics.vec2 import vec2
+from .breakout_sim import WinState, BRICK_TOP_OFFSET
+
+class vector_sim:
+    """
+    Steps N independent breakout games at once using structure-of-arrays NumPy state.
+
+    Collision rules mirror breakout_sim.step exactly (paddle snap + upward bounce, first live brick in
+    row-major order bounces off its closest side, wall reflections, ball below the floor loses, clearing every brick wins).
+    Finished games are reset to the initial layout at the end of each step.
+    Actions are paddle_move values: -1 (left), 0 (stay), 1 (right).
+    """
+
+    def __init__(self, num_envs: int, size: vec2, brick_rows: int, brick_size: vec2, paddle_size: vec2, ball_radius: float,
+                 paddle_vel: float, ball_initial_velocity: vec2 | None = None):
+        self.num_envs = num_envs
+        self.size = size
+        self.brick_rows = brick_rows
+        self.brick_cols = int(size.x // brick_size.x)
+        self.brick_size = brick_size
+        self.paddle_size = paddle_size
+        self.ball_radius = ball_radius
+        self.paddle_vel = paddle_vel
+        self.ball_initial_velocity = ball_initial_velocity or vec2(160, -200)
+
+        self.paddle_y = size.y - paddle_size.y
+        self.paddle_bounds = (paddle_size.x / 2, size.x - paddle_size.x / 2)
+
+        # Brick edges, identical arithmetic to the breakout_sim layout
+        cols = np.arange(self.brick_cols)
+        rows = np.arange(self.brick_rows)
+        self.brick_x0 = cols * brick_size.x
+        self.brick_x1 = self.brick_x0 + brick_size.x
+        self.brick_y0 = BRICK_TOP_OFFSET + rows * brick_size.y
+        self.brick_y1 = self.brick_y0 + brick_size.y
+
+        # Largest number of rows/cols a ball can overlap at once
+        self._cand_rows = np.arange(int(2 * ball_radius // brick_size.y) + 2)
+        self._cand_cols = np.arange(int(2 * ball_radius // brick_size.x) + 2)
+
+        self.ball_pos = np.empty((num_envs, 2), dtype=np.float64)
+        self.ball_vel = np.empty((num_envs, 2), dtype=np.float64)
+        self.paddle_x = np.empty(num_envs, dtype=np.float64)
+        self.bricks_alive = np.empty((num_envs, brick_rows, self.brick_cols), dtype=bool)
+        self.bricks_left = np.empty(num_envs, dtype=np.int64)
+        self.game_time = np.empty(num_envs, dtype=np.float64)
+        self.win_state = np.empty(num_envs, dtype=np.int8)
+        self.reset()
+
+    def reset(self, mask: np.ndarray | None = None):
+        """Reset all games, or only those selected by a boolean mask."""
+        idx = slice(None) if mask is None else mask
+        self.ball_pos[idx] = (self.size.x / 2, self.size.y / 2)
+        self.ball_vel[idx] = (self.ball_initial_velocity.x, self.ball_initial_velocity.y)
+        self.paddle_x[idx] = self.size.x / 2
+        self.bricks_alive[idx] = True
+        self.bricks_left[idx] = self.brick_rows * self.brick_cols
+        self.game_time[idx] = 0.0
+        self.win_state[idx] = WinState.ONGOING.value
+
+    def step(self, dt: float, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Advance every game by dt.
+        Returns (win_state, bricks_hit): the per-game outcome of this step before auto-reset, and whether a brick broke.
+        """
+        r = self.ball_radius
+        pos = self.ball_pos
+        vel = self.ball_vel
+        self.game_time += dt
+
+        # Move paddle
+        self.paddle_x += np.asarray(actions) * self.paddle_vel * dt
+        np.clip(self.paddle_x, self.paddle_bounds[0], self.paddle_bounds[1], out=self.paddle_x)
+
+        # Update ball position
+        pos += vel * dt
+
+        # Paddle collision
+        half_l = self.paddle_size.x / 2
+        half_h = self.paddle_size.y / 2
+        paddle_top = self.paddle_y - half_h
+        hit_paddle = self._circle_hits_box(pos[:, 0], pos[:, 1], self.paddle_x - half_l, paddle_top,
+                                           self.paddle_x + half_l, self.paddle_y + half_h)
+        pos[hit_paddle, 1] = paddle_top - r - 1
+        vel[hit_paddle, 1] *= -1
+
+        bricks_hit = self._brick_collisions()
+
+        # Wall collisions
+        side = (pos[:, 0] - r < 0) | (pos[:, 0] + r > self.size.x)
+        vel[side, 0] *= -1
+        vel[pos[:, 1] - r < 0, 1] *= -1
+        self.win_state[pos[:, 1] + r > self.size.y] = WinState.LOST.value
+        self.win_state[(self.bricks_left == 0) & (self.win_state == WinState.ONGOING.value)] = WinState.WON.value
+
+        win_state = self.win_state.copy()
+        done = win_state != WinState.ONGOING.value
+        if done.any():
+            self.reset(done)
+        return win_state, bricks_hit
+
+    def _brick_collisions(self) -> np.ndarray:
+        r = self.ball_radius
+        pos = self.ball_pos
+        x = pos[:, 0]
+        y = pos[:, 1]
+        n = self.num_envs
+
+        # Candidate cells around the ball, in row-major order so the first hit matches the scalar scan
+        row0 = np.floor((y - r - BRICK_TOP_OFFSET) / self.brick_size.y).astype(np.int64)
+        col0 = np.floor((x - r) / self.brick_size.x).astype(np.int64)
+        rows = row0[:, None, None] + self._cand_rows[None, :, None]
+        cols = col0[:, None, None] + self._cand_cols[None, None, :]
+        rows, cols = np.broadcast_arrays(rows, cols)
+        rows = rows.reshape(n, -1)
+        cols = cols.reshape(n, -1)
+        valid = (rows >= 0) & (rows < self.brick_rows) & (cols >= 0) & (cols < self.brick_cols)
+        rows_c = np.clip(rows, 0, self.brick_rows - 1)
+        cols_c = np.clip(cols, 0, self.brick_cols - 1)
+
+        env = np.arange(n)[:, None]
+        x0 = self.brick_x0[cols_c]
+        x1 = self.brick_x1[cols_c]
+        y0 = self.brick_y0[rows_c]
+        y1 = self.brick_y1[rows_c]
+        hits = valid & self.bricks_alive[env, rows_c, cols_c] & self._circle_hits_box(x[:, None], y[:, None], x0, y0, x1, y1)
+
+        any_hit = hits.any(axis=1)
+        if not any_hit.any():
+            return any_hit
+        first = hits.argmax(axis=1)
+        e = np.nonzero(any_hit)[0]
+        k = first[e]
+        self.bricks_alive[e, rows_c[e, k], cols_c[e, k]] = False
+        self.bricks_left[e] -= 1
+
+        # Closest side of the brick to the ball centre: left, right, top, bottom (ties pick the first)
+        bx = x[e]
+        by = y[e]
+        distances = np.stack([np.abs(bx - x0[e, k]), np.abs(bx - x1[e, k]), np.abs(by - y0[e, k]), np.abs(by - y1[e, k])], axis=1)
+        side = distances.argmin(axis=1)
+        flip_x = side < 2
+        self.ball_vel[e[flip_x], 0] *= -1
+        self.ball_vel[e[~flip_x], 1] *= -1
+        return any_hit
+
+    def _circle_hits_box(self, cx, cy, x0, y0, x1, y1) -> np.ndarray:
+        closest_x = np.maximum(x0, np.minimum(cx, x1))
+        closest_y = np.maximum(y0, np.minimum(cy, y1))
+        dx = cx - closest_x
+        dy = cy - closest_y
+        inside = (x0 <= cx) & (cx <= x1) & (y0 <= cy) & (cy <= y1)
+        return (dx**2 + dy**2 < self.ball_radius**2) | inside
+
+    def __repr__(self):
+        return f"vector_sim(num_envs={self.num_envs}, bricks_left={int(self.bricks_left.sum())})"
@@ -1,11 +1,18 @@
-from .model import Linear_QNet, QTrainer, RUN_DEVICE
-from .plotting import plotter
+from .model import Linear_QNet, QTrainer, MODEL_DIR
+from .device import resolve_device, resolve_act_device, configure_threads
+from .plotting import make_plotter
+from .replay import ReplayBuffer, PrioritizedReplayBuffer
+from .inference import InferencePolicy
+from .checkpoint import CheckpointManager, CHECKPOINT_DIR, CHECKPOINT_EVERY
+from .profiling import train_profiler, STATS_INTERVAL, STATS_LOG
+from .env import BreakoutEnv, make_game, to_reward, PADDLE_MOVES, ACTION_REPEAT, MAX_GAME_TIME, STATE_SIZE
 
 import torch
+import os
 import random
 import numpy as np
-from collections import deque
-from game.breakout_sim import breakout_sim, paddle_move, WinState, GameState
+from typing import Callable, NamedTuple
+from game.breakout_sim import paddle_move, WinState, GameState
 from game.constants import *
 from time import time
 from datetime import timedelta
@@ -14,74 +21,145 @@ MAX_MEMORY = 100_000
 SHORT_BATCH_SIZE = 10
 BATCH_SIZE = 1000
 LR = 0.001
-MAX_GAME_TIME = 300.0  # seconds
 HIDDEN_NODES = 256
 DISCOUNT_FACTOR = 0.9
 DISPLAY_RENDER_DT = 1.0 / 30.0  # seconds
 NUM_EPISODES = 10
 EPISODES_FOR_EXPLORATION = 1
+PLOT_MODE = 'gui'  # see learning.plotting.make_plotter
+INFERENCE_BACKEND = 'eager'  # see learning.inference.INFERENCE_BACKENDS
+TARGET_UPDATE = 'none'  # 'none', 'hard' or 'polyak', see QTrainer
+TARGET_SYNC_EVERY = 500  # gradient steps between hard target updates
+TARGET_TAU = 0.005  # Polyak step size
+DOUBLE_DQN = False
+LONG_GRADIENT_STEPS = 1  # gradient steps per sampled long-memory batch (bootstrap targets computed once)
+PRIORITIZED_REPLAY = False
+PER_ALPHA = 0.6  # how strongly priorities skew sampling (0 = uniform)
+PER_BETA = 0.4  # initial importance-sampling correction, annealed to 1
+PER_BETA_INCREMENT = 1e-4  # per long-memory batch
+
+class TrainConfig(NamedTuple):
+    """Training hyperparameters. Fields default to the module constants above; see default_config()."""
+    lr: float = LR
+    hidden_nodes: int = HIDDEN_NODES
+    gamma: float = DISCOUNT_FACTOR
+    batch_size: int = BATCH_SIZE
+    short_batch_size: int = SHORT_BATCH_SIZE
+    episodes_for_exploration: int = EPISODES_FOR_EXPLORATION
+    max_memory: int = MAX_MEMORY
+    num_episodes: int = NUM_EPISODES
+
+def default_config(**overrides) -> TrainConfig:
+    """TrainConfig from the module constants as they are now (scripts and benchmarks patch them), plus overrides."""
+    return TrainConfig(lr=LR, hidden_nodes=HIDDEN_NODES, gamma=DISCOUNT_FACTOR, batch_size=BATCH_SIZE,
+                       short_batch_size=SHORT_BATCH_SIZE, episodes_for_exploration=EPISODES_FOR_EXPLORATION,
+                       max_memory=MAX_MEMORY, num_episodes=NUM_EPISODES)._replace(**overrides)
 
 class Agent:
-    def __init__(self):
+    def __init__(self, device: torch.device | str | None = None, act_device: torch.device | str | None = None,
+                 seed: int | None = None, inference_backend: str = INFERENCE_BACKEND, target_update: str = TARGET_UPDATE,
+                 target_sync_every: int = TARGET_SYNC_EVERY, tau: float = TARGET_TAU, double_dqn: bool = DOUBLE_DQN,
+                 long_gradient_steps: int = LONG_GRADIENT_STEPS, prioritized: bool = PRIORITIZED_REPLAY,
+                 per_alpha: float = PER_ALPHA, per_beta: float = PER_BETA, config: TrainConfig | None = None):
+        """
+        config: hyperparameters (default_config() by default).
+        device: where the model trains (BREAKOUT_DEVICE / auto-detect by default).
+        act_device: where get_action runs inference (BREAKOUT_ACT_DEVICE / cpu by default). When it differs from
+        device, a copy of the model is kept there and refreshed after training steps.
+        inference_backend: how actions are computed, see learning.inference.InferencePolicy.
+        target_update / target_sync_every / tau / double_dqn: bootstrap target options, see QTrainer.
+        long_gradient_steps: gradient steps taken on each long-memory batch.
+        prioritized / per_alpha / per_beta: sample long-memory batches by TD error, see PrioritizedReplayBuffer.
+        seed: seeds exploration, replay sampling and (when no saved model is loaded) the initial weights.
+        """
+        if long_gradient_steps < 1:
+            raise ValueError(f"long_gradient_steps must be at least 1, got {long_gradient_steps}")
+        if seed is not None:
+            torch.manual_seed(seed)
+        self.rng = random.Random(seed)
+        self.config = config = config or default_config()
+        self.device = resolve_device(device)
+        self.act_device = resolve_act_device(act_device)
         self.n_games = 0
+        self.n_updates = 0  # gradient steps taken
         self.epsilon = 0  # randomness
-        self.gamma = DISCOUNT_FACTOR  # discount rate
-        self.memory = deque(maxlen=MAX_MEMORY)  # popleft()
+        self.gamma = config.gamma  # discount rate
+        state_size = STATE_SIZE
+        # oldest transitions are overwritten
+        if prioritized:
+            self.memory = PrioritizedReplayBuffer(capacity=config.max_memory, state_size=state_size, seed=seed, alpha=per_alpha,
+                                                  beta=per_beta)
+        else:
+            self.memory = ReplayBuffer(capacity=config.max_memory, state_size=state_size, seed=seed)
         # Placeholder for model and trainer
-        self.model = Linear_QNet(input_size=5 + BRICK_ROWS * (SCREEN_SIZE.x // BRICK_SIZE.x), hidden_size=HIDDEN_NODES, output_size=3)
+        self.model = Linear_QNet(input_size=state_size, hidden_size=config.hidden_nodes, output_size=3, device=self.device)
         self.model.load()  # load existing model if available
-        self.trainer = QTrainer(model=self.model, lr=LR, gamma=self.gamma)
-        self._device = RUN_DEVICE
+        self.trainer = QTrainer(model=self.model, lr=config.lr, gamma=self.gamma, device=self.device, target_update=target_update,
+                                target_sync_every=target_sync_every, tau=tau, double_dqn=double_dqn)
+        self.long_gradient_steps = long_gradient_steps
+        self.policy = InferencePolicy(self.model, backend=inference_backend, device=self.act_device)
+        self._policy_stale = False
         self.short_mem = []
 
-    def remember(self, state: np.ndarray, action: float, reward: float, next_state: np.ndarray, done: bool):
-        self.memory.append((state, action, reward, next_state, done))
+    def remember(self, state: np.ndarray, action: int, reward: float, next_state: np.ndarray, done: bool):
+        self.memory.append(state, action, reward, next_state, done)
 
     def train_long_memory(self):
-        if len(self.memory) > BATCH_SIZE:
-            mini_sample = random.sample(self.memory, BATCH_SIZE)  # list of tuples
+        if isinstance(self.memory, PrioritizedReplayBuffer):
+            idx, weights, batch = self.memory.sample_prioritized(self.config.batch_size)
+            self.train_batch(batch, weights)
+            self.memory.update_priorities(idx, self.trainer.last_td_errors.cpu().numpy())
+            self.memory.beta = min(1.0, self.memory.beta + PER_BETA_INCREMENT)
         else:
-            mini_sample = self.memory
+            self.train_batch(self.memory.sample(self.config.batch_size))
 
-        states, actions, rewards, next_states, dones = zip(*mini_sample)
-        self.trainer.train_step(states, actions, rewards, next_states, dones)
+    def train_batch(self, batch: tuple, weights: np.ndarray | None = None):
+        """Long-memory update on a (states, actions, rewards, next_states, dones) batch, e.g. from a BatchLoader."""
+        self.trainer.train_step(*batch, gradient_steps=self.long_gradient_steps, weights=weights)
+        self.n_updates += self.long_gradient_steps
+        self._policy_stale = True
 
-    def train_short_memory(self, state: np.ndarray, action: float, reward: float, next_state: np.ndarray, done: bool):
+    def train_short_memory(self, state: np.ndarray, action: int, reward: float, next_state: np.ndarray, done: bool):
         self.short_mem.append((state, action, reward, next_state, done))
-        if len(self.short_mem) >= SHORT_BATCH_SIZE or done:
+        if len(self.short_mem) >= self.config.short_batch_size or done:
             states, actions, rewards, next_states, dones = zip(*self.short_mem)
             self.trainer.train_step(states, actions, rewards, next_states, dones)
             self.short_mem.clear()
-
-    def get_action(self, state: np.ndarray, game_state: GameState) -> np.ndarray:
-        self.epsilon = EPISODES_FOR_EXPLORATION - self.n_games
-        move = [0, 0, 0]
-        if random.randint(0, 200) < self.epsilon:
-            # move the paddle towards the ball
-            ball_x = game_state.ball.position.x
-            paddle_x = game_state.paddle.position.x
-            if ball_x < paddle_x:
-                move[0] = 1  # move left
-            elif ball_x > paddle_x:
-                move[2] = 1  # move right
-            else:
-                move[1] = 1  # stay
-        else:
-            state0 = torch.tensor(state, dtype=torch.float, device=self._device)
-            prediction = self.model(state0)
-            move_index = torch.argmax(prediction).item()
-            move[move_index] = 1
-        return np.array(move)
-
-def to_reward(state: GameState, last_state: GameState) -> float:
-    if state.win_state == WinState.WON:
-        return 1.0
-    elif state.win_state == WinState.LOST:
-        return -1.0
-   
-    if (state.num_bricks_left() < last_state.num_bricks_left()):
-        return 0.1  # small reward for breaking a brick
-    return 0.0
+            self.n_updates += 1
+            self._policy_stale = True
+
+    def _sync_policy(self):
+        if self._policy_stale:
+            self.policy.sync()
+            self._policy_stale = False
+
+    def get_action(self, state: np.ndarray, game_state: GameState) -> int:
+        """Move index (into PADDLE_MOVES) for one state: scripted while exploring, otherwise the model's greedy move."""
+        self.epsilon = self.config.episodes_for_exploration - self.n_games
+        if self.rng.randint(0, 200) < self.epsilon:
+            return towards_ball_move(game_state)
+        self._sync_policy()
+        return self.policy.act_one(state)
+
+    def get_actions(self, states: np.ndarray, game_states: list[GameState]) -> np.ndarray:
+        """Batched get_action for several games: (n, state_size) states in, n move indices out."""
+        self.epsilon = self.config.episodes_for_exploration - self.n_games
+        self._sync_policy()
+        moves = self.policy.act(states)
+        for i, game_state in enumerate(game_states):
+            if self.rng.randint(0, 200) < self.epsilon:
+                moves[i] = towards_ball_move(game_state)
+        return moves
+
+def towards_ball_move(game_state: GameState) -> int:
+    """Scripted exploration policy: the move index that takes the paddle towards the ball."""
+    ball_x = game_state.ball.position.x
+    paddle_x = game_state.paddle.position.x
+    if ball_x < paddle_x:
+        return 0  # move left
+    elif ball_x > paddle_x:
+        return 2  # move right
+    return 1  # stay
 
 def to_state_vector(state: GameState) -> np.ndarray:
     ball = state.ball
@@ -112,9 +190,6 @@ def to_paddle_move(action: np.ndarray) -> paddle_move:
     else:
         return paddle_move.RIGHT
 
-def make_game() -> breakout_sim:
-    return breakout_sim(size=SCREEN_SIZE, brick_rows=BRICK_ROWS, brick_size=BRICK_SIZE, paddle_size=PADDLE_SIZE, ball_radius=BALL_RADIUS, paddle_vel=PADDLE_SPEED)
-
 class score:
     def __init__(self, game_state: GameState = None):
         self.percentage_broken = 0.0
@@ -132,69 +207,174 @@ class score:
         return self.percentage_broken < other.percentage_broken  # more broken is better
 
 
-def train(use_display: bool = False):
-    a_plotter = plotter()
+def train(use_display: bool = False, action_repeat: int = ACTION_REPEAT, device: str | None = None, act_device: str | None = None,
+          num_threads: int | None = None, plot_mode: str = PLOT_MODE, display_process: bool = False,
+          stats_interval: float = STATS_INTERVAL, stats_log: str | None = STATS_LOG, profile: str = 'none',
+          seed: int | None = None, inference_backend: str = INFERENCE_BACKEND, checkpoint_dir: str = CHECKPOINT_DIR,
+          checkpoint_every: int = CHECKPOINT_EVERY, resume: bool = False, target_update: str = TARGET_UPDATE,
+          target_sync_every: int = TARGET_SYNC_EVERY, tau: float = TARGET_TAU, double_dqn: bool = DOUBLE_DQN,
+          long_gradient_steps: int = LONG_GRADIENT_STEPS, prioritized: bool = PRIORITIZED_REPLAY,
+          record_dir: str | None = None, dataset_dir: str | None = None, offline_steps: int = 0, offline_only: bool = False,
+          config: TrainConfig | None = None, on_episode: Callable[[int, 'score', str], bool | None] | None = None):
+    """
+    display_process: with use_display, draw in a separate process fed by a shared-memory snapshot.
+    seed: makes the agent's exploration, replay sampling and fresh weights reproducible.
+    inference_backend: 'eager', 'jit', 'compile' or 'numpy' action selection (learning.inference).
+    stats_interval / stats_log / profile: see learning.profiling.train_profiler.
+    checkpoint_every: games between checkpoints written to checkpoint_dir (0 = only at the end).
+    resume: continue from the latest checkpoint in checkpoint_dir, if there is one.
+    target_update / target_sync_every / tau / double_dqn / long_gradient_steps / prioritized: see Agent and QTrainer.
+    record_dir: record every episode there (game.recording), for replay_episode.py.
+    dataset_dir: an offline dataset (learning.dataset) to pre-fill the replay memory from.
+    offline_steps: long-memory batches streamed from dataset_dir before playing; offline_only stops after them.
+    config: hyperparameters, default_config() by default.
+    on_episode: called as on_episode(n_games, score, result) after every game; returning False ends training there.
+    """
+    config = config or default_config()
+    configure_threads(num_threads)
     record = score()
-    agent = Agent()
-    game = make_game()
+    agent = Agent(device=device, act_device=act_device, seed=seed, inference_backend=inference_backend,
+                  target_update=target_update, target_sync_every=target_sync_every, tau=tau, double_dqn=double_dqn,
+                  long_gradient_steps=long_gradient_steps, prioritized=prioritized, config=config)
+    stats = train_profiler(interval=stats_interval, log_path=stats_log, profile=profile)
+    a_plotter = make_plotter(plot_mode)
+    checkpoints = CheckpointManager(checkpoint_dir)
+    env = recorder = disp = None
+    try:
+        if resume:
+            resumed = checkpoints.load(agent)
+            if resumed is None:
+                print(f"No checkpoint in {checkpoint_dir}, starting fresh.")
+            else:
+                if resumed['extra'].get('record') is not None:  # checkpoints saved without one keep the fresh record
+                    record.percentage_broken, record.time = resumed['extra']['record']
+                print(f"Resumed at game {agent.n_games} ({agent.n_updates} updates), record {record}")
+        if dataset_dir:
+            _train_from_dataset(agent, dataset_dir, offline_steps, seed, stats)
+            if offline_only:
+                checkpoints.save_model(agent.model, os.path.join(MODEL_DIR, 'model.pth'))
+                checkpoints.save(agent, step=agent.n_games, extra=dict(record=(record.percentage_broken, record.time)))
+                return
+        start_games = agent.n_games
+        env = BreakoutEnv(action_repeat=action_repeat, profiler=stats)
+        game = env.game
+        state_vector_old, _ = env.reset()
+        if record_dir:
+            from game.recording import episode_recorder
+            recorder = episode_recorder(record_dir, game, dt=TRAIN_SIM_DT, action_repeat=action_repeat)
+            recorder.begin_episode(env.episode_seed)
+        start_time = time()
+        next_display_time = time() + DISPLAY_RENDER_DT
+        if use_display and display_process:
+            from display.remote import remote_display
+            disp = remote_display(game, caption="Breakout (AI Training)")
+        elif use_display:
+            from display.display import breakout_display
+            disp = breakout_display(game, scale=1, caption="Breakout (AI Training)")
+        updates_seen = agent.n_updates
+        stopped = False
+        while agent.n_games < config.num_episodes and not stopped:
+            stats.begin_step()
+
+            if use_display and time() >= next_display_time:
+                disp.render()
+                next_display_time =  time() + DISPLAY_RENDER_DT
+            stats.lap('display')
+
+            # get old state
+            state_old = game.game_state()
+            time_old = state_old.game_time
+
+            # get move
+            action = agent.get_action(state_vector_old, state_old)
+            stats.lap('act')
+
+            # perform move for action_repeat ticks (or until the game ends) and get new state; the env laps 'sim',
+            # 'reward' and 'encode'
+            state_vector_new, reward, terminated, truncated, _ = env.step(action)
+            state_new = game.game_state()
+            if recorder is not None:
+                recorder.record(PADDLE_MOVES[action])
+                stats.lap('record')
+
+            # a game cut off at MAX_GAME_TIME is truncated, not lost: its last state still bootstraps
+            agent.train_short_memory(state_vector_old, action, reward, state_vector_new, terminated)
+            stats.lap('train_short')
+
+            # remember
+            agent.remember(state_vector_old, action, reward, state_vector_new, terminated)
+            state_vector_old = state_vector_new
+            stats.lap('remember')
+            stats.count('env_steps', round((state_new.game_time - time_old) / TRAIN_SIM_DT))
+
+            if terminated or truncated:
+                new_score = score(state_new)
+                result = state_new.win_state if terminated else 'TRUNCATED'
+                if recorder is not None:
+                    recorder.end_episode(None if terminated else 'TRUNCATED')
+                state_vector_old, _ = env.reset()  # the display resyncs through the sim's reset listeners
+                if recorder is not None:
+                    recorder.begin_episode(env.episode_seed)
+                stats.lap('reset')
+                # train long memory, plot result
+
+                agent.n_games += 1
+                agent.train_long_memory()
+                stats.lap('train_long')
+
+                if new_score > record:
+                    print("\nNew Record!")
+                    checkpoints.save_model(agent.model, os.path.join(MODEL_DIR, 'model.pth'))
+                    record = new_score
+                if checkpoint_every and agent.n_games % checkpoint_every == 0:
+                    checkpoints.save(agent, step=agent.n_games, extra=dict(record=(record.percentage_broken, record.time)))
+                stats.lap('checkpoint')
+
+                elapsed_time = time() - start_time
+                time_p_run = elapsed_time / (agent.n_games - start_games)
+                remaining_time = time_p_run * (config.num_episodes - agent.n_games)
+
+                print(f'({timedelta(seconds=int(elapsed_time))}: Rem: {timedelta(seconds=int(remaining_time))}: Avg {time_p_run}s) Game {agent.n_games} Result: {result} {new_score}, Record: {record}')
+                a_plotter.add_score(new_score)
+                a_plotter.plot()
+                stats.lap('plot')
+                stats.count('games')
+                stopped = on_episode is not None and on_episode(agent.n_games, new_score, result.name if terminated else result) is False
+
+            stats.count('updates', agent.n_updates - updates_seen)
+            updates_seen = agent.n_updates
+            stats.end_step()
+
+        if agent.n_games > start_games and (not checkpoint_every or agent.n_games % checkpoint_every):
+            checkpoints.save(agent, step=agent.n_games, extra=dict(record=(record.percentage_broken, record.time)))
+    finally:
+        checkpoints.close()
+        if recorder is not None:
+            recorder.close()
+        if disp is not None:
+            disp.close()
+        if env is not None:
+            env.close()
+        stats.close()
+        a_plotter.close()
+
+
+def _train_from_dataset(agent: Agent, dataset_dir: str, offline_steps: int, seed: int | None, stats: train_profiler):
+    """Pre-fill agent.memory from the dataset, then take offline_steps long-memory updates on batches streamed from it."""
+    from .dataset import TransitionDataset, BatchLoader
+    dataset = TransitionDataset(dataset_dir)
+    filled = dataset.fill(agent.memory)
+    print(f"Pre-filled replay memory with {filled} of {len(dataset)} transitions from {dataset_dir}")
+    if offline_steps <= 0:
+        return
     start_time = time()
-    next_display_time = time() + DISPLAY_RENDER_DT
-    if use_display:
-        from display.display import breakout_display
-        disp = breakout_display(game, scale=1, caption="Breakout (AI Training)")
-    while agent.n_games < NUM_EPISODES:
-
-        if use_display and time() >= next_display_time:
-            disp.render()
-            next_display_time =  time() + DISPLAY_RENDER_DT
-
-        # get old state
-        state_old = game.game_state()
-        state_vector_old = to_state_vector(state_old)
-
-        # get move
-        action = agent.get_action(state_vector_old, state_old)
-        paddle_action = to_paddle_move(action)
-        
-        # perform move and get new state
-        state_new = game.step(SIM_DT, paddle_action=paddle_action)
-        reward = to_reward(state_new, state_old)
-
-        state_vector_new = to_state_vector(state_new)
-
-        if state_new.game_time >= MAX_GAME_TIME:
-            #force the game over if we took to long, we then get a punihment for being slow
-            state_new.win_state = WinState.LOST
-
-        is_game_over = state_new.win_state != WinState.ONGOING 
-
-        # train short memory
-        agent.train_short_memory(state_vector_old, action, reward, state_vector_new, is_game_over)
-
-        # remember
-        agent.remember(state_vector_old, action, reward, state_vector_new, is_game_over)
-
-        if is_game_over:
-            game = make_game()
-            if use_display:
-                disp.reset(game)
-            # train long memory, plot result
-            
-            agent.n_games += 1
-            agent.train_long_memory()
-
-            new_score = score(state_new)
-            if new_score > record:
-                print("\nNew Record!")
-                agent.model.save()
-                record = new_score
-
-            elapsed_time = time() - start_time
-            time_p_run = elapsed_time / agent.n_games
-            estimated_total_time = time_p_run * NUM_EPISODES
-            remaining_time = estimated_total_time - elapsed_time
-
-            print(f'({timedelta(seconds=int(elapsed_time))}: Rem: {timedelta(seconds=int(remaining_time))}: Avg {time_p_run}s) Game {agent.n_games} Result: {state_new.win_state} {new_score}, Record: {record}')
-            a_plotter.add_score(new_score)
-            a_plotter.plot()
-
+    with BatchLoader(dataset, batch_size=agent.config.batch_size, seed=seed) as loader:
+        for step in range(offline_steps):
+            stats.begin_step()
+            batch = loader.next()
+            stats.lap('load')
+            agent.train_batch(batch)
+            stats.lap('train_long')
+            stats.count('updates', agent.long_gradient_steps)
+            stats.end_step()
+    print(f"Offline training: {offline_steps} batches in {timedelta(seconds=int(time() - start_time))}, {agent.n_updates} updates")
@@ -0,0 +1,172 @@
+"""
+Training checkpoints.
+
+A checkpoint is a directory holding state.pt (model and optimizer state dicts, RNG states, counters) and one .npy file
+per replay array (the transition fields, plus priorities for prioritized replay). save() snapshots everything on the
+calling thread, then a background thread writes it to <name>.tmp and renames it into place, so a crash never leaves a
+half-written checkpoint behind. Only the newest keep_last checkpoints are kept. Replay arrays are read back memory-mapped and copied straight into the buffer.
+"""
+import os
+import queue
+import random
+import shutil
+import threading
+import numpy as np
+import torch
+
+CHECKPOINT_DIR = './checkpoints'
+KEEP_LAST = 3
+CHECKPOINT_EVERY = 50  # games between checkpoints in train
+_PREFIX = 'ckpt-'
+
+def _detached(obj):
+    """Deep copy of a (nested) state dict with every tensor cloned to the CPU, safe to write while training goes on."""
+    if isinstance(obj, torch.Tensor):
+        return obj.detach().to('cpu', copy=True)
+    if isinstance(obj, dict):
+        return {k: _detached(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_detached(v) for v in obj)
+    return obj
+
+def _rng_states(agent) -> dict:
+    states = dict(python=random.getstate(), agent=agent.rng.getstate(), numpy=np.random.get_state(),
+                  torch=torch.get_rng_state())
+    if torch.cuda.is_available():
+        states['cuda'] = torch.cuda.get_rng_state_all()
+    return states
+
+def _set_rng_states(agent, states: dict):
+    random.setstate(states['python'])
+    agent.rng.setstate(states['agent'])
+    np.random.set_state(states['numpy'])
+    torch.set_rng_state(states['torch'])
+    if 'cuda' in states and torch.cuda.is_available():
+        torch.cuda.set_rng_state_all(states['cuda'])
+
+class CheckpointManager:
+    def __init__(self, directory: str = CHECKPOINT_DIR, keep_last: int = KEEP_LAST):
+        self.directory = directory
+        self.keep_last = keep_last
+        self._jobs = queue.Queue(maxsize=1)  # at most one snapshot waiting behind the one being written
+        self._error = None
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    # ------------- saving -------------
+    def save(self, agent, step: int, extra: dict | None = None) -> str:
+        """Snapshot agent (and extra, e.g. the record score) now and write it in the background. Returns the final path."""
+        self._raise_pending_error()
+        state = dict(model=_detached(agent.model.state_dict()), optimizer=_detached(agent.trainer.optimizer.state_dict()),
+                     rng=_rng_states(agent), n_games=agent.n_games, n_updates=agent.n_updates, step=step, extra=extra or {})
+        if agent.trainer.target_model is not None:
+            state['target_model'] = _detached(agent.trainer.target_model.state_dict())
+        state['trainer_steps'] = agent.trainer.steps
+        replay = agent.memory.state_dict()
+        path = os.path.join(self.directory, f"{_PREFIX}{step:09d}")
+        self._jobs.put(('checkpoint', path, (state, replay)))
+        return path
+
+    def save_model(self, model, path: str):
+        """Write just the model's state dict to path in the background, atomically."""
+        self._raise_pending_error()
+        self._jobs.put(('model', path, _detached(model.state_dict())))
+
+    def wait(self):
+        """Block until every queued save has been written."""
+        self._jobs.join()
+        self._raise_pending_error()
+
+    def close(self):
+        self._jobs.put(None)
+        self._thread.join()
+        self._raise_pending_error()
+
+    def _raise_pending_error(self):
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("A background checkpoint save failed") from error
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            try:
+                if job is None:
+                    return
+                kind, path, payload = job
+                if kind == 'model':
+                    self._write_model(path, payload)
+                else:
+                    self._write_checkpoint(path, *payload)
+                    self._prune()
+            except Exception as e:  # surfaced on the training thread by the next save / wait / close
+                self._error = e
+            finally:
+                self._jobs.task_done()
+
+    @staticmethod
+    def _write_model(path: str, state_dict: dict):
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp = path + '.tmp'
+        torch.save(state_dict, tmp)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _write_checkpoint(path: str, state: dict, replay: dict):
+        tmp = path + '.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        arrays = {name: value for name, value in replay.items() if isinstance(value, np.ndarray)}
+        for name, array in arrays.items():
+            out = np.lib.format.open_memmap(os.path.join(tmp, f"replay_{name}.npy"), mode='w+', dtype=array.dtype,
+                                            shape=array.shape)
+            out[...] = array
+            out.flush()
+            del out
+        state['replay'] = {name: value for name, value in replay.items() if name not in arrays}  # rng state, beta, ...
+        torch.save(state, os.path.join(tmp, 'state.pt'))
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+
+    def _prune(self):
+        for path in self.checkpoints()[:-self.keep_last]:
+            shutil.rmtree(path, ignore_errors=True)
+
+    # ------------- loading -------------
+    def checkpoints(self) -> list[str]:
+        """Complete checkpoints, oldest first."""
+        if not os.path.isdir(self.directory):
+            return []
+        names = sorted(n for n in os.listdir(self.directory) if n.startswith(_PREFIX) and not n.endswith('.tmp'))
+        return [os.path.join(self.directory, n) for n in names]
+
+    def latest(self) -> str | None:
+        found = self.checkpoints()
+        return found[-1] if found else None
+
+    def load(self, agent, path: str | None = None) -> dict | None:
+        """
+        Restore agent from path (default: the latest checkpoint) and return the checkpoint's state dict, whose 'step' and
+        'extra' entries hold what was passed to save(). Returns None if there is nothing to resume from.
+        Everything is loaded onto the CPU first (load_state_dict then moves it to the agent's device), so checkpoints
+        written on a GPU load on CPU-only machines.
+        """
+        path = path or self.latest()
+        if path is None:
+            return None
+        state = torch.load(os.path.join(path, 'state.pt'), map_location='cpu', weights_only=False)
+        agent.model.load_state_dict(state['model'])
+        agent.trainer.optimizer.load_state_dict(state['optimizer'])
+        agent.trainer.steps = state.get('trainer_steps', 0)
+        if agent.trainer.target_model is not None:
+            # a checkpoint from a run without a target network starts the target from the online weights
+            agent.trainer.target_model.load_state_dict(state.get('target_model', state['model']))
+        replay = {name[len('replay_'):-len('.npy')]: np.load(os.path.join(path, name), mmap_mode='r')
+                  for name in os.listdir(path) if name.startswith('replay_') and name.endswith('.npy')}
+        replay.update(state['replay'])
+        agent.memory.load_state_dict(replay)
+        _set_rng_states(agent, state['rng'])
+        agent.n_games = state['n_games']
+        agent.n_updates = state['n_updates']
+        agent._policy_stale = True
+        return state
@@ -0,0 +1,192 @@
+"""
+Offline transition datasets.
+
+build_dataset() plays the scripted towards_ball_move policy (with a share of random moves) on headless BreakoutEnvs in
+worker processes and stores the transitions as a directory of shards:
+    meta.json                       state size, action_repeat, policy settings and the finished shards
+    shard-00000.<field>.npy         one file per replay FIELDS entry, written in place through np.memmap
+Shard k is always generated from seed + k, so a dataset's content depends only on its size, shard size and seed, not
+on how many workers built it. meta.json is written last (atomically), listing only complete shards.
+
+TransitionDataset reads the shards back memory-mapped. fill() copies transitions into a ReplayBuffer; BatchLoader
+samples uniform batches on a background thread so gathering from disk overlaps training.
+"""
+import json
+import os
+import queue
+import random
+import threading
+import multiprocessing as mp
+import numpy as np
+from .agent import towards_ball_move, BATCH_SIZE
+from .env import BreakoutEnv, ACTION_REPEAT, MAX_GAME_TIME, STATE_SIZE
+from .replay import FIELDS, ReplayBuffer
+
+DATASET_VERSION = 1
+META_FILE = 'meta.json'
+SHARD_SIZE = 65536  # transitions per shard
+RANDOM_MOVES = 0.2  # share of steps that take a uniformly random move instead of the scripted one
+PREFETCH_BATCHES = 4
+_DTYPES = dict(states=np.float32, actions=np.int8, rewards=np.float32, next_states=np.float32, dones=np.bool_)
+
+def _shard_path(directory: str, shard: int, field: str) -> str:
+    return os.path.join(directory, f"shard-{shard:05d}.{field}.npy")
+
+def _build_shard(directory: str, shard: int, size: int, seed: int, action_repeat: int, max_game_time: float,
+                 random_moves: float) -> dict:
+    """Generate one shard of size transitions, writing straight into its memory-mapped files. Returns its meta entry."""
+    arrays = {}
+    for field in FIELDS:
+        shape = (size, STATE_SIZE) if field in ('states', 'next_states') else (size,)
+        arrays[field] = np.lib.format.open_memmap(_shard_path(directory, shard, field), mode='w+', dtype=_DTYPES[field],
+                                                  shape=shape)
+    states, actions, rewards, next_states, dones = (arrays[field] for field in FIELDS)
+    rng = random.Random(seed + shard)
+    env = BreakoutEnv(action_repeat, max_game_time)
+    obs = np.empty(STATE_SIZE, dtype=np.float32)
+    env.reset(seed=seed + shard, out=obs)
+    episodes = 0
+    for i in range(size):
+        states[i] = obs
+        action = rng.randrange(env.num_actions) if rng.random() < random_moves else towards_ball_move(env.game.game_state())
+        _, reward, terminated, truncated, _ = env.step(action, out=next_states[i])
+        actions[i] = action
+        rewards[i] = reward
+        dones[i] = terminated
+        if terminated or truncated:
+            episodes += 1
+            env.reset(out=obs)
+        else:
+            obs[:] = next_states[i]
+    env.close()
+    for array in arrays.values():
+        array.flush()
+    return dict(shard=shard, size=size, episodes=episodes, reward=float(rewards.sum(dtype=np.float64)))
+
+def _build_shard_args(args: tuple) -> dict:
+    return _build_shard(*args)
+
+def build_dataset(directory: str, transitions: int, num_workers: int = 0, shard_size: int = SHARD_SIZE, seed: int = 0,
+                  action_repeat: int = ACTION_REPEAT, max_game_time: float = MAX_GAME_TIME,
+                  random_moves: float = RANDOM_MOVES) -> dict:
+    """
+    Write a dataset of transitions transitions to directory (which must not already hold one) and return its meta.
+    num_workers: processes generating shards in parallel (0 = generate in this process).
+    """
+    if os.path.exists(os.path.join(directory, META_FILE)):
+        raise ValueError(f"{directory} already holds a dataset")
+    os.makedirs(directory, exist_ok=True)
+    sizes = [min(shard_size, transitions - start) for start in range(0, transitions, shard_size)]
+    tasks = [(directory, shard, size, seed, action_repeat, max_game_time, random_moves) for shard, size in enumerate(sizes)]
+    if num_workers > 0:
+        with mp.get_context('spawn').Pool(min(num_workers, len(tasks))) as pool:
+            shards = pool.map(_build_shard_args, tasks, chunksize=1)
+    else:
+        shards = [_build_shard(*task) for task in tasks]
+    meta = dict(version=DATASET_VERSION, state_size=STATE_SIZE, action_repeat=action_repeat, max_game_time=max_game_time,
+                seed=seed, random_moves=random_moves, policy='towards_ball', transitions=transitions, shards=shards)
+    tmp = os.path.join(directory, META_FILE + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(meta, f, indent=1)
+    os.replace(tmp, os.path.join(directory, META_FILE))
+    return meta
+
+class TransitionDataset:
+    """Memory-mapped read access to a build_dataset() directory, indexed by global transition number."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE)) as f:
+            self.meta = json.load(f)
+        self.state_size = self.meta['state_size']
+        self.shards = [{field: np.load(_shard_path(directory, s['shard'], field), mmap_mode='r') for field in FIELDS}
+                       for s in self.meta['shards']]
+        sizes = [s['size'] for s in self.meta['shards']]
+        self._starts = np.concatenate([[0], np.cumsum(sizes)]).astype(np.int64)
+
+    def __len__(self) -> int:
+        return int(self._starts[-1])
+
+    def gather(self, idx: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """(states, actions, rewards, next_states, dones) for global indices idx, in ascending index order."""
+        idx = np.sort(idx)
+        bounds = np.searchsorted(idx, self._starts)
+        out = []
+        for field in FIELDS:
+            parts = [shard[field][idx[lo:hi] - start]
+                     for shard, start, lo, hi in zip(self.shards, self._starts, bounds[:-1], bounds[1:]) if hi > lo]
+            out.append(np.concatenate(parts) if len(parts) != 1 else parts[0])
+        return tuple(out)
+
+    def fill(self, memory: ReplayBuffer, limit: int | None = None) -> int:
+        """Copy the first min(len, capacity, limit) transitions into memory, shard by shard. Returns how many."""
+        if memory.state_size != self.state_size:
+            raise ValueError(f"Dataset states have size {self.state_size}, the replay buffer expects {memory.state_size}")
+        n = min(len(self), memory.capacity, len(self) if limit is None else limit)
+        for shard, start in zip(self.shards, self._starts):
+            if start >= n:
+                break
+            stop = min(n - start, len(shard['states']))
+            memory.extend(*(shard[field][:stop] for field in FIELDS))
+        return n
+
+    def __repr__(self):
+        return f"TransitionDataset({self.directory!r}, transitions={len(self)}, shards={len(self.shards)})"
+
+class BatchLoader:
+    """
+    Endless uniform batches (with replacement) from a TransitionDataset, gathered on a background thread that keeps up
+    to prefetch batches ready. next() returns the same (states, actions, rewards, next_states, dones) tuple as
+    ReplayBuffer.sample(); with a seed the batch sequence is reproducible.
+    """
+
+    def __init__(self, dataset: TransitionDataset, batch_size: int = BATCH_SIZE, seed: int | None = None,
+                 prefetch: int = PREFETCH_BATCHES):
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self._rng = np.random.default_rng(seed)
+        self._batches = queue.Queue(maxsize=prefetch)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='batch-loader', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        n = len(self.dataset)
+        while not self._stop.is_set():
+            try:
+                batch = self.dataset.gather(self._rng.integers(0, n, size=min(self.batch_size, n)))
+            except Exception as e:  # re-raised by next()
+                batch = e
+            while not self._stop.is_set():
+                try:
+                    self._batches.put(batch, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            if isinstance(batch, Exception):
+                return
+
+    def next(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        batch = self._batches.get()
+        if isinstance(batch, Exception):
+            raise RuntimeError("The batch loader failed") from batch
+        return batch
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        return self.next()
+
+    def close(self):
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f"BatchLoader({self.dataset!r}, batch_size={self.batch_size})"
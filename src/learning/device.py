@@ -0,0 +1,46 @@
+import os
+import torch
+
+DEVICE_ENV_VAR = 'BREAKOUT_DEVICE'          # device for training, e.g. 'cuda', 'cuda:1', 'mps', 'cpu' or 'auto'
+ACT_DEVICE_ENV_VAR = 'BREAKOUT_ACT_DEVICE'  # device for single-sample action selection
+THREADS_ENV_VAR = 'BREAKOUT_NUM_THREADS'
+MAX_DEFAULT_THREADS = 4  # a 2-layer MLP stops scaling after a few intra-op threads
+
+def _mps_available() -> bool:
+    return hasattr(torch.backends, 'mps') and torch.backends.mps.is_available()
+
+def resolve_device(name: str | torch.device | None = None, env_var: str = DEVICE_ENV_VAR, default: str = 'auto') -> torch.device:
+    """
+    Pick a torch device from an explicit name, then the env var, then default.
+    'auto' prefers cuda, then mps, then cpu. A requested accelerator that isn't present falls back to cpu.
+    """
+    if isinstance(name, torch.device):
+        name = str(name)
+    name = name or os.environ.get(env_var) or default
+    if name == 'auto':
+        if torch.cuda.is_available():
+            return torch.device('cuda')
+        if _mps_available():
+            return torch.device('mps')
+        return torch.device('cpu')
+
+    device = torch.device(name)
+    if device.type == 'cuda' and not torch.cuda.is_available():
+        print(f"Requested device {device} but CUDA is not available, falling back to cpu.")
+        return torch.device('cpu')
+    if device.type == 'mps' and not _mps_available():
+        print(f"Requested device {device} but MPS is not available, falling back to cpu.")
+        return torch.device('cpu')
+    return device
+
+def resolve_act_device(name: str | torch.device | None = None) -> torch.device:
+    """Device for acting. Defaults to cpu, where single-sample inference avoids a host/device round trip."""
+    return resolve_device(name, env_var=ACT_DEVICE_ENV_VAR, default='cpu')
+
+def configure_threads(num_threads: int | None = None) -> int:
+    """Set torch's intra-op thread count (explicit value, then env var, then a small default) and return it."""
+    if num_threads is None:
+        env = os.environ.get(THREADS_ENV_VAR)
+        num_threads = int(env) if env else min(MAX_DEFAULT_THREADS, os.cpu_count() or 1)
+    torch.set_num_threads(num_threads)
+    return num_threads
@@ -0,0 +1,70 @@
+import numpy as np
+from game.breakout_sim import breakout_sim
+from game.brick import brick
+from game.constants import SCREEN_SIZE, BALL_INITIAL_VEL
+from physics.vec2 import vec2
+
+BALL_PADDLE_SLOTS = 5  # ball x, y, vx, vy, paddle x
+
+class StateEncoder:
+    """
+    Incremental version of learning.agent.to_state_vector for one breakout_sim.
+
+    Owns a float32 observation buffer. Brick bits are cleared from the sim's brick-hit callback, so each encode()
+    only rewrites the five ball/paddle slots.
+    """
+
+    def __init__(self, game: breakout_sim, screen_size: vec2 = SCREEN_SIZE, initial_velocity: vec2 = BALL_INITIAL_VEL):
+        self.screen_size = screen_size
+        self.initial_velocity = initial_velocity
+        self.game = None
+        self.buffer = np.zeros(BALL_PADDLE_SLOTS + len(game.bricks), dtype=np.float32)
+        self.attach(game)
+
+    def attach(self, game: breakout_sim):
+        """Start tracking a (new or reset) game."""
+        if len(game.bricks) != self.size - BALL_PADDLE_SLOTS:
+            raise ValueError(f"Encoder sized for {self.size - BALL_PADDLE_SLOTS} bricks, game has {len(game.bricks)}")
+        if self.game is not None:
+            self.detach()
+        self.game = game
+        self._on_reset(game)
+        game.brick_hit_listeners.append(self._on_brick_hit)
+        game.reset_listeners.append(self._on_reset)
+
+    def detach(self):
+        self.game.brick_hit_listeners.remove(self._on_brick_hit)
+        self.game.reset_listeners.remove(self._on_reset)
+        self.game = None
+
+    @property
+    def size(self) -> int:
+        return self.buffer.shape[0]
+
+    def _on_brick_hit(self, b: brick):
+        self.buffer[BALL_PADDLE_SLOTS + b.index] = 0.0
+
+    def _on_reset(self, game: breakout_sim):
+        self.buffer[BALL_PADDLE_SLOTS:] = [b.alive for b in game.bricks]
+
+    def encode(self, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Refresh the observation. Returns the internal buffer (overwritten by the next call) unless out is given,
+        in which case the observation is copied into out (e.g. a replay-buffer row) and out is returned.
+        """
+        ball = self.game.ball
+        buf = self.buffer
+        size = self.screen_size
+        vel0 = self.initial_velocity
+        buf[0] = ball.position.x / size.x
+        buf[1] = ball.position.y / size.y
+        buf[2] = (ball.velocity.x + vel0.x) / (2 * vel0.x)
+        buf[3] = (ball.velocity.y + vel0.y) / (2 * vel0.y)
+        buf[4] = self.game.paddle.position.x / size.x
+        if out is None:
+            return buf
+        out[:] = buf
+        return out
+
+    def __repr__(self):
+        return f"StateEncoder(size={self.size})"
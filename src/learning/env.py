@@ -0,0 +1,334 @@
+"""
+Gym-style environments around breakout_sim.
+
+BreakoutEnv follows the Gymnasium Env API (reset() -> (obs, info), step(action) -> (obs, reward, terminated, truncated,
+info)) without depending on gymnasium: observations are StateEncoder vectors and actions are indices into PADDLE_MOVES.
+An episode terminates when the game is won or lost and is truncated once it has run for max_game_time seconds.
+
+SyncVectorEnv and AsyncVectorEnv step num_envs games per call and auto-reset finished ones in the same step (the
+observation returned for a finished game is the first of its next episode; the last one is in info['final_obs']).
+AsyncVectorEnv splits the games over worker processes that read actions from and write results to one shared-memory
+block, so only a one-word command per worker crosses a pipe each step.
+
+The game setup, reward and action constants live here too; learning.agent builds on them.
+"""
+import os
+import random
+import traceback
+import multiprocessing as mp
+from multiprocessing import shared_memory
+import numpy as np
+from game.breakout_sim import breakout_sim, paddle_move, WinState, GameState
+from game.constants import *
+from .encoder import StateEncoder
+
+MAX_GAME_TIME = 300.0  # seconds of game time before an episode is truncated
+ACTION_REPEAT = 1  # sim ticks per agent decision
+STATE_SIZE = 5 + BRICK_ROWS * int(SCREEN_SIZE.x // BRICK_SIZE.x)
+PADDLE_MOVES = (paddle_move.LEFT, paddle_move.STAY, paddle_move.RIGHT)  # indexed by the model's output
+
+# Per-env arrays shared between a vector env and its workers: name, dtype, trailing shape ('obs' = observation size)
+_LAYOUT = (
+    ('obs', np.float32, 'obs'),
+    ('final_obs', np.float32, 'obs'),
+    ('actions', np.int64, ()),
+    ('rewards', np.float32, ()),
+    ('terminated', np.bool_, ()),
+    ('truncated', np.bool_, ()),
+    ('win_state', np.int8, ()),
+    ('game_time', np.float64, ()),
+    ('bricks_broken', np.int64, ()),
+)
+_INFO_FIELDS = ('final_obs', 'win_state', 'game_time', 'bricks_broken')
+
+def make_game() -> breakout_sim:
+    return breakout_sim(size=SCREEN_SIZE, brick_rows=BRICK_ROWS, brick_size=BRICK_SIZE, paddle_size=PADDLE_SIZE, ball_radius=BALL_RADIUS, paddle_vel=PADDLE_SPEED,
+                        continuous=True)
+
+def to_reward(state: GameState, last_state: GameState) -> float:
+    if state.win_state == WinState.WON:
+        return 1.0
+    elif state.win_state == WinState.LOST:
+        return -1.0
+   
+    if state.bricks_broken_this_step > 0:
+        return 0.1  # small reward for breaking a brick
+    return 0.0
+
+class BreakoutEnv:
+    """
+    One breakout_sim behind reset / step.
+
+    action_repeat: sim ticks per step (fewer ticks if the game ends first).
+    max_game_time: game seconds after which an episode is truncated.
+    reset(seed=...) reseeds the env; later unseeded resets draw their openings from that seed. An env that was never
+    seeded always starts from the sim's fixed opening. episode_seed is the seed the current game was reset with.
+    profiler: optional learning.profiling.train_profiler; step() then charges its work to the 'sim', 'reward' and
+    'encode' phases.
+    """
+
+    num_actions = len(PADDLE_MOVES)
+    observation_size = STATE_SIZE
+
+    def __init__(self, action_repeat: int = ACTION_REPEAT, max_game_time: float = MAX_GAME_TIME, profiler=None):
+        if action_repeat < 1:
+            raise ValueError(f"action_repeat must be at least 1, got {action_repeat}")
+        self.action_repeat = action_repeat
+        self.max_game_time = max_game_time
+        self.game = make_game()
+        self.encoder = StateEncoder(self.game)
+        self._rng = None
+        self.episode_seed = None
+        self.profiler = profiler
+
+    def _info(self) -> dict:
+        game = self.game
+        return dict(win_state=game.win_state, game_time=game.game_time, bricks_broken=game.bricks_broken_this_step,
+                    bricks_left=game.bricks_left)
+
+    def reset(self, seed: int | None = None, options: dict | None = None, out: np.ndarray | None = None) -> tuple[np.ndarray, dict]:
+        """Start a new episode. The observation is a fresh array unless out is given, in which case it is written there."""
+        if seed is not None:
+            self._rng = random.Random(seed)
+        self.episode_seed = None if self._rng is None else self._rng.getrandbits(32)
+        self.game.reset(self.episode_seed)
+        obs = self.encoder.encode(out=np.empty(self.observation_size, dtype=np.float32) if out is None else out)
+        return obs, self._info()
+
+    def step(self, action: int, out: np.ndarray | None = None) -> tuple[np.ndarray, float, bool, bool, dict]:
+        """Apply move index action for action_repeat ticks. out works as in reset()."""
+        game = self.game
+        state_old = game.game_state()
+        profiler = self.profiler
+        _, state_new = game.step_n(TRAIN_SIM_DT, PADDLE_MOVES[action], self.action_repeat)
+        if profiler is not None:
+            profiler.lap('sim')
+        reward = to_reward(state_new, state_old)
+        terminated = state_new.win_state != WinState.ONGOING
+        truncated = not terminated and state_new.game_time >= self.max_game_time
+        if profiler is not None:
+            profiler.lap('reward')
+        obs = self.encoder.encode(out=np.empty(self.observation_size, dtype=np.float32) if out is None else out)
+        if profiler is not None:
+            profiler.lap('encode')
+        return obs, reward, terminated, truncated, self._info()
+
+    def close(self):
+        self.encoder.detach()
+
+    def __repr__(self):
+        return f"BreakoutEnv(action_repeat={self.action_repeat}, max_game_time={self.max_game_time})"
+
+def _buffer_size(num_envs: int, obs_size: int) -> int:
+    size = 0
+    for _, dtype, shape in _LAYOUT:
+        width = obs_size if shape == 'obs' else 1
+        size += -size % 8 + num_envs * width * np.dtype(dtype).itemsize
+    return size
+
+def _carve(buffer, num_envs: int, obs_size: int) -> dict[str, np.ndarray]:
+    """Lay the _LAYOUT arrays out over buffer (a bytearray or shared-memory buf), 8-byte aligned."""
+    arrays = {}
+    offset = 0
+    for name, dtype, shape in _LAYOUT:
+        shape = (num_envs, obs_size) if shape == 'obs' else (num_envs,)
+        offset += -offset % 8
+        arrays[name] = np.ndarray(shape, dtype=dtype, buffer=buffer, offset=offset)
+        offset += arrays[name].nbytes
+    return arrays
+
+def _reset_envs(envs: list[BreakoutEnv], arrays: dict, start: int, seed: int | None):
+    for j, env in enumerate(envs):
+        i = start + j
+        env.reset(seed=None if seed is None else seed + i, out=arrays['obs'][i])
+        arrays['final_obs'][i] = arrays['obs'][i]
+
+def _step_envs(envs: list[BreakoutEnv], arrays: dict, start: int):
+    obs = arrays['obs']
+    final_obs = arrays['final_obs']
+    for j, env in enumerate(envs):
+        i = start + j
+        _, reward, terminated, truncated, info = env.step(int(arrays['actions'][i]), out=final_obs[i])
+        arrays['rewards'][i] = reward
+        arrays['terminated'][i] = terminated
+        arrays['truncated'][i] = truncated
+        arrays['win_state'][i] = info['win_state'].value
+        arrays['game_time'][i] = info['game_time']
+        arrays['bricks_broken'][i] = info['bricks_broken']
+        if terminated or truncated:
+            env.reset(out=obs[i])
+        else:
+            obs[i] = final_obs[i]
+
+class _VectorEnv:
+    """Shared result handling for the vector envs; subclasses run _reset_envs / _step_envs over their games."""
+
+    num_actions = BreakoutEnv.num_actions
+    observation_size = BreakoutEnv.observation_size
+
+    def __init__(self, num_envs: int, buffer, copy: bool):
+        self.num_envs = num_envs
+        self.copy = copy
+        self.arrays = _carve(buffer, num_envs, self.observation_size)
+
+    def _out(self, name: str) -> np.ndarray:
+        return self.arrays[name].copy() if self.copy else self.arrays[name]
+
+    def _reset_result(self) -> tuple[np.ndarray, dict]:
+        return self._out('obs'), {}
+
+    def _step_result(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        info = {name: self._out(name) for name in _INFO_FIELDS}
+        return self._out('obs'), self._out('rewards'), self._out('terminated'), self._out('truncated'), info
+
+    def step(self, actions: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        """
+        Step every game with its move index. Returns batched (obs, rewards, terminated, truncated, info), info holding
+        final_obs, win_state, game_time and bricks_broken arrays. With copy=False the arrays are views that the next
+        call overwrites.
+        """
+        self.step_async(actions)
+        return self.step_wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class SyncVectorEnv(_VectorEnv):
+    """num_envs BreakoutEnvs stepped one after another in this process."""
+
+    def __init__(self, num_envs: int, action_repeat: int = ACTION_REPEAT, max_game_time: float = MAX_GAME_TIME,
+                 copy: bool = True):
+        super().__init__(num_envs, bytearray(_buffer_size(num_envs, STATE_SIZE)), copy)
+        self.envs = [BreakoutEnv(action_repeat, max_game_time) for _ in range(num_envs)]
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        """Reset every game; with a seed, game i is seeded with seed + i."""
+        _reset_envs(self.envs, self.arrays, 0, seed)
+        return self._reset_result()
+
+    def step_async(self, actions: np.ndarray):
+        self.arrays['actions'][:] = actions
+
+    def step_wait(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        _step_envs(self.envs, self.arrays, 0)
+        return self._step_result()
+
+    def close(self):
+        for env in self.envs:
+            env.close()
+
+    def __repr__(self):
+        return f"SyncVectorEnv(num_envs={self.num_envs})"
+
+def _worker(shm_name: str, num_envs: int, start: int, stop: int, action_repeat: int, max_game_time: float, pipe):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    arrays = None
+    try:
+        arrays = _carve(shm.buf, num_envs, STATE_SIZE)
+        envs = [BreakoutEnv(action_repeat, max_game_time) for _ in range(start, stop)]
+        while True:
+            command, arg = pipe.recv()
+            if command == 'close':
+                break
+            try:
+                if command == 'step':
+                    _step_envs(envs, arrays, start)
+                else:
+                    _reset_envs(envs, arrays, start, arg)
+                pipe.send(None)
+            except Exception:
+                pipe.send(traceback.format_exc())
+    except (EOFError, KeyboardInterrupt):
+        pass  # parent went away
+    finally:
+        del arrays
+        shm.close()
+
+class AsyncVectorEnv(_VectorEnv):
+    """
+    num_envs BreakoutEnvs split over num_workers processes (default: one per CPU, at most one per env).
+    step_async() starts a step and returns immediately, so the caller can work while the games run; step_wait()
+    collects it.
+    """
+
+    def __init__(self, num_envs: int, num_workers: int | None = None, action_repeat: int = ACTION_REPEAT,
+                 max_game_time: float = MAX_GAME_TIME, copy: bool = True):
+        num_workers = min(num_envs, num_workers or os.cpu_count() or 1)
+        self._shm = shared_memory.SharedMemory(create=True, size=_buffer_size(num_envs, STATE_SIZE))
+        super().__init__(num_envs, self._shm.buf, copy)
+        self._waiting = False
+        self._pipes = []
+        self._processes = []
+        ctx = mp.get_context('spawn')
+        bounds = np.linspace(0, num_envs, num_workers + 1).round().astype(int)
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parent, child = ctx.Pipe()
+            process = ctx.Process(target=_worker, daemon=True,
+                                  args=(self._shm.name, num_envs, int(start), int(stop), action_repeat, max_game_time, child))
+            process.start()
+            child.close()
+            self._pipes.append(parent)
+            self._processes.append(process)
+
+    @property
+    def num_workers(self) -> int:
+        return len(self._processes)
+
+    def _send(self, command: str, arg=None):
+        if self._waiting:
+            raise RuntimeError("step_async() is still pending, call step_wait() first")
+        for pipe in self._pipes:
+            pipe.send((command, arg))
+        self._waiting = True
+
+    def _wait(self):
+        errors = [error for error in (pipe.recv() for pipe in self._pipes) if error is not None]
+        self._waiting = False
+        if errors:
+            raise RuntimeError("A vector env worker failed:\n" + errors[0])
+
+    def reset(self, seed: int | None = None) -> tuple[np.ndarray, dict]:
+        """Reset every game; with a seed, game i is seeded with seed + i."""
+        self._send('reset', seed)
+        self._wait()
+        return self._reset_result()
+
+    def step_async(self, actions: np.ndarray):
+        if self._waiting:
+            raise RuntimeError("step_async() is still pending, call step_wait() first")
+        self.arrays['actions'][:] = actions
+        self._send('step')
+
+    def step_wait(self) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, dict]:
+        self._wait()
+        return self._step_result()
+
+    def close(self):
+        if self._shm is None:
+            return
+        if self._waiting:
+            self._wait()
+        for pipe in self._pipes:
+            try:
+                pipe.send(('close', None))
+            except (BrokenPipeError, OSError):
+                pass
+        for process in self._processes:
+            process.join(timeout=5.0)
+            if process.is_alive():
+                process.terminate()
+        for pipe in self._pipes:
+            pipe.close()
+        self.arrays = None
+        try:
+            self._shm.close()
+        except BufferError:
+            pass  # the caller still holds copy=False views; the mapping goes away with them
+        self._shm.unlink()
+        self._shm = None
+
+    def __repr__(self):
+        return f"AsyncVectorEnv(num_envs={self.num_envs}, num_workers={self.num_workers})"
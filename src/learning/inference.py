@@ -0,0 +1,94 @@
+import copy
+import numpy as np
+import torch
+from .model import Linear_QNet
+
+INFERENCE_BACKENDS = ('eager', 'jit', 'compile', 'numpy')
+
+class InferencePolicy:
+    """
+    Greedy action selection from a Linear_QNet without autograd or per-call allocation.
+
+    Takes a (batch, state_size) float array and returns int64 move indices. Backends:
+      eager:   the model itself (or a copy on device) under torch.inference_mode, fed from a reused input tensor
+      jit:     a torch.jit.trace of a copy of the model
+      compile: torch.compile of a copy of the model (slow first call)
+      numpy:   the two layers exported to float32 arrays and evaluated with NumPy, CPU only
+    Call sync() after the model's weights change.
+    """
+
+    def __init__(self, model: Linear_QNet, backend: str = 'eager', device: torch.device | None = None, max_batch: int = 1):
+        if backend not in INFERENCE_BACKENDS:
+            raise ValueError(f"Unknown inference backend {backend!r}, expected one of {INFERENCE_BACKENDS}")
+        self.model = model
+        self.backend = backend
+        self.device = torch.device('cpu') if backend == 'numpy' else device or model._device
+        self._net = None
+        self._weights = None  # the uncompiled module sync() loads weights into (shares parameters with _net)
+        self._input = None
+        self._hidden = None
+        if backend != 'numpy':
+            if backend == 'eager' and self.device == model._device:
+                self._net = model
+            else:
+                self._net = copy.deepcopy(model).to(self.device).eval()
+                self._net._device = self.device
+            self._weights = self._net
+            if backend == 'jit':
+                with torch.inference_mode(False), torch.no_grad():
+                    self._net = self._weights = torch.jit.trace(self._net, torch.zeros(1, model.input_size, device=self.device))
+            elif backend == 'compile':
+                self._net = torch.compile(self._net)
+        self._reserve(max_batch)
+        self.sync()
+
+    def _reserve(self, batch: int):
+        if self.backend == 'numpy':
+            self._hidden = np.empty((batch, self.model.hidden_size), dtype=np.float32)
+        else:
+            self._input = torch.empty((batch, self.model.input_size), dtype=torch.float, device=self.device)
+
+    @property
+    def max_batch(self) -> int:
+        return (self._hidden if self.backend == 'numpy' else self._input).shape[0]
+
+    def sync(self):
+        """Copy the current weights of self.model into the inference copy (a no-op when eager shares the model)."""
+        if self.backend == 'numpy':
+            with torch.no_grad():
+                self._w1 = self.model.linear1.weight.detach().to('cpu', torch.float).numpy().T.copy()
+                self._b1 = self.model.linear1.bias.detach().to('cpu', torch.float).numpy().copy()
+                self._w2 = self.model.linear2.weight.detach().to('cpu', torch.float).numpy().T.copy()
+                self._b2 = self.model.linear2.bias.detach().to('cpu', torch.float).numpy().copy()
+        elif self._weights is not self.model:
+            with torch.no_grad():
+                self._weights.load_state_dict(self.model.state_dict())
+
+    def q_values(self, states: np.ndarray) -> np.ndarray:
+        """Q-values for a (batch, state_size) array, as a (batch, actions) float32 array."""
+        states = np.asarray(states, dtype=np.float32)
+        if states.ndim == 1:
+            states = states[None]
+        n = states.shape[0]
+        if n > self.max_batch:
+            self._reserve(n)
+        if self.backend == 'numpy':
+            hidden = self._hidden[:n]
+            np.matmul(states, self._w1, out=hidden)
+            hidden += self._b1
+            np.maximum(hidden, 0.0, out=hidden)
+            return hidden @ self._w2 + self._b2
+        with torch.inference_mode():
+            x = self._input[:n]
+            x.copy_(torch.from_numpy(states))
+            return self._net(x).cpu().numpy()
+
+    def act(self, states: np.ndarray) -> np.ndarray:
+        """Greedy move index for each row of states."""
+        return self.q_values(states).argmax(axis=1)
+
+    def act_one(self, state: np.ndarray) -> int:
+        return int(self.q_values(state).argmax())
+
+    def __repr__(self):
+        return f"InferencePolicy(backend={self.backend}, device={self.device})"
@@ -3,15 +3,20 @@ import torch.nn as nn
 import torch.optim as optim
 import torch.nn.functional as F
 import numpy as np
+import copy
 import os
+from .device import resolve_device
 
-DEVICE_NAME = 'cuda'
-RUN_DEVICE = torch.device(DEVICE_NAME)
+RUN_DEVICE = resolve_device()  # default device, from BREAKOUT_DEVICE or auto-detected
+MODEL_DIR = './model'
 
 class Linear_QNet(nn.Module):
-    def __init__(self, input_size: int, hidden_size: int, output_size: int):
+    def __init__(self, input_size: int, hidden_size: int, output_size: int, device: torch.device | None = None):
         super(Linear_QNet, self).__init__()
-        self._device = RUN_DEVICE
+        self.input_size = input_size
+        self.hidden_size = hidden_size
+        self.output_size = output_size
+        self._device = device or RUN_DEVICE
         self.linear1 = nn.Linear(input_size, hidden_size, device=self._device)
         self.linear2 = nn.Linear(hidden_size, output_size, device=self._device)
         print("Model using device:", self._device)
@@ -22,37 +27,62 @@ class Linear_QNet(nn.Module):
         return x
 
     def save(self, file_name: str = 'model.pth'):
-        model_folder_path = './model'
+        model_folder_path = MODEL_DIR
         if not os.path.exists(model_folder_path):
             os.makedirs(model_folder_path)
         file_name = os.path.join(model_folder_path, file_name)
-        torch.save(self.state_dict(), file_name)
+        # write then rename so an interrupted save never leaves a truncated model behind
+        torch.save(self.state_dict(), file_name + '.tmp')
+        os.replace(file_name + '.tmp', file_name)
 
     def load(self, file_name: str = 'model.pth'):
-        model_folder_path = './model'
+        model_folder_path = MODEL_DIR
         file_name = os.path.join(model_folder_path, file_name)
         if os.path.exists(file_name):
             print(f"Loading model from {file_name}")
-            self.load_state_dict(torch.load(file_name))
+            self.load_state_dict(torch.load(file_name, map_location=self._device))
             self.eval()
         else:
             print(f"No model found at {file_name}, starting fresh.")
 
+TARGET_UPDATE_MODES = ('none', 'hard', 'polyak')
+
 class QTrainer:
-    def __init__(self, model: Linear_QNet, lr: float, gamma: float):
+    def __init__(self, model: Linear_QNet, lr: float, gamma: float, device: torch.device | None = None,
+                 target_update: str = 'none', target_sync_every: int = 500, tau: float = 0.005, double_dqn: bool = False):
+        """
+        target_update: where bootstrap values come from.
+            'none':   the online model itself (the original behaviour)
+            'hard':   a frozen copy, overwritten with the online weights every target_sync_every gradient steps
+            'polyak': a copy moved towards the online weights by tau after every gradient step
+        double_dqn: pick the next action with the online model and evaluate it with the target (or online) model.
+        """
+        if target_update not in TARGET_UPDATE_MODES:
+            raise ValueError(f"Unknown target update {target_update!r}, expected one of {TARGET_UPDATE_MODES}")
         self.lr = lr
         self.gamma = gamma
         self.model = model
         self.optimizer = optim.Adam(model.parameters(), lr=self.lr)
         self.criterion = nn.MSELoss()
-        self._device = RUN_DEVICE
+        self._device = device or model._device
+        self.target_update = target_update
+        self.target_sync_every = target_sync_every
+        self.tau = tau
+        self.double_dqn = double_dqn
+        self.steps = 0  # gradient steps taken
+        self.last_td_errors = None  # target - Q(s, a) per sample from the latest step, e.g. for replay priorities
+        self.target_model = None
+        if target_update != 'none':
+            self.target_model = copy.deepcopy(model).eval()
+            self.target_model.requires_grad_(False)
         print("Trainer using device:", self._device)
 
-    def train_step(self, state, action, reward, next_state, done):
-        state = torch.tensor(np.array(state), dtype=torch.float, device=self._device)
-        next_state = torch.tensor(np.array(next_state), dtype=torch.float, device=self._device)
-        action = torch.tensor(np.array(action), dtype=torch.long, device=self._device)
-        reward = torch.tensor(np.array(reward), dtype=torch.float, device=self._device)
+    def _as_batch(self, state, action, reward, next_state, done) -> tuple[torch.Tensor, ...]:
+        state = torch.as_tensor(np.asarray(state), dtype=torch.float, device=self._device)
+        next_state = torch.as_tensor(np.asarray(next_state), dtype=torch.float, device=self._device)
+        action = torch.as_tensor(np.asarray(action), dtype=torch.long, device=self._device)
+        reward = torch.as_tensor(np.asarray(reward), dtype=torch.float, device=self._device)
+        done = torch.as_tensor(np.asarray(done), dtype=torch.bool, device=self._device)
 
         if len(state.shape) == 1:
             # reshape for a single sample
@@ -60,20 +90,64 @@ class QTrainer:
             next_state = torch.unsqueeze(next_state, 0)
             action = torch.unsqueeze(action, 0)
             reward = torch.unsqueeze(reward, 0)
-            done = (done, )
+            done = torch.unsqueeze(done, 0)
+
+        # Actions arrive either as one-hot rows or as move indices
+        action_idx = torch.argmax(action, dim=1) if action.dim() == 2 else action
+        return state, action_idx, reward, next_state, done
+
+    @torch.no_grad()
+    def bootstrap(self, reward: torch.Tensor, next_state: torch.Tensor, done: torch.Tensor) -> torch.Tensor:
+        """Bellman targets for a batch: r + gamma * Q'(s', a'), or just r on terminal transitions."""
+        evaluator = self.target_model if self.target_model is not None else self.model
+        next_q = evaluator(next_state)
+        if self.double_dqn:
+            next_action = self.model(next_state).argmax(dim=1, keepdim=True)
+            next_q = next_q.gather(1, next_action).squeeze(1)
+        else:
+            next_q = next_q.max(dim=1).values
+        return torch.where(done, reward, reward + self.gamma * next_q)
 
-        # Predict Q values with current state
-        pred = self.model(state)
+    def train_step(self, state, action, reward, next_state, done, gradient_steps: int = 1, weights=None) -> torch.Tensor:
+        """
+        Gradient step(s) on a batch (or a single transition). Returns the detached loss of the last step.
+        With gradient_steps > 1 the bootstrap targets are computed once and reused for every step, which is exact
+        for a hard target network between syncs and a close approximation otherwise.
+        weights: optional per-sample loss weights (importance-sampling weights for prioritized replay).
+        The per-sample TD errors of the last step are left in last_td_errors.
+        """
+        if gradient_steps < 1:
+            raise ValueError(f"train_step needs at least one gradient step, got gradient_steps={gradient_steps}")
+        state, action_idx, reward, next_state, done = self._as_batch(state, action, reward, next_state, done)
+        q_new = self.bootstrap(reward, next_state, done).unsqueeze(1)
+        action_idx = action_idx.unsqueeze(1)
+        if weights is not None:
+            weights = torch.as_tensor(np.asarray(weights), dtype=torch.float, device=self._device).reshape(-1, 1)
+        for _ in range(gradient_steps):
+            # Predict Q values with current state
+            pred = self.model(state)
+            target = pred.detach().clone()
+            target.scatter_(1, action_idx, q_new)
 
-        target = pred.clone()
-        for idx in range(len(done)):
-            Q_new = reward[idx]
-            if not done[idx]:
-                Q_new = reward[idx] + self.gamma * torch.max(self.model(next_state[idx]))
-            target[idx][torch.argmax(action[idx]).item()] = Q_new
+            # Backpropagation
+            self.optimizer.zero_grad()
+            if weights is None:
+                loss = self.criterion(target, pred)
+            else:
+                # same scale as the unweighted MSE over every (sample, action) entry
+                loss = (weights * (target - pred) ** 2).mean()
+            loss.backward()
+            self.optimizer.step()
+            self.steps += 1
+            self._update_target()
+        self.last_td_errors = (q_new - pred.detach().gather(1, action_idx)).squeeze(1)
+        return loss.detach()
 
-        # Backpropagation
-        self.optimizer.zero_grad()
-        loss = self.criterion(target, pred)
-        loss.backward()
-        self.optimizer.step()
+    @torch.no_grad()
+    def _update_target(self):
+        if self.target_update == 'hard':
+            if self.steps % self.target_sync_every == 0:
+                self.target_model.load_state_dict(self.model.state_dict())
+        elif self.target_update == 'polyak':
+            for target, online in zip(self.target_model.parameters(), self.model.parameters()):
+                target.lerp_(online, self.tau)
@@ -0,0 +1,196 @@
+"""
+Parallel actor/learner training.
+
+K actor processes each run their own breakout_sim with a CPU copy of Linear_QNet and stream transitions to the
+learner process over a bounded multiprocessing queue (actors wait while it is full, so experience never piles up
+ahead of the learner). The learner stores them in its replay buffer, runs QTrainer updates and periodically publishes
+its weights to a shared-memory model that the actors reload.
+"""
+import queue
+import random
+from time import time
+from datetime import timedelta
+
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+
+from .agent import (Agent, TrainConfig, default_config, score, towards_ball_move, ACTION_REPEAT, PLOT_MODE, STATE_SIZE,
+                    TARGET_UPDATE, TARGET_SYNC_EVERY, TARGET_TAU, DOUBLE_DQN, LONG_GRADIENT_STEPS, PRIORITIZED_REPLAY)
+from .device import configure_threads
+from .env import BreakoutEnv
+from .inference import InferencePolicy
+from .model import Linear_QNet
+from .plotting import make_plotter
+
+NUM_WORKERS = 4
+CHUNK_SIZE = 256             # transitions per message from an actor
+WEIGHT_SYNC_UPDATES = 10     # learner updates between weight publications
+WEIGHT_CHECK_STEPS = 100     # actor steps between checks for new weights
+REPORT_INTERVAL = 10.0       # seconds between throughput reports
+MAX_QUEUED_CHUNKS = 16       # messages waiting for the learner before actors block
+PUT_TIMEOUT = 0.1            # seconds an actor waits on a full queue before rechecking the stop flag
+
+def _put(transitions: mp.Queue, message: tuple, stop) -> bool:
+    """Put message on the bounded queue, waiting while the learner catches up. False if stopped first."""
+    while not stop.is_set():
+        try:
+            transitions.put(message, timeout=PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+def _actor(worker_id: int, shared_model: Linear_QNet, version, lock, transitions: mp.Queue, steps, stop, action_repeat: int,
+           seed: int, config: TrainConfig):
+    torch.set_num_threads(1)
+    rng = random.Random(seed)
+    cpu = torch.device('cpu')
+    model = Linear_QNet(input_size=STATE_SIZE, hidden_size=config.hidden_nodes, output_size=3, device=cpu)
+    policy = InferencePolicy(model, backend='numpy')
+    local_version = -1
+
+    states = np.empty((CHUNK_SIZE, STATE_SIZE), dtype=np.float32)
+    next_states = np.empty((CHUNK_SIZE, STATE_SIZE), dtype=np.float32)
+    actions = np.empty(CHUNK_SIZE, dtype=np.int8)
+    rewards = np.empty(CHUNK_SIZE, dtype=np.float32)
+    dones = np.empty(CHUNK_SIZE, dtype=bool)
+    filled = 0
+
+    env = BreakoutEnv(action_repeat=action_repeat)
+    obs, _ = env.reset()
+    n_games = 0
+    step_count = 0
+    while not stop.is_set():
+        if step_count % WEIGHT_CHECK_STEPS == 0 and version.value != local_version:
+            with lock:
+                model.load_state_dict(shared_model.state_dict())
+                local_version = version.value
+            policy.sync()
+
+        states[filled] = obs
+        if rng.randint(0, 200) < config.episodes_for_exploration - n_games:
+            move_index = towards_ball_move(env.game.game_state())
+        else:
+            move_index = policy.act_one(obs)
+
+        obs, reward, terminated, truncated, _ = env.step(move_index, out=next_states[filled])
+        is_game_over = terminated or truncated
+
+        actions[filled] = move_index
+        rewards[filled] = reward
+        dones[filled] = terminated
+        filled += 1
+        step_count += 1
+        steps[worker_id] += 1
+
+        if filled == CHUNK_SIZE or is_game_over:
+            _put(transitions, ('transitions', worker_id, (states[:filled].copy(), actions[:filled].copy(), rewards[:filled].copy(),
+                                                         next_states[:filled].copy(), dones[:filled].copy())), stop)
+            filled = 0
+        if is_game_over:
+            state = env.game.game_state()
+            _put(transitions, ('episode', worker_id, score(state), state.win_state.name if terminated else 'TRUNCATED'), stop)
+            n_games += 1
+            obs, _ = env.reset()
+
+    # Don't block process exit on messages the learner will never read
+    transitions.cancel_join_thread()
+
+class throughput_report:
+    def __init__(self, steps):
+        self.steps = steps
+        self.last_time = time()
+        self.last_counts = list(steps)
+
+    def maybe_print(self, updates: int, force: bool = False):
+        now = time()
+        elapsed = now - self.last_time
+        if elapsed < REPORT_INTERVAL and not force:
+            return
+        counts = list(self.steps)
+        rates = [(c - p) / elapsed for c, p in zip(counts, self.last_counts)]
+        per_worker = " ".join(f"w{i}:{r:.0f}" for i, r in enumerate(rates))
+        print(f"env-steps/s total {sum(rates):.0f} ({per_worker}), learner updates {updates}")
+        self.last_time = now
+        self.last_counts = counts
+
+def train_parallel(num_workers: int = NUM_WORKERS, action_repeat: int = ACTION_REPEAT, device: str | None = None,
+                   num_threads: int | None = None, seed: int = 0, plot_mode: str = PLOT_MODE, config: TrainConfig | None = None,
+                   target_update: str = TARGET_UPDATE, target_sync_every: int = TARGET_SYNC_EVERY, tau: float = TARGET_TAU,
+                   double_dqn: bool = DOUBLE_DQN, long_gradient_steps: int = LONG_GRADIENT_STEPS,
+                   prioritized: bool = PRIORITIZED_REPLAY):
+    """
+    Train with num_workers actor processes feeding this (learner) process until config.num_episodes games finish.
+    config: hyperparameters for the learner and the actors, default_config() by default.
+    target_update / target_sync_every / tau / double_dqn / long_gradient_steps / prioritized: the learner's Agent options.
+    """
+    config = config or default_config()
+    configure_threads(num_threads)
+    ctx = mp.get_context('spawn')
+    agent = Agent(device=device, act_device=device, seed=seed, config=config, target_update=target_update,
+                  target_sync_every=target_sync_every, tau=tau, double_dqn=double_dqn, long_gradient_steps=long_gradient_steps,
+                  prioritized=prioritized)
+    a_plotter = make_plotter(plot_mode)
+    record = score()
+
+    shared_model = Linear_QNet(input_size=STATE_SIZE, hidden_size=config.hidden_nodes, output_size=3, device=torch.device('cpu'))
+    shared_model.load_state_dict(agent.model.state_dict())
+    shared_model.share_memory()
+    version = ctx.Value('i', 0)
+    lock = ctx.Lock()
+    transitions = ctx.Queue(maxsize=MAX_QUEUED_CHUNKS)  # backpressure: actors wait rather than pile up stale chunks
+    steps = ctx.Array('q', num_workers, lock=False)
+    stop = ctx.Event()
+
+    workers = [ctx.Process(target=_actor, args=(i, shared_model, version, lock, transitions, steps, stop, action_repeat, seed + i,
+                                                config), daemon=True) for i in range(num_workers)]
+    for w in workers:
+        w.start()
+
+    report = throughput_report(steps)
+    start_time = time()
+    updates = 0
+    try:
+        while agent.n_games < config.num_episodes:
+            try:
+                message = transitions.get(timeout=0.1)
+            except queue.Empty:
+                report.maybe_print(updates)
+                continue
+
+            if message[0] == 'transitions':
+                agent.memory.extend(*message[2])
+                agent.train_long_memory()
+                updates += 1
+                if updates % WEIGHT_SYNC_UPDATES == 0:
+                    with lock:
+                        shared_model.load_state_dict(agent.model.state_dict())
+                        version.value += 1
+            else:
+                _, worker_id, new_score, win_state = message
+                agent.n_games += 1
+                if new_score > record:
+                    print("\nNew Record!")
+                    agent.model.save()
+                    record = new_score
+                elapsed_time = time() - start_time
+                print(f'({timedelta(seconds=int(elapsed_time))}) Game {agent.n_games} (worker {worker_id}) Result: {win_state} {new_score}, Record: {record}')
+                a_plotter.add_score(new_score)
+                a_plotter.plot()
+            report.maybe_print(updates)
+    finally:
+        stop.set()
+        report.maybe_print(updates, force=True)
+        deadline = time() + 5.0
+        while any(w.is_alive() for w in workers) and time() < deadline:
+            # keep draining so actors blocked on a full pipe can see the stop flag
+            try:
+                transitions.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for w in workers:
+            if w.is_alive():
+                w.terminate()
+            w.join()
+        a_plotter.close()
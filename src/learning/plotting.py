@@ -1,62 +1,203 @@
-import matplotlib.pyplot as plt
+import csv
+import os
+import queue
+import threading
+import multiprocessing as mp
+from time import time
+
+PLOT_MODES = ('gui', 'headless', 'none')
+PLOT_DIR = './plots'
+PNG_MIN_INTERVAL = 10.0  # seconds between PNG renders in headless mode
+GUI_POLL_INTERVAL = 0.05  # seconds the GUI process waits for scores before servicing window events
+
+class _progress_figure:
+    """Percentage-broken / game-time chart drawn onto a matplotlib figure."""
+
+    def __init__(self, fig):
+        self.fig = fig
+        self.ax1 = fig.add_subplot(111)
+        self.ax2 = self.ax1.twinx()
+
+        (self.line_percentages,) = self.ax1.plot([], [], color='tab:blue', label='Percentage Broken')
+        (self.line_times,) = self.ax2.plot([], [], color='tab:orange', label='Time (s)')
+
+        self.ax1.set_xlabel('Number of Games')
+        self.ax1.set_ylabel('Percentage Broken (%)', color='tab:blue')
+        self.ax1.tick_params(axis='y', labelcolor='tab:blue')
+        self.ax1.set_ylim(0, 100)
+
+        self.ax2.set_ylabel('Time (s)', color='tab:orange')
+        self.ax2.tick_params(axis='y', labelcolor='tab:orange')
+
+        lines = [self.line_percentages, self.line_times]
+        labels = [l.get_label() for l in lines]
+        self.ax1.legend(lines, labels, loc='upper left')
+
+        fig.suptitle('Training Progress')
+        fig.tight_layout()
+
+    def update(self, percentages: list[float], times: list[float]):
+        x = range(1, len(percentages) + 1)
+        self.line_percentages.set_data(x, percentages)
+        self.line_times.set_data(x, times)
+        # y-limits: keep 0-100 for percentages, autoscale time axis
+        self.ax1.set_xlim(1, max(len(percentages), 2))
+        self.ax2.set_ylim(bottom=0, top=max(times) * 1.1 if times else 1)
 
 class plotter:
+    """Interactive pyplot window updated in the calling thread. Blocks while drawing; prefer async_plotter."""
+
     def __init__(self):
         self.percentages = []
         self.times = []
         self.mean_scores = []
+        self._figure = None
 
     def add_score(self, score):
-        self.percentages.append(score.percentage_broken)
-        self.times.append(score.time)
+        self.add(score.percentage_broken, score.time)
+
+    def add(self, percentage_broken: float, game_time: float):
+        self.percentages.append(percentage_broken)
+        self.times.append(game_time)
 
     def plot(self):
         if not self.percentages or not self.times:
             return
-
-        x = range(1, len(self.percentages) + 1)
+        import matplotlib.pyplot as plt
 
         # First time: create figure and lines
-        if not hasattr(self, "_plot_initialized"):
+        if self._figure is None:
             plt.ion()
-            self.fig, self.ax1 = plt.subplots()
-            self.ax2 = self.ax1.twinx()
+            self._figure = _progress_figure(plt.figure())
+        self._figure.update(self.percentages, self.times)
+
+        # Redraw
+        self._figure.fig.canvas.draw_idle()
+        self._figure.fig.canvas.flush_events()
+        plt.pause(0.001)
+
+    def close(self):
+        pass
+
+def _gui_loop(scores: mp.Queue):
+    import matplotlib.pyplot as plt
+    p = plotter()
+    while True:
+        dirty = False
+        try:
+            item = scores.get(timeout=GUI_POLL_INTERVAL)
+            while True:
+                if item is None:
+                    return
+                p.add(*item)
+                dirty = True
+                item = scores.get_nowait()
+        except queue.Empty:
+            pass
+        if dirty:
+            p.plot()
+        elif p._figure is not None:
+            plt.pause(GUI_POLL_INTERVAL)  # keep the window responsive
 
-            color_left = 'tab:blue'
-            color_right = 'tab:orange'
+class async_plotter:
+    """Runs the interactive plotter in its own process; add_score only enqueues."""
 
-            (self.line_percentages,) = self.ax1.plot(x, self.percentages, color=color_left, label='Percentage Broken')
-            (self.line_times,) = self.ax2.plot(x, self.times, color=color_right, label='Time (s)')
+    def __init__(self):
+        ctx = mp.get_context('spawn')
+        self._scores = ctx.Queue()
+        self._process = ctx.Process(target=_gui_loop, args=(self._scores,), daemon=True)
+        self._process.start()
+
+    def add_score(self, score):
+        self._scores.put((score.percentage_broken, score.time))
+
+    def plot(self):
+        pass  # the plotting process redraws whenever new scores arrive
 
-            self.ax1.set_xlabel('Number of Games')
-            self.ax1.set_ylabel('Percentage Broken (%)', color='tab:blue')
-            self.ax1.tick_params(axis='y', labelcolor='tab:blue')
-            self.ax1.set_ylim(0, 100)
+    def close(self):
+        self._scores.put(None)
+        self._process.join(timeout=5.0)
 
-            self.ax2.set_ylabel('Time (s)', color='tab:orange')
-            self.ax2.tick_params(axis='y', labelcolor='tab:orange')
-            self.ax2.set_ylim(bottom=0, top=max(self.times) * 1.1 if self.times else 1)
+class headless_plotter:
+    """
+    Appends scores to a CSV log and renders a PNG at most every png_interval seconds, all on a background thread.
+    Needs no display; add_score never touches the disk itself.
+    """
 
-            lines = [self.line_percentages, self.line_times]
-            labels = [l.get_label() for l in lines]
-            self.ax1.legend(lines, labels, loc='upper left')
+    def __init__(self, out_dir: str = PLOT_DIR, png_interval: float = PNG_MIN_INTERVAL):
+        os.makedirs(out_dir, exist_ok=True)
+        self.csv_path = os.path.join(out_dir, 'scores.csv')
+        self.png_path = os.path.join(out_dir, 'progress.png')
+        self.png_interval = png_interval
+        self._scores = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
 
-            self.fig.suptitle('Training Progress')
-            self.fig.tight_layout()
-            self._plot_initialized = True
-        else:
-            # Update existing lines
-            self.line_percentages.set_data(x, self.percentages)
-            self.line_times.set_data(x, self.times)
+    def add_score(self, score):
+        self._scores.put((score.percentage_broken, score.time))
 
-            # Update limits
-            self.ax1.set_xlim(1, len(self.percentages))
-            # y-limits: keep 0-100 for percentages, autoscale time axis
-            self.ax2.set_ylim(bottom=0, top=max(self.times) * 1.1 if self.times else 1)
-            self.ax2.autoscale_view()
+    def plot(self):
+        pass  # rendering is rate limited on the writer thread
 
+    def close(self):
+        self._scores.put(None)
+        self._thread.join()
 
-        # Redraw
-        self.fig.canvas.draw_idle()
-        self.fig.canvas.flush_events()
-        plt.pause(0.001)
\ No newline at end of file
+    def _run(self):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        percentages, times = [], []
+        figure = None
+        last_render = 0.0
+        try:
+            with open(self.csv_path, newline='') as f:
+                rows = sum(1 for _ in csv.reader(f))
+        except FileNotFoundError:
+            rows = 0
+        logged = max(rows - 1, 0)  # games already in the log from earlier runs; the first row is the header
+        with open(self.csv_path, 'a', newline='') as f:
+            writer = csv.writer(f)
+            if rows == 0:
+                writer.writerow(['game', 'percentage_broken', 'time'])
+            running = True
+            while running:
+                item = self._scores.get()
+                while item is not None:
+                    percentages.append(item[0])
+                    times.append(item[1])
+                    writer.writerow([logged + len(percentages), f"{item[0]:.4f}", f"{item[1]:.4f}"])
+                    if self._scores.empty():
+                        break
+                    item = self._scores.get()
+                running = item is not None
+                f.flush()
+
+                if percentages and (not running or time() - last_render >= self.png_interval):
+                    if figure is None:
+                        fig = Figure()
+                        FigureCanvasAgg(fig)
+                        figure = _progress_figure(fig)
+                    figure.update(percentages, times)
+                    figure.fig.savefig(self.png_path)
+                    last_render = time()
+
+class null_plotter:
+    def add_score(self, score):
+        pass
+
+    def plot(self):
+        pass
+
+    def close(self):
+        pass
+
+def make_plotter(mode: str = 'gui'):
+    """'gui': live window in a separate process, 'headless': CSV log + rate-limited PNG, 'none': discard scores."""
+    if mode == 'gui':
+        return async_plotter()
+    if mode == 'headless':
+        return headless_plotter()
+    if mode == 'none':
+        return null_plotter()
+    raise ValueError(f"Unknown plot mode {mode!r}, expected one of {PLOT_MODES}")
@@ -0,0 +1,139 @@
+import cProfile
+import json
+import os
+from time import perf_counter, time
+
+PROFILE_MODES = ('none', 'cprofile', 'torch')
+PROFILE_DIR = './profiles'
+STATS_LOG = './logs/train_stats.jsonl'
+STATS_INTERVAL = 10.0    # seconds between summary lines
+PROFILE_START = 1000     # loop iteration at which the profiling window opens
+PROFILE_STEPS = 500      # loop iterations profiled
+
+class train_profiler:
+    """
+    Per-phase wall-clock timers and counters for a training loop.
+
+    Call begin_step() at the top of each iteration and lap(phase) after each stage; a lap charges the time since the
+    previous lap (or begin_step) to that phase, so timing costs one perf_counter() per stage. end_step() closes the
+    iteration and, every interval seconds, prints a summary line and appends the same numbers as JSON to log_path.
+
+    profile='cprofile' or 'torch' additionally records a trace of profile_steps iterations starting at profile_start,
+    written to PROFILE_DIR.
+    """
+
+    def __init__(self, interval: float = STATS_INTERVAL, log_path: str | None = STATS_LOG, profile: str = 'none',
+                 profile_start: int = PROFILE_START, profile_steps: int = PROFILE_STEPS):
+        if profile not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {profile!r}, expected one of {PROFILE_MODES}")
+        self.interval = interval
+        self.phases: dict[str, float] = {}    # seconds per phase since the last summary
+        self.counters: dict[str, int] = {}    # counts since the last summary
+        self.total_phases: dict[str, float] = {}
+        self.total_counters: dict[str, int] = {}
+        self.steps = 0
+        self._last = perf_counter()
+        self._window_start = self._last
+        self._window_steps = 0
+        self._next_summary = time() + interval
+        self._log = None
+        if log_path:
+            os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+            self._log = open(log_path, 'a')
+        self.profile = profile
+        self.profile_start = profile_start
+        self.profile_stop = profile_start + profile_steps
+        self._profiler = None
+
+    def begin_step(self):
+        if self.steps == 0:
+            # don't charge setup done between construction and the first iteration to the first window
+            self._window_start = perf_counter()
+            self._next_summary = time() + self.interval
+        if self.profile != 'none':
+            if self.steps == self.profile_start:
+                self._start_profile()
+            elif self.steps == self.profile_stop:
+                self._stop_profile()
+        self._last = perf_counter()
+
+    def lap(self, phase: str):
+        now = perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + (now - self._last)
+        self._last = now
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def end_step(self):
+        self.steps += 1
+        self._window_steps += 1
+        if self._profiler is not None and self.profile == 'torch':
+            self._profiler.step()
+        if time() >= self._next_summary:
+            self.summary()
+
+    def summary(self) -> dict | None:
+        """Print and log the stats gathered since the previous summary, then start a new window."""
+        now = perf_counter()
+        elapsed = now - self._window_start
+        if self._window_steps == 0 or elapsed <= 0:
+            return None
+        rates = {f"{name}_per_sec": n / elapsed for name, n in self.counters.items()}
+        fractions = {phase: t / elapsed for phase, t in self.phases.items()}
+        record = dict(time=time(), step=self.steps, elapsed=elapsed, loop_steps_per_sec=self._window_steps / elapsed,
+                      counters=dict(self.counters), rates=rates, phase_seconds=dict(self.phases), phase_fraction=fractions)
+
+        rate_text = " ".join(f"{name}/s {rate:.0f}" for name, rate in
+                             ((name.removesuffix('_per_sec'), rate) for name, rate in rates.items()))
+        phase_text = " ".join(f"{phase} {frac * 100:.0f}%" for phase, frac in sorted(fractions.items(), key=lambda p: -p[1]))
+        print(f"[stats] loop/s {record['loop_steps_per_sec']:.0f} {rate_text} | {phase_text}")
+        if self._log is not None:
+            self._log.write(json.dumps(record) + "\n")
+            self._log.flush()
+
+        for phase, t in self.phases.items():
+            self.total_phases[phase] = self.total_phases.get(phase, 0.0) + t
+        for name, n in self.counters.items():
+            self.total_counters[name] = self.total_counters.get(name, 0) + n
+        self.phases.clear()
+        self.counters.clear()
+        self._window_start = now
+        self._window_steps = 0
+        self._next_summary = time() + self.interval
+        return record
+
+    def _start_profile(self):
+        if self.profile == 'cprofile':
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        else:
+            import torch
+            activities = [torch.profiler.ProfilerActivity.CPU]
+            if torch.cuda.is_available():
+                activities.append(torch.profiler.ProfilerActivity.CUDA)
+            self._profiler = torch.profiler.profile(activities=activities, record_shapes=True)
+            self._profiler.start()
+        print(f"[stats] profiling ({self.profile}) steps {self.profile_start}-{self.profile_stop}")
+
+    def _stop_profile(self):
+        if self._profiler is None:
+            return
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        if self.profile == 'cprofile':
+            self._profiler.disable()
+            path = os.path.join(PROFILE_DIR, f"train-{self.profile_start}-{self.steps}.prof")
+            self._profiler.dump_stats(path)
+        else:
+            self._profiler.stop()
+            path = os.path.join(PROFILE_DIR, f"train-{self.profile_start}-{self.steps}.trace.json")
+            self._profiler.export_chrome_trace(path)
+        self._profiler = None
+        print(f"[stats] profile written to {path}")
+
+    def close(self):
+        self._stop_profile()  # training ended inside the window: keep what was recorded
+        self.summary()
+        if self._log is not None:
+            self._log.close()
+            self._log = None
@@ -0,0 +1,217 @@
+import numpy as np
+import torch
+
+FIELDS = ('states', 'actions', 'rewards', 'next_states', 'dones')
+
+class ReplayBuffer:
+    """
+    Fixed-capacity ring buffer of transitions stored as one preallocated array per field.
+    append() is O(1) and overwrites the oldest transition once full; sample() gathers a batch with one fancy index.
+    Actions are stored as move indices (0 = left, 1 = stay, 2 = right).
+    """
+
+    def __init__(self, capacity: int, state_size: int, seed: int | None = None):
+        self.capacity = capacity
+        self.state_size = state_size
+        self.states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.next_states = np.zeros((capacity, state_size), dtype=np.float32)
+        self.actions = np.zeros(capacity, dtype=np.int8)
+        self.rewards = np.zeros(capacity, dtype=np.float32)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self._rng = np.random.default_rng(seed)
+        self._next = 0
+        self._size = 0
+        self._pinned = None
+        self._pinned_free = None  # CUDA event marking when the pinned buffers may be overwritten
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, state: np.ndarray, action, reward: float, next_state: np.ndarray, done: bool) -> int:
+        """Store one transition and return the slot it was written to. action may be an index or a one-hot vector."""
+        i = self._next
+        self.states[i] = state
+        self.next_states[i] = next_state
+        self.actions[i] = np.argmax(action) if np.ndim(action) else action
+        self.rewards[i] = reward
+        self.dones[i] = done
+        self._next = (i + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+        return i
+
+    def extend(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray, next_states: np.ndarray, dones: np.ndarray):
+        """Store a batch of transitions (actions as indices) with one vectorised write."""
+        n = len(states)
+        if n > self.capacity:
+            states, actions, rewards, next_states, dones = (a[-self.capacity:] for a in (states, actions, rewards, next_states, dones))
+            n = self.capacity
+        idx = (self._next + np.arange(n)) % self.capacity
+        self.states[idx] = states
+        self.next_states[idx] = next_states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.dones[idx] = dones
+        self._next = int(idx[-1] + 1) % self.capacity if n else self._next
+        self._size = min(self._size + n, self.capacity)
+
+    def sample_indices(self, batch_size: int) -> np.ndarray:
+        """Uniformly sample slot indices (with replacement). Returns every stored slot if there are no more than batch_size."""
+        if self._size <= batch_size:
+            return np.arange(self._size)
+        return self._rng.integers(0, self._size, size=batch_size)
+
+    def gather(self, idx: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        return self.states[idx], self.actions[idx], self.rewards[idx], self.next_states[idx], self.dones[idx]
+
+    def sample(self, batch_size: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Return (states, actions, rewards, next_states, dones) arrays for a random batch."""
+        return self.gather(self.sample_indices(batch_size))
+
+    def sample_tensors(self, batch_size: int, device: torch.device) -> tuple[torch.Tensor, ...]:
+        """
+        Same as sample() but returns tensors on device. For CUDA devices the batch is staged through pinned host
+        buffers reused between calls, so the host-to-device copy can run asynchronously.
+        """
+        idx = self.sample_indices(batch_size)
+        batch = self.gather(idx)
+        if device.type != 'cuda':
+            return tuple(torch.from_numpy(a).to(device) for a in batch)
+
+        n = len(idx)
+        if self._pinned is None or self._pinned[0].shape[0] < n:
+            self._pinned = tuple(torch.empty(a.shape, dtype=torch.from_numpy(a[:0]).dtype).pin_memory() for a in batch)
+            self._pinned_free = torch.cuda.Event()
+        else:
+            self._pinned_free.synchronize()  # the previous batch's copies must finish before reuse
+        out = []
+        for staging, a in zip(self._pinned, batch):
+            view = staging[:n]
+            view.copy_(torch.from_numpy(a))
+            out.append(view.to(device, non_blocking=True))
+        self._pinned_free.record()
+        return tuple(out)
+
+    def state_dict(self) -> dict:
+        """
+        Copy of the stored transitions in insertion order (oldest first) plus the sampler's RNG state.
+        Only the filled part is copied, so an empty or young buffer is cheap to checkpoint.
+        """
+        order = (self._next - self._size + np.arange(self._size)) % self.capacity
+        state = {name: getattr(self, name)[order] for name in FIELDS}
+        state['rng'] = self._rng.bit_generator.state
+        return state
+
+    def load_state_dict(self, state: dict):
+        """Refill from state_dict() output (arrays may be memory-mapped); keeps the newest transitions that fit."""
+        self._next = 0
+        self._size = 0
+        self.extend(*(state[name] for name in FIELDS))
+        self._rng.bit_generator.state = state['rng']
+
+    def __repr__(self):
+        return f"ReplayBuffer(size={self._size}, capacity={self.capacity}, state_size={self.state_size})"
+
+class SumTree:
+    """
+    Binary sum-tree over capacity leaf priorities, stored in one flat array (node i has children 2i and 2i+1, leaves
+    start at self.leaf_offset). Updates and lookups are O(log n) and are vectorised over whole batches of indices.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.leaf_offset = 1 << max(0, (capacity - 1).bit_length())
+        self.depth = self.leaf_offset.bit_length() - 1
+        self.nodes = np.zeros(2 * self.leaf_offset, dtype=np.float64)
+
+    @property
+    def total(self) -> float:
+        return float(self.nodes[1])
+
+    def __getitem__(self, idx) -> np.ndarray:
+        return self.nodes[self.leaf_offset + np.asarray(idx)]
+
+    def update(self, idx: np.ndarray, priorities: np.ndarray):
+        """Set the priorities of leaves idx and refresh their ancestors, one tree level per vectorised step."""
+        nodes = self.nodes
+        node = self.leaf_offset + np.asarray(idx, dtype=np.int64)
+        nodes[node] = priorities  # with repeated indices the last write wins
+        for _ in range(self.depth):
+            node = np.unique(node >> 1)
+            nodes[node] = nodes[2 * node] + nodes[2 * node + 1]
+
+    def find(self, values: np.ndarray) -> np.ndarray:
+        """Leaf index holding each cumulative-priority value in [0, total)."""
+        nodes = self.nodes
+        node = np.ones(len(values), dtype=np.int64)
+        values = np.array(values, dtype=np.float64)
+        for _ in range(self.depth):
+            left = 2 * node
+            left_sum = nodes[left]
+            go_right = values >= left_sum
+            values -= np.where(go_right, left_sum, 0.0)
+            node = left + go_right
+        return node - self.leaf_offset
+
+class PrioritizedReplayBuffer(ReplayBuffer):
+    """
+    ReplayBuffer that samples transition i with probability p_i^alpha / sum p^alpha (proportional prioritisation).
+    New transitions get the highest priority seen so far; update_priorities() sets p_i = |td_error_i| + eps.
+    sample_prioritized() draws one transition from each of batch_size equal slices of the total priority
+    (stratified sampling) and returns importance-sampling weights (N * P(i))^-beta normalised by their maximum.
+    """
+
+    def __init__(self, capacity: int, state_size: int, seed: int | None = None, alpha: float = 0.6, beta: float = 0.4,
+                 eps: float = 1e-3):
+        super().__init__(capacity, state_size, seed)
+        self.alpha = alpha
+        self.beta = beta
+        self.eps = eps
+        self.tree = SumTree(capacity)
+        self._max_priority = 1.0  # already raised to alpha
+
+    def append(self, state: np.ndarray, action, reward: float, next_state: np.ndarray, done: bool) -> int:
+        i = super().append(state, action, reward, next_state, done)
+        self.tree.update(np.array([i]), self._max_priority)
+        return i
+
+    def extend(self, states: np.ndarray, actions: np.ndarray, rewards: np.ndarray, next_states: np.ndarray, dones: np.ndarray):
+        super().extend(states, actions, rewards, next_states, dones)
+        n = min(len(states), self.capacity)
+        if n:
+            self.tree.update((self._next - n + np.arange(n)) % self.capacity, self._max_priority)
+
+    def sample_prioritized(self, batch_size: int) -> tuple[np.ndarray, np.ndarray, tuple[np.ndarray, ...]]:
+        """Return (indices, importance weights, (states, actions, rewards, next_states, dones))."""
+        n = min(batch_size, self._size)
+        total = self.tree.total
+        values = (np.arange(n) + self._rng.random(n)) * (total / n)
+        idx = np.minimum(self.tree.find(values), self._size - 1)  # guards float round-off at the right edge
+        probs = self.tree[idx] / total
+        weights = (self._size * probs) ** -self.beta
+        weights /= weights.max()
+        return idx, weights.astype(np.float32), self.gather(idx)
+
+    def update_priorities(self, idx: np.ndarray, td_errors: np.ndarray):
+        priorities = (np.abs(td_errors) + self.eps) ** self.alpha
+        self.tree.update(idx, priorities)
+        self._max_priority = max(self._max_priority, float(priorities.max()))
+
+    def state_dict(self) -> dict:
+        state = super().state_dict()
+        order = (self._next - self._size + np.arange(self._size)) % self.capacity
+        state['priorities'] = self.tree[order]
+        state['beta'] = self.beta
+        return state
+
+    def load_state_dict(self, state: dict):
+        self.tree = SumTree(self.capacity)
+        self._max_priority = 1.0
+        super().load_state_dict(state)
+        self.beta = state.get('beta', self.beta)
+        if 'priorities' in state:
+            priorities = np.asarray(state['priorities'])[-self._size:] if self._size else np.zeros(0)
+            self.tree.update(np.arange(self._size), priorities)
+            self._max_priority = max(1.0, float(priorities.max())) if self._size else 1.0
+
+    def __repr__(self):
+        return f"PrioritizedReplayBuffer(size={self._size}, capacity={self.capacity}, alpha={self.alpha}, beta={self.beta})"
@@ -0,0 +1,223 @@
+"""
+Hyperparameter sweeps.
+
+SweepRunner trains every trial (a dict of TrainConfig fields and/or train() keyword arguments) in its own spawned
+process, running as many at once as the CPU budget allows: each trial gets threads_per_trial torch threads and, where
+the OS supports it, is pinned to its own threads_per_trial cores. Trials run in <out_dir>/trial-NNN (so their model/
+and checkpoints/ don't collide) with their output in train.log.
+
+Every finished game is streamed back to the runner and appended to <out_dir>/results.csv. SuccessiveHalving stops
+trials that fall behind: at each rung (min_episodes, min_episodes * eta, ...) a trial's recent score is compared with
+every trial that already reached that rung, and it only carries on if it is within the top 1/eta of them (the
+asynchronous variant, so fast trials never wait for slow ones). A stopped trial ends at its next game and still saves
+its final checkpoint. Pass dataset_dir (learning.dataset) in train_kwargs to start every trial from the same
+experience. The per-trial summary is written to <out_dir>/trials.csv.
+"""
+import csv
+import itertools
+import json
+import math
+import os
+import queue
+import traceback
+import multiprocessing as mp
+from contextlib import redirect_stdout, redirect_stderr
+from time import time
+import numpy as np
+from .agent import train, default_config, TrainConfig
+
+MIN_EPISODES = 5  # first successive-halving rung
+REDUCTION_FACTOR = 3  # eta: keep the top 1/eta at each rung
+SCORE_WINDOW = 5  # games averaged into a trial's score at a rung
+THREADS_PER_TRIAL = 1
+RESULT_COLUMNS = ('trial', 'episode', 'percentage_broken', 'game_time', 'result', 'elapsed')
+
+def grid(**values) -> list[dict]:
+    """Every combination of the given parameter values: grid(lr=[1e-3, 1e-4], gamma=[.9, .99]) -> 4 trials."""
+    names = list(values)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(values[name] for name in names))]
+
+class SuccessiveHalving:
+    """Asynchronous successive halving over a higher-is-better metric. Rungs are the episode counts where trials are judged."""
+
+    def __init__(self, max_episodes: int, min_episodes: int = MIN_EPISODES, eta: int = REDUCTION_FACTOR):
+        self.eta = eta
+        self.rungs = []
+        rung = min_episodes
+        while rung < max_episodes:
+            self.rungs.append(rung)
+            rung *= eta
+        self.results = {rung: [] for rung in self.rungs}
+
+    def report(self, episodes: int, metric: float) -> bool:
+        """Record a trial's metric after episodes games. Returns False if the trial should stop."""
+        if episodes not in self.results:
+            return True
+        seen = self.results[episodes]
+        seen.append(metric)
+        return metric >= np.quantile(seen, 1 - 1 / self.eta)
+
+def _run_trial(trial: int, directory: str, config: dict, kwargs: dict, threads: int, cores: list[int] | None, messages,
+               stop):
+    os.chdir(directory)
+    if cores:
+        os.sched_setaffinity(0, cores)
+
+    def on_episode(n_games, new_score, result) -> bool:
+        messages.put(('episode', trial, n_games, new_score.percentage_broken, new_score.time, result))
+        return not stop.is_set()
+
+    with open('train.log', 'w') as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            train(config=TrainConfig(**config), num_threads=threads, on_episode=on_episode, **kwargs)
+            error = None
+        except Exception:
+            error = traceback.format_exc()
+            print(error)
+    messages.put(('done', trial, error))
+
+class SweepRunner:
+    """
+    Runs trials as described in the module docstring. max_parallel defaults to cpu_count // threads_per_trial.
+    train_kwargs apply to every trial (a trial's own entries win); TrainConfig fields a trial leaves out come from
+    default_config(). run() returns the summary rows, best first.
+    """
+
+    def __init__(self, trials: list[dict], out_dir: str, threads_per_trial: int = THREADS_PER_TRIAL,
+                 max_parallel: int | None = None, min_episodes: int = MIN_EPISODES, eta: int = REDUCTION_FACTOR,
+                 window: int = SCORE_WINDOW, train_kwargs: dict | None = None):
+        self.out_dir = out_dir
+        self.threads_per_trial = threads_per_trial
+        self.window = window
+        cpus = len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else os.cpu_count() or 1
+        self.max_parallel = max_parallel or max(1, cpus // threads_per_trial)
+        base = dict(plot_mode='none', stats_log=None, seed=0)
+        base.update(train_kwargs or {})
+        self.trials = []
+        for i, params in enumerate(trials):
+            config = default_config(**{k: v for k, v in params.items() if k in TrainConfig._fields})
+            kwargs = dict(base, **{k: v for k, v in params.items() if k not in TrainConfig._fields})
+            if kwargs.get('dataset_dir'):
+                kwargs['dataset_dir'] = os.path.abspath(kwargs['dataset_dir'])  # trials run in their own directory
+            self.trials.append(dict(trial=i, params=params, config=config, kwargs=kwargs, status='pending', episodes=0,
+                                    scores=[], rung=0, error=None))
+        max_episodes = max((t['config'].num_episodes for t in self.trials), default=0)
+        self.halving = SuccessiveHalving(max_episodes, min_episodes, eta)
+
+    def _cores(self, slot: int) -> list[int] | None:
+        if not hasattr(os, 'sched_getaffinity'):
+            return None
+        available = sorted(os.sched_getaffinity(0))
+        cores = available[slot * self.threads_per_trial:(slot + 1) * self.threads_per_trial]
+        return cores if len(cores) == self.threads_per_trial else None  # oversubscribed: let the OS place it
+
+    def _launch(self, t: dict, slot: int):
+        directory = os.path.join(self.out_dir, f"trial-{t['trial']:03d}")
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, 'config.json'), 'w') as f:
+            json.dump(dict(params=t['params'], config=t['config']._asdict(), train_kwargs=t['kwargs']), f, indent=1, default=str)
+        t['stop'] = self._ctx.Event()
+        t['process'] = self._ctx.Process(target=_run_trial, daemon=True,
+                                         args=(t['trial'], os.path.abspath(directory), t['config']._asdict(), t['kwargs'],
+                                               self.threads_per_trial, self._cores(slot), self._messages, t['stop']))
+        t['process'].start()
+        t['slot'] = slot
+        t['status'] = 'running'
+        self._running[t['trial']] = t
+        print(f"trial {t['trial']}: started {t['params']}")
+
+    def _finish(self, t: dict, error: str | None):
+        del self._running[t['trial']]
+        t['process'].join()
+        if error is not None:
+            t['status'], t['error'] = 'failed', error
+            print(f"trial {t['trial']}: failed\n{error}")
+        elif t['status'] == 'running':
+            t['status'] = 'done'
+        self._free.append(t['slot'])
+
+    def _on_episode(self, t: dict, episode: int, percentage_broken: float, game_time: float, result: str):
+        self._results.writerow((t['trial'], episode, percentage_broken, game_time, result, round(time() - self._start, 3)))
+        self._results_file.flush()
+        if t['status'] != 'running':
+            return  # already stopped; this is the game it was playing when told
+        t['episodes'] = episode
+        t['scores'].append(percentage_broken)
+        if episode in self.halving.results:
+            t['rung'] = episode
+            if not self.halving.report(episode, self.metric(t)):
+                t['stop'].set()
+                t['status'] = 'stopped'
+                print(f"trial {t['trial']}: stopped at {episode} games, score {self.metric(t):.2f}")
+
+    def _handle(self, message: tuple):
+        kind, trial, *payload = message
+        t = self.trials[trial]
+        if kind == 'episode':
+            self._on_episode(t, *payload)
+        elif trial in self._running:
+            self._finish(t, payload[0])
+
+    def metric(self, t: dict) -> float:
+        """Mean percentage of bricks broken over the trial's last window games (nan before its first game)."""
+        recent = t['scores'][-self.window:]
+        return float(np.mean(recent)) if recent else math.nan
+
+    def run(self) -> list[dict]:
+        os.makedirs(self.out_dir, exist_ok=True)
+        self._ctx = mp.get_context('spawn')
+        self._messages = self._ctx.Queue()
+        self._free = list(range(self.max_parallel))
+        self._running = {}
+        self._start = time()
+        pending = list(self.trials)
+        with open(os.path.join(self.out_dir, 'results.csv'), 'w', newline='') as self._results_file:
+            self._results = csv.writer(self._results_file)
+            self._results.writerow(RESULT_COLUMNS)
+            try:
+                while pending or self._running:
+                    while pending and self._free:
+                        self._launch(pending.pop(0), self._free.pop(0))
+                    try:
+                        self._handle(self._messages.get(timeout=0.5))
+                    except queue.Empty:
+                        for t in list(self._running.values()):
+                            if not t['process'].is_alive():
+                                self._finish(t, f"process exited with code {t['process'].exitcode}")
+            finally:
+                for t in self._running.values():
+                    t['process'].terminate()
+                    t['process'].join()
+        rows = self.summary()
+        with open(os.path.join(self.out_dir, 'trials.csv'), 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=_columns(rows))
+            writer.writeheader()
+            writer.writerows(rows)
+        return rows
+
+    def summary(self) -> list[dict]:
+        """One row per trial: id, status, games played, last rung, score, best game and the swept parameters."""
+        rows = []
+        for t in self.trials:
+            row = dict(trial=t['trial'], status=t['status'], episodes=t['episodes'], rung=t['rung'],
+                       score=round(self.metric(t), 3) if t['scores'] else None, best=round(max(t['scores'], default=0.0), 3))
+            row.update(t['params'])
+            rows.append(row)
+        # trials that got further first, then by score
+        rows.sort(key=lambda r: (r['status'] != 'failed', r['episodes'], r['score'] or 0.0), reverse=True)
+        return rows
+
+def _columns(rows: list[dict]) -> list[str]:
+    """Every key used by rows, in first-seen order (trials may sweep different parameters)."""
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+def format_table(rows: list[dict]) -> str:
+    """Plain-text table of summary() rows."""
+    if not rows:
+        return ''
+    columns = _columns(rows)
+    cells = [[str(r.get(c, '')) for c in columns] for r in rows]
+    widths = [max(len(c), *(len(row[i]) for row in cells)) for i, c in enumerate(columns)]
+    lines = ['  '.join(c.ljust(w) for c, w in zip(columns, widths))]
+    lines += ['  '.join(v.ljust(w) for v, w in zip(row, widths)) for row in cells]
+    return '\n'.join(lines)
@@ -1,6 +1,14 @@
 from .vec2 import vec2
 
+# Outward side normals returned by closest_side. Shared instances: treat as read-only.
+NORMAL_LEFT = vec2(-1, 0)
+NORMAL_RIGHT = vec2(1, 0)
+NORMAL_TOP = vec2(0, -1)
+NORMAL_BOTTOM = vec2(0, 1)
+
 class aabb:
+    __slots__ = ('min', 'max')
+
     def __init__(self, min: vec2, max: vec2):
         self.min = min
         self.max = max
@@ -8,31 +16,40 @@ class aabb:
     def __repr__(self):
         return f"aabb(min={self.min}, max={self.max})"
 
+    def set(self, min_x: float, min_y: float, max_x: float, max_y: float) -> 'aabb':
+        """Move the box in place."""
+        self.min.x = min_x
+        self.min.y = min_y
+        self.max.x = max_x
+        self.max.y = max_y
+        return self
+
     def contains(self, point: vec2) -> bool:
         """Check if the AABB contains the given point."""
         return (self.min.x <= point.x <= self.max.x) and (self.min.y <= point.y <= self.max.y)
 
-    def closest_point(self, point: vec2) -> vec2:
-        """Return the closest point on the AABB to the given point."""
+    def closest_point(self, point: vec2, out: vec2 | None = None) -> vec2:
+        """Return the closest point on the AABB to the given point. Written into out if given."""
         clamped_x = max(self.min.x, min(point.x, self.max.x))
         clamped_y = max(self.min.y, min(point.y, self.max.y))
-        return vec2(clamped_x, clamped_y)
+        if out is None:
+            return vec2(clamped_x, clamped_y)
+        return out.set(clamped_x, clamped_y)
     
     def closest_side(self, point: vec2) -> vec2:
-        """Return a normal representing the side of the AABB closest to the given point. The normal points outwards from the aabb."""
-        distances = {
-            'left': abs(point.x - self.min.x),
-            'right': abs(point.x - self.max.x),
-            'top': abs(point.y - self.min.y),
-            'bottom': abs(point.y - self.max.y)
-        }
-        closest_side = min(distances, key=distances.get)
-        if closest_side == 'left':
-            return vec2(-1, 0)
-        elif closest_side == 'right':
-            return vec2(1, 0)
-        elif closest_side == 'top':
-            return vec2(0, -1)
-        elif closest_side == 'bottom':
-            return vec2(0, 1)
+        """Return a normal representing the side of the AABB closest to the given point. The normal points outwards from the aabb.
+        The returned vector is shared and must not be modified."""
+        left = abs(point.x - self.min.x)
+        right = abs(point.x - self.max.x)
+        top = abs(point.y - self.min.y)
+        bottom = abs(point.y - self.max.y)
+        # Ties resolve in the order left, right, top, bottom
+        closest = min(left, right, top, bottom)
+        if closest == left:
+            return NORMAL_LEFT
+        elif closest == right:
+            return NORMAL_RIGHT
+        elif closest == top:
+            return NORMAL_TOP
+        return NORMAL_BOTTOM
 
@@ -1,9 +1,11 @@
 from .vec2 import vec2
 
 class circle:
+    __slots__ = ('center', 'radius')
+
     def __init__(self, center: vec2, radius: float):
         self.center = center
         self.radius = radius
 
     def __repr__(self):
-        return f"circle(center={self.center}, radius={self.radius})"
\ No newline at end of file
+        return f"circle(center={self.center}, radius={self.radius})"
@@ -1,5 +1,6 @@
 from .circle import circle
-from .aabb import aabb
+from .aabb import aabb, NORMAL_LEFT, NORMAL_RIGHT, NORMAL_TOP, NORMAL_BOTTOM
+from .vec2 import vec2
 from functools import singledispatch
 
 
@@ -9,11 +10,70 @@ def intersects(a, b) -> bool:
 
 @intersects.register
 def _(a: circle, b: aabb) -> bool:
-    closest = b.closest_point(a.center)
-    distance_x = a.center.x - closest.x
-    distance_y = a.center.y - closest.y
-    return (distance_x**2 + distance_y**2) < (a.radius**2) or b.contains(a.center)
+    # Same as b.closest_point(a.center), inlined so the hot path doesn't allocate
+    center = a.center
+    distance_x = center.x - max(b.min.x, min(center.x, b.max.x))
+    distance_y = center.y - max(b.min.y, min(center.y, b.max.y))
+    return (distance_x**2 + distance_y**2) < (a.radius**2) or b.contains(center)
 
 @intersects.register
 def _(a: aabb, b: circle) -> bool:
-    return intersects(b, a)
\ No newline at end of file
+    return intersects(b, a)
+
+def time_of_impact(a: circle, displacement: vec2, b: aabb) -> tuple[float, vec2] | None:
+    """
+    Sweep circle a along displacement and return (t, normal) for its first contact with b, where t in [0, 1] is the
+    fraction of the displacement travelled and normal is the outward surface normal at the contact.
+    Returns None if there is no contact, or if a already overlaps b (handled by the discrete intersects test).
+    Face normals are shared constants and must not be modified.
+    """
+    if intersects(a, b):
+        return None
+    r = a.radius
+    px = a.center.x
+    py = a.center.y
+    dx = displacement.x
+    dy = displacement.y
+
+    # Faces of the box grown by r on one axis
+    if dx > 0:
+        t = (b.min.x - r - px) / dx
+        if 0.0 <= t <= 1.0 and b.min.y <= py + t * dy <= b.max.y:
+            return t, NORMAL_LEFT
+    elif dx < 0:
+        t = (b.max.x + r - px) / dx
+        if 0.0 <= t <= 1.0 and b.min.y <= py + t * dy <= b.max.y:
+            return t, NORMAL_RIGHT
+    if dy > 0:
+        t = (b.min.y - r - py) / dy
+        if 0.0 <= t <= 1.0 and b.min.x <= px + t * dx <= b.max.x:
+            return t, NORMAL_TOP
+    elif dy < 0:
+        t = (b.max.y + r - py) / dy
+        if 0.0 <= t <= 1.0 and b.min.x <= px + t * dx <= b.max.x:
+            return t, NORMAL_BOTTOM
+
+    # Rounded corners
+    qa = dx * dx + dy * dy
+    if qa == 0:
+        return None
+    best_t = None
+    best_corner = None
+    for cx, cy in ((b.min.x, b.min.y), (b.max.x, b.min.y), (b.min.x, b.max.y), (b.max.x, b.max.y)):
+        mx = px - cx
+        my = py - cy
+        qb = mx * dx + my * dy
+        if qb >= 0:
+            continue  # moving away from this corner
+        qc = mx * mx + my * my - r * r
+        disc = qb * qb - qa * qc
+        if disc < 0:
+            continue
+        t = (-qb - disc ** 0.5) / qa
+        if 0.0 <= t <= 1.0 and (best_t is None or t < best_t):
+            best_t = t
+            best_corner = (cx, cy)
+    if best_t is None:
+        return None
+    cx, cy = best_corner
+    return best_t, vec2((px + best_t * dx - cx) / r, (py + best_t * dy - cy) / r)
@@ -1,6 +1,8 @@
 
 
 class vec2:
+    __slots__ = ('x', 'y')
+
     def __init__(self, x: float=0.0, y: float=0.0):
         self.x = x
         self.y = y
@@ -29,5 +31,35 @@ class vec2:
             return vec2(0, 0)
         return self / length
 
+    def copy(self) -> 'vec2':
+        return vec2(self.x, self.y)
+
+    # In-place mutators: these modify and return self, so they never allocate.
+    def set(self, x: float, y: float) -> 'vec2':
+        self.x = x
+        self.y = y
+        return self
+
+    def iadd(self, other: 'vec2') -> 'vec2':
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def isub(self, other: 'vec2') -> 'vec2':
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def imul(self, scalar: float) -> 'vec2':
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def scale_add(self, other: 'vec2', scalar: float) -> 'vec2':
+        """self += other * scalar"""
+        self.x += other.x * scalar
+        self.y += other.y * scalar
+        return self
+
     def __repr__(self):
         return f"vec2({self.x}, {self.y})"
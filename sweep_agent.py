@@ -0,0 +1,48 @@
+"""
+Hyperparameter sweep over TrainConfig fields (learning.sweep).
+
+Run:
+    PYTHONPATH=src python sweep_agent.py sweeps/lr --grid lr=1e-3,3e-4,1e-4 --grid hidden_nodes=128,256 --episodes 45
+    PYTHONPATH=src python sweep_agent.py sweeps/gamma --grid gamma=0.9,0.99 --dataset data/scripted --offline-steps 200
+
+Non-TrainConfig keys are passed to train() as JSON values (e.g. --grid double_dqn=false,true).
+"""
+import argparse
+import json
+from learning.agent import TrainConfig
+from learning.sweep import SweepRunner, grid, format_table, MIN_EPISODES, REDUCTION_FACTOR, SCORE_WINDOW, THREADS_PER_TRIAL
+
+def parse_grid(specs: list[str]) -> dict[str, list]:
+    values = {}
+    for spec in specs:
+        name, _, options = spec.partition('=')
+        kind = TrainConfig.__annotations__.get(name)
+        values[name] = [kind(v) if kind else json.loads(v) for v in options.split(',')]
+    return values
+
+def main():
+    parser = argparse.ArgumentParser(description="Train many configs in parallel, stopping the ones that fall behind.")
+    parser.add_argument('out_dir', help='Directory for the trial directories, results.csv and trials.csv')
+    parser.add_argument('--grid', action='append', default=[], metavar='NAME=V1,V2,...', help='Values to sweep (repeatable)')
+    parser.add_argument('--episodes', type=int, default=None, help='Games per trial that survives every rung')
+    parser.add_argument('--threads-per-trial', type=int, default=THREADS_PER_TRIAL, help='CPU cores (and torch threads) per trial')
+    parser.add_argument('--parallel', type=int, default=None, help='Trials run at once (default: cores // threads per trial)')
+    parser.add_argument('--min-episodes', type=int, default=MIN_EPISODES, help='Games before the first successive-halving cut')
+    parser.add_argument('--eta', type=int, default=REDUCTION_FACTOR, help='Keep the top 1/eta of trials at each rung')
+    parser.add_argument('--window', type=int, default=SCORE_WINDOW, help='Recent games averaged into a trial\'s score')
+    parser.add_argument('--seed', type=int, default=0, help='Seed shared by every trial')
+    parser.add_argument('--dataset', default=None, metavar='DIR', help='Offline dataset every trial pre-fills its replay memory from')
+    parser.add_argument('--offline-steps', type=int, default=0, help='With --dataset, batches streamed from it before playing')
+    args = parser.parse_args()
+
+    values = parse_grid(args.grid)
+    if args.episodes is not None:
+        values['num_episodes'] = [args.episodes]
+    train_kwargs = dict(seed=args.seed, dataset_dir=args.dataset, offline_steps=args.offline_steps)
+    runner = SweepRunner(grid(**values), args.out_dir, threads_per_trial=args.threads_per_trial, max_parallel=args.parallel,
+                         min_episodes=args.min_episodes, eta=args.eta, window=args.window, train_kwargs=train_kwargs)
+    print(f"{len(runner.trials)} trials, {runner.max_parallel} at a time, rungs at {runner.halving.rungs} games")
+    print(format_table(runner.run()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+import pytest
+
+import learning.agent as agent_module
+from learning.agent import Agent, train, default_config
+from learning.checkpoint import CheckpointManager
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # train writes ./model and ./checkpoints
+    return tmp_path
+
+class _closing_plotter:
+    def __init__(self):
+        self.scores = []
+        self.closed = False
+
+    def add_score(self, score):
+        self.scores.append(score)
+
+    def plot(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+def test_train_cleans_up_when_interrupted(workdir, monkeypatch):
+    plotter = _closing_plotter()
+    monkeypatch.setattr(agent_module, 'make_plotter', lambda mode: plotter)
+
+    def on_episode(n_games, new_score, result):
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        train(seed=1, stats_log=None, config=default_config(num_episodes=5), on_episode=on_episode,
+              record_dir=str(workdir / 'episodes'))
+    assert len(plotter.scores) == 1 and plotter.closed
+
+def test_agent_rejects_fewer_than_one_long_gradient_step(workdir):
+    with pytest.raises(ValueError):
+        Agent(device='cpu', act_device='cpu', long_gradient_steps=0)
+
+def test_resume_from_checkpoint_without_record(workdir):
+    agent = Agent(device='cpu', act_device='cpu', seed=0)
+    agent.n_games = 1
+    manager = CheckpointManager(str(workdir / 'ckpt'))
+    manager.save(agent, step=1)  # no extra=dict(record=...)
+    manager.close()
+
+    games = []
+    train(seed=1, plot_mode='none', stats_log=None, checkpoint_dir=str(workdir / 'ckpt'), resume=True,
+          config=default_config(num_episodes=2), on_episode=lambda n_games, new_score, result: games.append(n_games))
+    assert games == [2]
@@ -0,0 +1,243 @@
+import pytest
+
+from game.breakout_sim import breakout_sim, paddle_move, WinState
+from game.brick import brick
+from game.brick_grid import brick_grid
+from game.constants import SCREEN_SIZE, BRICK_ROWS, BRICK_SIZE, PADDLE_SIZE, BALL_RADIUS, PADDLE_SPEED, SIM_DT
+from physics.aabb import aabb
+from physics.circle import circle
+from physics.intersections import intersects
+from physics.vec2 import vec2
+
+def make_game(brick_rows=BRICK_ROWS, size=SCREEN_SIZE, continuous=False):
+    return breakout_sim(size=size, brick_rows=brick_rows, brick_size=BRICK_SIZE, paddle_size=PADDLE_SIZE,
+                        ball_radius=BALL_RADIUS, paddle_vel=PADDLE_SPEED, continuous=continuous)
+
+
+def test_grid_holds_every_live_brick_once():
+    game = make_game()
+    assert len(game.brick_grid) == len(game.bricks)
+    assert all(len(cell) == 1 for row in game.brick_grid.cells.values() for cell in row.values())
+
+
+@pytest.mark.parametrize("x,y", [(0, 0), (64, 44), (100, 50), (767, 163), (400, 300), (32.5, 20.0), (799, 10)])
+def test_grid_query_matches_linear_scan(x, y):
+    game = make_game()
+    shape = circle(vec2(x, y), BALL_RADIUS)
+    expected = [b for b in game.bricks if intersects(shape, b.box)]
+    found = [b for b in game.brick_grid.query(x - BALL_RADIUS, y - BALL_RADIUS, x + BALL_RADIUS, y + BALL_RADIUS)
+             if intersects(shape, b.box)]
+    assert found == expected
+
+
+def test_grid_remove_clears_cell():
+    b = brick(aabb(vec2(0, 0), vec2(10, 10)))
+    grid = brick_grid(origin=vec2(0, 0), cell_size=vec2(10, 10), bricks=[b])
+    assert grid.query(1, 1, 2, 2) == [b]
+    grid.remove(b)
+    assert grid.query(1, 1, 2, 2) == []
+    assert len(grid) == 0
+
+
+def test_grid_brick_spanning_cells_is_returned_once():
+    wide = brick(aabb(vec2(0, 0), vec2(25, 10)))
+    grid = brick_grid(origin=vec2(0, 0), cell_size=vec2(10, 10), bricks=[wide])
+    assert len(grid.cells[0]) == 3
+    assert grid.query(0, 0, 30, 5) == [wide]
+
+
+def test_destroyed_brick_leaves_grid():
+    game = make_game()
+    target = game.bricks[-1]
+    game.ball.position = vec2(target.box.min.x + 10, target.box.max.y + BALL_RADIUS - 1)
+    game.ball.shape.center = game.ball.position
+    game.ball.velocity = vec2(0, -100)
+    game.step(SIM_DT, paddle_move.STAY)
+    assert not target.alive
+    assert len(game.brick_grid) == len(game.bricks) - 1
+    assert target not in game.brick_grid.query(target.box.min.x, target.box.min.y, target.box.max.x, target.box.max.y)
+
+
+def test_large_layout_steps():
+    game = make_game(brick_rows=20, size=vec2(1600, 1200))
+    for _ in range(2000):
+        game.step(SIM_DT, paddle_move.STAY)
+        if game.win_state != WinState.ONGOING:
+            break
+    assert len(game.brick_grid) == sum(b.alive for b in game.bricks)
+
+
+def run_continuous(hz, seconds):
+    game = make_game(continuous=True)
+    for _ in range(int(round(seconds * hz))):
+        game.step(1.0 / hz, paddle_move.STAY)
+        if game.win_state != WinState.ONGOING:
+            break
+    return game
+
+
+@pytest.mark.parametrize("hz", [60, 30, 10])
+def test_continuous_outcome_independent_of_step_rate(hz):
+    reference = run_continuous(200, 2.0)
+    game = run_continuous(hz, 2.0)
+    assert [b.alive for b in game.bricks] == [b.alive for b in reference.bricks]
+    assert game.ball.position.x == pytest.approx(reference.ball.position.x)
+    assert game.ball.position.y == pytest.approx(reference.ball.position.y)
+    assert game.ball.velocity.x == pytest.approx(reference.ball.velocity.x)
+    assert game.ball.velocity.y == pytest.approx(reference.ball.velocity.y)
+
+
+def test_continuous_handles_multiple_bounces_in_one_step():
+    game = make_game(continuous=True)
+    game.ball.position = vec2(SCREEN_SIZE.x - BALL_RADIUS - 5, 400)
+    game.ball.velocity = vec2(1000, -200)
+    game.step(0.05, paddle_move.STAY)  # 50 px right (wall at 5 px), 10 px up
+    assert game.ball.velocity.x == -1000
+    assert game.ball.position.x == pytest.approx(SCREEN_SIZE.x - BALL_RADIUS - 45)
+    assert game.ball.position.y == pytest.approx(390)
+
+
+def test_continuous_large_step_does_not_tunnel_through_paddle():
+    game = make_game(continuous=True)
+    paddle_top = game.paddle.aabb().min.y
+    game.ball.position = vec2(game.paddle.position.x, paddle_top - 40)
+    game.ball.velocity = vec2(0, 2000)
+    game.step(0.05, paddle_move.STAY)  # 100 px: the discrete sim would land below the paddle
+    assert game.win_state == WinState.ONGOING
+    assert game.ball.velocity.y == -2000
+    assert game.ball.position.y == pytest.approx(paddle_top - BALL_RADIUS - 68)
+
+
+def test_step_n_matches_repeated_step():
+    stepped = make_game()
+    fused = make_game()
+    broken = 0
+    for _ in range(400):
+        before = sum(b.alive for b in stepped.bricks)
+        stepped.step(SIM_DT, paddle_move.RIGHT)
+        broken += before - sum(b.alive for b in stepped.bricks)
+    fused_broken, state = fused.step_n(SIM_DT, paddle_move.RIGHT, 400)
+    assert fused_broken == broken > 0
+    assert state.game_time == pytest.approx(stepped.game_time)
+    assert (fused.ball.position.x, fused.ball.position.y) == (stepped.ball.position.x, stepped.ball.position.y)
+    assert fused.paddle.position.x == stepped.paddle.position.x
+
+
+def test_step_n_stops_at_game_over():
+    game = make_game()
+    game.ball.position = vec2(100, SCREEN_SIZE.y - BALL_RADIUS - 0.5)
+    game.ball.velocity = vec2(0, 200)
+    _, state = game.step_n(SIM_DT, paddle_move.STAY, 50)
+    assert state.win_state == WinState.LOST
+    assert state.game_time == pytest.approx(SIM_DT)
+
+
+def test_brick_counters_track_hits():
+    game = make_game()
+    total = len(game.bricks)
+    states = []
+    for _ in range(3000):
+        states.append(game.step(SIM_DT, paddle_move.STAY))
+        if game.win_state != WinState.ONGOING:
+            break
+    broken = sum(s.bricks_broken_this_step for s in states)
+    assert broken > 0
+    assert game.bricks_left == sum(b.alive for b in game.bricks) == total - broken
+    # each state keeps the count from when it was taken
+    assert [s.num_bricks_left() for s in states] == sorted((s.num_bricks_left() for s in states), reverse=True)
+    assert states[-1].num_bricks_broken() == broken
+
+
+def test_clearing_last_brick_wins():
+    game = make_game()
+    for b in game.bricks[1:]:
+        b.alive = False
+        game.brick_grid.remove(b)
+    game.bricks_left = 1
+    target = game.bricks[0]
+    game.ball.position = vec2(target.box.min.x + 20, target.box.max.y + BALL_RADIUS - 1)
+    game.ball.velocity = vec2(0, -100)
+    state = game.step(SIM_DT, paddle_move.STAY)
+    assert state.win_state == WinState.WON
+    assert state.num_bricks_left() == 0
+    assert state.bricks_broken_this_step == 1
+
+
+def play(game, ticks, moves=(paddle_move.LEFT, paddle_move.RIGHT, paddle_move.STAY)):
+    states = []
+    for i in range(ticks):
+        states.append(game.step(SIM_DT, moves[(i // 40) % len(moves)]))
+        if game.win_state != WinState.ONGOING:
+            break
+    return states
+
+
+def trace(states):
+    return [(s.ball.position.x, s.ball.position.y, s.game_time, s.bricks_left, s.win_state) for s in states]
+
+
+@pytest.mark.parametrize("continuous", [False, True])
+def test_restore_replays_identically(continuous):
+    game = make_game(continuous=continuous)
+    play(game, 400)
+    snap = game.snapshot()
+    first = [(s.ball.position.x, s.ball.position.y, s.bricks_left) for s in play(game, 1500)]
+    game.restore(snap)
+    assert game.snapshot() == snap
+    second = [(s.ball.position.x, s.ball.position.y, s.bricks_left) for s in play(game, 1500)]
+    assert first == second
+
+
+def test_reset_matches_fresh_sim():
+    game = make_game()
+    play(game, 2000)
+    assert game.bricks_left < len(game.bricks)
+    game.reset()
+    fresh = make_game()
+    assert game.snapshot() == fresh.snapshot()
+    assert len(game.brick_grid) == len(game.bricks)
+    assert game.paddle.aabb().min.x == fresh.paddle.aabb().min.x
+    assert trace(play(game, 2000)) == trace(play(fresh, 2000))
+
+
+def test_seeded_reset_is_reproducible():
+    game = make_game()
+    openings = {game.reset(seed=s).ball.position.x for s in range(5)}
+    assert len(openings) > 1
+    a = game.reset(seed=3).ball.velocity.x
+    x = game.ball.position.x
+    assert (game.reset(seed=3).ball.velocity.x, game.ball.position.x) == (a, x)
+
+
+def test_reset_listeners_see_the_seeded_serve():
+    game = make_game()
+    seen = []
+    game.reset_listeners.append(lambda g: seen.append((g.ball.position.x, g.ball.velocity.x)))
+    for s in range(5):
+        game.reset(seed=s)
+        assert seen[-1] == (game.ball.position.x, game.ball.velocity.x)
+    assert len(set(seen)) > 1
+
+
+def test_restore_notifies_reset_listeners_and_fixes_counters():
+    game = make_game()
+    play(game, 2000)
+    snap = game.snapshot()
+    seen = []
+    game.reset_listeners.append(seen.append)
+    game.reset()
+    game.restore(snap)
+    assert seen == [game, game]
+    assert game.bricks_left == sum(b.alive for b in game.bricks) == snap.bricks_left
+    assert len(game.brick_grid) == game.bricks_left
+
+
+def test_restore_rejects_larger_layout():
+    with pytest.raises(ValueError):
+        make_game(brick_rows=1).restore(make_game().snapshot())
+
+def test_step_n_rejects_zero_ticks():
+    game = make_game()
+    with pytest.raises(ValueError):
+        game.step_n(SIM_DT, paddle_move.STAY, 0)
+    assert game.game_time == 0.0
@@ -0,0 +1,96 @@
+import os
+import numpy as np
+import pytest
+import torch
+
+from learning.agent import Agent, STATE_SIZE
+from learning.checkpoint import CheckpointManager
+
+CPU = torch.device('cpu')
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # Agent loads ./model/model.pth if present
+    return tmp_path
+
+
+def trained_agent(seed=0, steps=3, **kwargs):
+    agent = Agent(device=CPU, act_device=CPU, seed=seed, **kwargs)
+    rng = np.random.default_rng(seed)
+    n = 50
+    agent.memory.extend(rng.random((n, STATE_SIZE), dtype=np.float32), rng.integers(0, 3, n), rng.random(n, dtype=np.float32),
+                        rng.random((n, STATE_SIZE), dtype=np.float32), rng.random(n) < 0.1)
+    for _ in range(steps):
+        agent.train_long_memory()
+    agent.n_games = 7
+    return agent
+
+
+def test_save_and_load_round_trip(workdir):
+    agent = trained_agent()
+    manager = CheckpointManager(str(workdir / "ckpt"))
+    path = manager.save(agent, step=7, extra=dict(record=(12.5, 30.0)))
+    manager.wait()
+    assert os.path.isdir(path)
+
+    other = Agent(device=CPU, act_device=CPU, seed=1)
+    state = manager.load(other)
+    manager.close()
+    assert state['step'] == 7 and state['extra']['record'] == (12.5, 30.0)
+    assert other.n_games == 7 and other.n_updates == agent.n_updates
+    for a, b in zip(agent.model.parameters(), other.model.parameters()):
+        assert torch.equal(a, b)
+    assert other.trainer.optimizer.state_dict()['state'][0]['step'] == agent.trainer.optimizer.state_dict()['state'][0]['step']
+    assert len(other.memory) == len(agent.memory)
+    np.testing.assert_array_equal(other.memory.states[:50], agent.memory.states[:50])
+
+    # training continues identically from the restored RNG, replay sampler and Adam moments
+    agent.train_long_memory()
+    other.train_long_memory()
+    for a, b in zip(agent.model.parameters(), other.model.parameters()):
+        assert torch.allclose(a, b)
+    assert agent.rng.random() == other.rng.random()
+
+
+def test_prioritized_replay_round_trip(workdir):
+    agent = trained_agent(prioritized=True)
+    manager = CheckpointManager(str(workdir / "ckpt"))
+    manager.save(agent, step=1)
+    manager.wait()
+    other = Agent(device=CPU, act_device=CPU, seed=1, prioritized=True)
+    manager.load(other)
+    manager.close()
+    np.testing.assert_array_equal(other.memory.state_dict()['priorities'], agent.memory.state_dict()['priorities'])
+    assert other.memory.beta == agent.memory.beta > 0.4
+    agent.train_long_memory()
+    other.train_long_memory()
+    for a, b in zip(agent.model.parameters(), other.model.parameters()):
+        assert torch.allclose(a, b)
+
+
+def test_keeps_last_n_and_ignores_partial(workdir):
+    agent = trained_agent(steps=0)
+    manager = CheckpointManager(str(workdir / "ckpt"), keep_last=2)
+    for step in (1, 2, 3):
+        manager.save(agent, step=step)
+    manager.wait()
+    os.makedirs(workdir / "ckpt" / "ckpt-000000009.tmp")  # an interrupted write
+    assert [os.path.basename(p) for p in manager.checkpoints()] == ["ckpt-000000002", "ckpt-000000003"]
+    assert manager.latest().endswith("ckpt-000000003")
+    manager.close()
+
+
+def test_load_without_checkpoint_returns_none(workdir):
+    manager = CheckpointManager(str(workdir / "empty"))
+    assert manager.load(Agent(device=CPU, act_device=CPU)) is None
+    manager.close()
+
+
+def test_save_model_writes_atomically(workdir):
+    agent = trained_agent(steps=0)
+    manager = CheckpointManager(str(workdir / "ckpt"))
+    manager.save_model(agent.model, str(workdir / "model" / "model.pth"))
+    manager.close()
+    assert sorted(os.listdir(workdir / "model")) == ["model.pth"]
+    loaded = torch.load(workdir / "model" / "model.pth", map_location='cpu')
+    assert torch.equal(loaded['linear1.weight'], agent.model.linear1.weight)
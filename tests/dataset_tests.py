@@ -0,0 +1,60 @@
+import json
+import numpy as np
+import pytest
+
+from learning.agent import STATE_SIZE
+from learning.dataset import build_dataset, TransitionDataset, BatchLoader, META_FILE
+from learning.replay import ReplayBuffer, FIELDS
+
+SIZE = 700
+SHARD = 300
+
+@pytest.fixture(scope='module')
+def dataset_dir(tmp_path_factory):
+    path = tmp_path_factory.mktemp('dataset')
+    build_dataset(str(path), SIZE, shard_size=SHARD, seed=5)
+    return path
+
+def test_shards_cover_the_requested_transitions(dataset_dir):
+    meta = json.loads((dataset_dir / META_FILE).read_text())
+    assert [s['size'] for s in meta['shards']] == [300, 300, 100]
+    dataset = TransitionDataset(str(dataset_dir))
+    assert len(dataset) == SIZE
+    states, actions, rewards, next_states, dones = dataset.gather(np.arange(SIZE))
+    assert states.shape == (SIZE, STATE_SIZE) and set(np.unique(actions)) <= {0, 1, 2}
+    # within a shard, each transition starts where the previous one ended unless an episode finished
+    ended = dones[:-1] | (np.arange(1, SIZE) % SHARD == 0)
+    np.testing.assert_array_equal(states[1:][~ended], next_states[:-1][~ended])
+
+def test_content_does_not_depend_on_worker_count(dataset_dir, tmp_path):
+    build_dataset(str(tmp_path), SIZE, num_workers=2, shard_size=SHARD, seed=5)
+    a, b = TransitionDataset(str(dataset_dir)), TransitionDataset(str(tmp_path))
+    for x, y in zip(a.gather(np.arange(SIZE)), b.gather(np.arange(SIZE))):
+        np.testing.assert_array_equal(x, y)
+    with pytest.raises(ValueError):
+        build_dataset(str(tmp_path), 10)
+
+def test_gather_across_shards_matches_the_shard_files(dataset_dir):
+    dataset = TransitionDataset(str(dataset_dir))
+    idx = np.array([650, 2, 299, 300, 2, 601])
+    states, *_ = dataset.gather(idx)
+    expected = [dataset.shards[i // SHARD]['states'][i % SHARD] for i in sorted(idx)]
+    np.testing.assert_array_equal(states, expected)
+
+def test_fill_respects_capacity_and_limit(dataset_dir):
+    dataset = TransitionDataset(str(dataset_dir))
+    memory = ReplayBuffer(capacity=500, state_size=STATE_SIZE)
+    assert dataset.fill(memory) == 500 and len(memory) == 500
+    np.testing.assert_array_equal(memory.states[:500], dataset.gather(np.arange(500))[0])
+    assert dataset.fill(ReplayBuffer(capacity=1000, state_size=STATE_SIZE), limit=350) == 350
+    with pytest.raises(ValueError):
+        dataset.fill(ReplayBuffer(capacity=10, state_size=STATE_SIZE + 1))
+
+def test_loader_batches_are_reproducible(dataset_dir):
+    dataset = TransitionDataset(str(dataset_dir))
+    with BatchLoader(dataset, batch_size=64, seed=3) as a, BatchLoader(dataset, batch_size=64, seed=3) as b:
+        for _ in range(5):
+            batch_a, batch_b = a.next(), next(b)
+            assert [len(x) for x in batch_a] == [64] * len(FIELDS)
+            for x, y in zip(batch_a, batch_b):
+                np.testing.assert_array_equal(x, y)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from game.breakout_sim import breakout_sim, paddle_move, WinState
+from game.constants import SCREEN_SIZE, BRICK_ROWS, BRICK_SIZE, PADDLE_SIZE, BALL_RADIUS, PADDLE_SPEED, SIM_DT
+from learning.agent import to_state_vector
+from learning.encoder import StateEncoder
+
+def make_game():
+    return breakout_sim(size=SCREEN_SIZE, brick_rows=BRICK_ROWS, brick_size=BRICK_SIZE, paddle_size=PADDLE_SIZE,
+                        ball_radius=BALL_RADIUS, paddle_vel=PADDLE_SPEED)
+
+
+def test_encoder_matches_to_state_vector_through_a_game():
+    game = make_game()
+    encoder = StateEncoder(game)
+    moves = [paddle_move.LEFT, paddle_move.RIGHT, paddle_move.STAY]
+    for i in range(3000):
+        game.step(SIM_DT, moves[(i // 50) % 3])
+        np.testing.assert_allclose(encoder.encode(), to_state_vector(game.game_state()), rtol=1e-6)
+        if game.win_state != WinState.ONGOING:
+            break
+    assert game.game_state().num_bricks_broken() > 0
+
+
+def test_encode_into_out_row():
+    game = make_game()
+    encoder = StateEncoder(game)
+    rows = np.zeros((2, encoder.size), dtype=np.float32)
+    result = encoder.encode(out=rows[1])
+    assert result is rows[1] or np.shares_memory(result, rows)
+    assert np.all(rows[0] == 0)
+    np.testing.assert_allclose(rows[1], to_state_vector(game.game_state()), rtol=1e-6)
+
+
+def test_attach_moves_listener_to_new_game():
+    old = make_game()
+    encoder = StateEncoder(old)
+    new = make_game()
+    encoder.attach(new)
+    assert encoder._on_brick_hit not in old.brick_hit_listeners
+    assert encoder._on_brick_hit in new.brick_hit_listeners
+    assert np.all(encoder.encode()[5:] == 1.0)
+
+
+def test_attach_rejects_other_layouts():
+    game = make_game()
+    encoder = StateEncoder(game)
+    other = breakout_sim(size=SCREEN_SIZE, brick_rows=BRICK_ROWS + 1, brick_size=BRICK_SIZE, paddle_size=PADDLE_SIZE,
+                         ball_radius=BALL_RADIUS, paddle_vel=PADDLE_SPEED)
+    with pytest.raises(ValueError):
+        encoder.attach(other)
+    # still tracking the original game
+    assert encoder.game is game and encoder._on_brick_hit in game.brick_hit_listeners
+    assert encoder._on_brick_hit not in other.brick_hit_listeners
+    np.testing.assert_allclose(encoder.encode(), to_state_vector(game.game_state()), rtol=1e-6)
+
+
+def test_encoder_follows_reset_and_restore():
+    game = make_game()
+    encoder = StateEncoder(game)
+    for _ in range(2000):
+        game.step(SIM_DT, paddle_move.STAY)
+    snap = game.snapshot()
+    assert snap.bricks_left < len(game.bricks)
+    game.reset()
+    assert np.all(encoder.encode()[5:] == 1.0)
+    game.restore(snap)
+    np.testing.assert_allclose(encoder.encode(), to_state_vector(game.game_state()), rtol=1e-6)
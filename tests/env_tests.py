@@ -0,0 +1,126 @@
+import numpy as np
+import pytest
+
+from game.breakout_sim import WinState
+from learning.agent import to_state_vector, STATE_SIZE
+from learning.env import BreakoutEnv, SyncVectorEnv, AsyncVectorEnv
+
+STAY = 1
+
+
+def run_episode(env, action=STAY):
+    rewards = []
+    while True:
+        obs, reward, terminated, truncated, info = env.step(action)
+        rewards.append(reward)
+        if terminated or truncated:
+            return obs, rewards, terminated, truncated, info
+
+
+def test_reset_and_step_follow_the_gym_api():
+    env = BreakoutEnv()
+    obs, info = env.reset()
+    assert obs.shape == (STATE_SIZE,) and obs.dtype == np.float32
+    np.testing.assert_allclose(obs, to_state_vector(env.game.game_state()), rtol=1e-6)
+    assert info['win_state'] == WinState.ONGOING
+
+    obs, reward, terminated, truncated, info = env.step(0)
+    np.testing.assert_allclose(obs, to_state_vector(env.game.game_state()), rtol=1e-6)
+    assert isinstance(reward, float) and not terminated and not truncated
+
+
+def test_lost_game_terminates():
+    env = BreakoutEnv(action_repeat=4)
+    env.reset()
+    _, rewards, terminated, truncated, info = run_episode(env, action=0)
+    assert terminated and not truncated
+    assert info['win_state'] == WinState.LOST and rewards[-1] == -1.0
+
+
+def test_time_limit_truncates_without_losing():
+    env = BreakoutEnv(action_repeat=4, max_game_time=1.0)
+    env.reset()
+    _, rewards, terminated, truncated, info = run_episode(env)
+    assert truncated and not terminated
+    assert info['win_state'] == WinState.ONGOING and info['game_time'] >= 1.0
+    assert rewards[-1] != -1.0
+
+
+def test_seeded_resets_are_reproducible():
+    a, b, fixed = BreakoutEnv(), BreakoutEnv(), BreakoutEnv()
+    first_a, _ = a.reset(seed=5)
+    first_b, _ = b.reset(seed=5)
+    np.testing.assert_array_equal(first_a, first_b)
+    np.testing.assert_array_equal(a.reset()[0], b.reset()[0])  # later openings come from the seed too
+    openings = {tuple(a.reset()[0][:4]) for _ in range(10)}
+    assert len(openings) > 1
+    assert {tuple(fixed.reset()[0]) for _ in range(3)} == {tuple(fixed.reset()[0])}
+
+
+def test_action_repeat_must_be_positive():
+    with pytest.raises(ValueError):
+        BreakoutEnv(action_repeat=0)
+
+def test_out_row_receives_observation():
+    env = BreakoutEnv()
+    rows = np.zeros((2, STATE_SIZE), dtype=np.float32)
+    obs, _ = env.reset(out=rows[1])
+    assert np.shares_memory(obs, rows) and np.all(rows[0] == 0)
+
+
+def test_sync_vector_env_matches_single_envs_and_autoresets():
+    vec = SyncVectorEnv(3, action_repeat=4, max_game_time=2.0)
+    singles = [BreakoutEnv(action_repeat=4, max_game_time=2.0) for _ in range(3)]
+    obs, _ = vec.reset(seed=10)
+    for i, env in enumerate(singles):
+        np.testing.assert_array_equal(obs[i], env.reset(seed=10 + i)[0])
+
+    rng = np.random.default_rng(0)
+    finished = 0
+    for _ in range(200):
+        actions = rng.integers(0, 3, 3)
+        obs, rewards, terminated, truncated, info = vec.step(actions)
+        for i, env in enumerate(singles):
+            expected, reward, term, trunc, _ = env.step(int(actions[i]))
+            np.testing.assert_array_equal(info['final_obs'][i], expected)
+            assert (rewards[i], terminated[i], truncated[i]) == (np.float32(reward), term, trunc)
+            if term or trunc:
+                np.testing.assert_array_equal(obs[i], env.reset()[0])
+                finished += 1
+            else:
+                np.testing.assert_array_equal(obs[i], expected)
+    assert finished > 0
+    vec.close()
+
+
+def test_views_are_reused_without_copy():
+    vec = SyncVectorEnv(2, copy=False)
+    obs, _ = vec.reset()
+    next_obs, *_ = vec.step(np.array([0, 2]))
+    assert next_obs is obs
+    vec.close()
+
+
+def test_async_vector_env_matches_sync():
+    rng = np.random.default_rng(1)
+    with SyncVectorEnv(5, action_repeat=4, max_game_time=3.0) as sync, \
+            AsyncVectorEnv(5, num_workers=2, action_repeat=4, max_game_time=3.0) as vec:
+        assert vec.num_workers == 2
+        np.testing.assert_array_equal(sync.reset(seed=3)[0], vec.reset(seed=3)[0])
+        for _ in range(100):
+            actions = rng.integers(0, 3, 5)
+            vec.step_async(actions)
+            expected = sync.step(actions)
+            got = vec.step_wait()
+            for a, b in zip(expected[:4], got[:4]):
+                np.testing.assert_array_equal(a, b)
+            np.testing.assert_array_equal(expected[4]['final_obs'], got[4]['final_obs'])
+
+
+def test_async_step_must_be_collected():
+    with AsyncVectorEnv(2, num_workers=1) as vec:
+        vec.reset()
+        vec.step_async(np.zeros(2, dtype=int))
+        with pytest.raises(RuntimeError):
+            vec.step_async(np.zeros(2, dtype=int))
+        vec.step_wait()
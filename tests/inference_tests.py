@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+import torch
+
+from learning.model import Linear_QNet
+from learning.inference import InferencePolicy
+
+CPU = torch.device('cpu')
+
+def make_model():
+    torch.manual_seed(0)
+    return Linear_QNet(input_size=7, hidden_size=16, output_size=3, device=CPU)
+
+
+def reference(model, states):
+    with torch.no_grad():
+        return model(torch.from_numpy(states)).numpy()
+
+
+@pytest.mark.parametrize("backend", ["eager", "jit", "compile", "numpy"])
+def test_backends_match_model(backend):
+    model = make_model()
+    policy = InferencePolicy(model, backend=backend)
+    states = np.random.default_rng(0).random((32, 7), dtype=np.float32)
+    np.testing.assert_allclose(policy.q_values(states), reference(model, states), rtol=1e-5, atol=1e-6)
+    moves = policy.act(states)
+    assert moves.shape == (32,)
+    assert moves.tolist() == reference(model, states).argmax(axis=1).tolist()
+    assert policy.act_one(states[3]) == moves[3]
+
+
+@pytest.mark.parametrize("backend", ["eager", "jit", "compile", "numpy"])
+def test_sync_picks_up_new_weights(backend):
+    model = make_model()
+    policy = InferencePolicy(model, backend=backend)
+    state = np.zeros(7, dtype=np.float32)
+    with torch.no_grad():
+        model.linear2.bias.copy_(torch.tensor([0.0, 0.0, 100.0]))
+    policy.sync()
+    assert policy.act_one(state) == 2
+
+
+def test_batch_grows_preallocated_input():
+    policy = InferencePolicy(make_model(), backend='eager', max_batch=2)
+    assert policy.act(np.ones((5, 7), dtype=np.float32)).shape == (5,)
+    assert policy.max_batch == 5
+
+
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        InferencePolicy(make_model(), backend='onnx')
@@ -1,10 +1,11 @@
 
+import math
 import pytest
 
 # Import modules under test (absolute import, not relative)
 from physics.circle import circle  # noqa: E402
 from physics.aabb import aabb  # noqa: E402
-from physics.intersections import intersects  # noqa: E402
+from physics.intersections import intersects, time_of_impact  # noqa: E402
 from physics.vec2 import vec2  # noqa: E402
 
 def make_aabb(xmin, ymin, xmax, ymax):
@@ -44,4 +45,54 @@ def test_circle_just_inside_edge_returns_true():
 )
 def test_various_circle_aabb_cases(circ, box, expected):
     assert intersects(circ, box) is expected
-    assert intersects(box, circ) is expected
\ No newline at end of file
+    assert intersects(box, circ) is expected
+
+
+def test_time_of_impact_face_hit():
+    box = make_aabb(0, 0, 10, 10)
+    hit = time_of_impact(make_circle(-5, 5, 1), vec2(8, 0), box)
+    assert hit is not None
+    t, normal = hit
+    assert t == pytest.approx(0.5)
+    assert (normal.x, normal.y) == (-1, 0)
+
+
+def test_time_of_impact_top_face_from_above():
+    box = make_aabb(0, 0, 10, 10)
+    t, normal = time_of_impact(make_circle(5, -10, 2), vec2(0, 20), box)
+    assert t == pytest.approx(0.4)
+    assert (normal.x, normal.y) == (0, -1)
+
+
+def test_time_of_impact_corner_hit():
+    box = make_aabb(0, 0, 10, 10)
+    # moving diagonally towards the (0, 0) corner
+    t, normal = time_of_impact(make_circle(-5, -5, 1), vec2(5, 5), box)
+    d = 5 - 1 / math.sqrt(2)
+    assert t == pytest.approx(d / 5)
+    assert normal.x == pytest.approx(-1 / math.sqrt(2))
+    assert normal.y == pytest.approx(-1 / math.sqrt(2))
+
+
+@pytest.mark.parametrize(
+    "circ,displacement",
+    [
+        (make_circle(-5, 5, 1), vec2(2, 0)),      # stops short
+        (make_circle(-5, 5, 1), vec2(-8, 0)),     # moving away
+        (make_circle(-5, -5, 1), vec2(20, 0)),    # passes above
+        (make_circle(-1.5, -1.5, 1), vec2(3, -3)),  # grazes past the rounded corner
+        (make_circle(5, 5, 1), vec2(1, 0)),       # already overlapping
+    ]
+)
+def test_time_of_impact_misses(circ, displacement):
+    assert time_of_impact(circ, displacement, make_aabb(0, 0, 10, 10)) is None
+
+
+def test_time_of_impact_does_not_tunnel():
+    # Travels far past a thin box in one sweep; the discrete test at the end point misses it
+    box = make_aabb(0, 0, 10, 2)
+    circ = make_circle(5, -10, 1)
+    assert intersects(make_circle(5, 30, 1), box) is False
+    t, normal = time_of_impact(circ, vec2(0, 40), box)
+    assert t == pytest.approx(9 / 40)
+    assert (normal.x, normal.y) == (0, -1)
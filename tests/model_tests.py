@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+import torch
+
+from learning.device import resolve_device, resolve_act_device, DEVICE_ENV_VAR
+from learning.model import Linear_QNet, QTrainer
+
+CPU = torch.device("cpu")
+
+
+def reference_targets(model, gamma, state, action, reward, next_state, done):
+    # The original per-transition loop
+    with torch.no_grad():
+        target = model(state).clone()
+        for idx in range(len(done)):
+            q_new = reward[idx]
+            if not done[idx]:
+                q_new = reward[idx] + gamma * torch.max(model(next_state[idx]))
+            target[idx][torch.argmax(action[idx]).item()] = q_new
+    return target
+
+
+def make_batch(n, state_size, seed=0):
+    rng = np.random.default_rng(seed)
+    states = rng.random((n, state_size), dtype=np.float32)
+    next_states = rng.random((n, state_size), dtype=np.float32)
+    actions = np.eye(3, dtype=np.int64)[rng.integers(0, 3, n)]
+    rewards = rng.choice([-1.0, 0.0, 0.1], n).astype(np.float32)
+    dones = rng.random(n) < 0.3
+    return states, actions, rewards, next_states, dones
+
+
+def test_batched_loss_matches_per_sample_loop():
+    torch.manual_seed(0)
+    model = Linear_QNet(input_size=8, hidden_size=16, output_size=3, device=CPU)
+    trainer = QTrainer(model=model, lr=0.001, gamma=0.9)
+    states, actions, rewards, next_states, dones = make_batch(64, 8)
+
+    expected_target = reference_targets(model, 0.9, torch.tensor(states), torch.tensor(actions), torch.tensor(rewards),
+                                        torch.tensor(next_states), dones)
+    with torch.no_grad():
+        expected_loss = torch.nn.functional.mse_loss(expected_target, model(torch.tensor(states)))
+
+    loss = trainer.train_step(states, actions, rewards, next_states, dones)
+    assert loss.item() == pytest.approx(expected_loss.item(), rel=1e-5)
+
+
+def test_index_and_one_hot_actions_agree():
+    states, actions, rewards, next_states, dones = make_batch(16, 8)
+    losses = []
+    for acts in (actions, actions.argmax(axis=1)):
+        torch.manual_seed(0)
+        model = Linear_QNet(input_size=8, hidden_size=16, output_size=3, device=CPU)
+        trainer = QTrainer(model=model, lr=0.001, gamma=0.9)
+        losses.append(trainer.train_step(states, acts, rewards, next_states, dones).item())
+    assert losses[0] == pytest.approx(losses[1])
+
+
+def test_single_transition():
+    model = Linear_QNet(input_size=8, hidden_size=16, output_size=3, device=CPU)
+    trainer = QTrainer(model=model, lr=0.001, gamma=0.9)
+    states, actions, rewards, next_states, dones = make_batch(1, 8)
+    loss = trainer.train_step(states[0], actions[0], rewards[0], next_states[0], bool(dones[0]))
+    assert loss.dim() == 0
+
+
+def test_hard_target_is_frozen_between_syncs():
+    torch.manual_seed(0)
+    model = Linear_QNet(input_size=8, hidden_size=16, output_size=3, device=CPU)
+    trainer = QTrainer(model=model, lr=0.01, gamma=0.9, target_update='hard', target_sync_every=3)
+    initial = trainer.target_model.linear1.weight.clone()
+    batch = make_batch(16, 8)
+    trainer.train_step(*batch)
+    trainer.train_step(*batch)
+    assert torch.equal(trainer.target_model.linear1.weight, initial)
+    assert not torch.equal(model.linear1.weight, initial)
+    trainer.train_step(*batch)
+    assert torch.equal(trainer.target_model.linear1.weight, model.linear1.weight)
+
+
+def test_polyak_target_moves_by_tau():
+    torch.manual_seed(0)
+    model = Linear_QNet(input_size=8, hidden_size=16, output_size=3, device=CPU)
+    trainer = QTrainer(model=model, lr=0.01, gamma=0.9, target_update='polyak', tau=0.25)
+    before = trainer.target_model.linear2.bias.clone()
+    trainer.train_step(*make_batch(16, 8))
+    expected = before + 0.25 * (model.linear2.bias.detach() - before)
+    assert torch.allclose(trainer.target_model.linear2.bias, expected)
+
+
+def test_double_dqn_bootstrap_uses_online_argmax():
+    torch.manual_seed(0)
+    model = Linear_QNet(input_size=8, hidden_size=16, output_size=3, device=CPU)
+    trainer = QTrainer(model=model, lr=0.01, gamma=0.5, target_update='hard', double_dqn=True)
+    with torch.no_grad():
+        model.linear2.bias.copy_(torch.tensor([0.0, 0.0, 50.0]))                 # online prefers action 2
+        trainer.target_model.linear2.bias.copy_(torch.tensor([100.0, 0.0, 10.0]))  # target would prefer action 0
+    _, _, rewards, next_states, _ = make_batch(4, 8)
+    reward = torch.as_tensor(rewards)
+    next_state = torch.as_tensor(next_states)
+    q = trainer.bootstrap(reward, next_state, torch.zeros(4, dtype=torch.bool))
+    with torch.no_grad():
+        expected = reward + 0.5 * trainer.target_model(next_state)[:, 2]
+    assert torch.allclose(q, expected)
+
+
+def test_gradient_steps_reuse_targets():
+    torch.manual_seed(0)
+    model = Linear_QNet(input_size=8, hidden_size=16, output_size=3, device=CPU)
+    trainer = QTrainer(model=model, lr=0.01, gamma=0.9, target_update='hard', target_sync_every=100)
+    batch = make_batch(32, 8)
+    first = trainer.train_step(*batch).item()
+    last = trainer.train_step(*batch, gradient_steps=20).item()
+    assert trainer.steps == 21
+    assert last < first
+    with pytest.raises(ValueError):
+        trainer.train_step(*batch, gradient_steps=0)
+    assert trainer.steps == 21
+
+
+def test_weighted_loss_and_td_errors():
+    torch.manual_seed(0)
+    model = Linear_QNet(input_size=8, hidden_size=16, output_size=3, device=CPU)
+    trainer = QTrainer(model=model, lr=0.0, gamma=0.9)
+    states, actions, rewards, next_states, dones = make_batch(16, 8)
+    state, next_state = torch.as_tensor(states), torch.as_tensor(next_states)
+    with torch.no_grad():
+        expected = reference_targets(model, 0.9, state, torch.as_tensor(actions), torch.as_tensor(rewards), next_state, dones)
+        pred = model(state)
+    weights = np.linspace(0.1, 1.0, 16, dtype=np.float32)
+
+    loss = trainer.train_step(states, actions, rewards, next_states, dones, weights=weights)
+    per_sample = ((expected - pred) ** 2).mean(dim=1)
+    assert loss.item() == pytest.approx((torch.as_tensor(weights) * per_sample).mean().item(), rel=1e-5)
+    td = (expected - pred)[torch.arange(16), torch.as_tensor(actions.argmax(axis=1))]
+    assert torch.allclose(trainer.last_td_errors, td, atol=1e-6)
+    assert trainer.train_step(states, actions, rewards, next_states, dones, weights=np.ones(16)).item() == \
+        pytest.approx(trainer.train_step(states, actions, rewards, next_states, dones).item(), rel=1e-5)
+
+
+def test_unknown_target_update_rejected():
+    model = Linear_QNet(input_size=4, hidden_size=8, output_size=3, device=CPU)
+    with pytest.raises(ValueError):
+        QTrainer(model=model, lr=0.001, gamma=0.9, target_update='soft')
+
+
+def test_resolve_device_explicit_and_env(monkeypatch):
+    monkeypatch.setenv(DEVICE_ENV_VAR, "cpu")
+    assert resolve_device() == CPU
+    assert resolve_device("cpu") == CPU
+    assert resolve_act_device() == CPU
+
+
+def test_resolve_device_falls_back_without_cuda(monkeypatch):
+    monkeypatch.setattr(torch.cuda, "is_available", lambda: False)
+    assert resolve_device("cuda") == CPU
+    assert resolve_device("auto").type in ("cpu", "mps")
+
+
+def test_trainer_follows_model_device():
+    model = Linear_QNet(input_size=4, hidden_size=8, output_size=3, device=CPU)
+    assert QTrainer(model=model, lr=0.001, gamma=0.9)._device == CPU
@@ -0,0 +1,22 @@
+import queue
+import threading
+import torch
+
+from learning.agent import default_config
+from learning.parallel import train_parallel, _put
+
+def test_put_gives_up_when_stopped():
+    full = queue.Queue(maxsize=1)
+    full.put('waiting')
+    stop = threading.Event()
+    stop.set()
+    assert not _put(full, 'next', stop)
+    stop.clear()
+    full.get()
+    assert _put(full, 'next', stop) and full.get() == 'next'
+
+def test_two_workers_finish_a_few_episodes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the learner saves ./model on a new record
+    train_parallel(num_workers=2, plot_mode='none', seed=0, config=default_config(num_episodes=3, hidden_nodes=32))
+    weights = torch.load(tmp_path / 'model' / 'model.pth')
+    assert weights['linear1.weight'].shape[0] == 32  # the config reaches the learner's model
@@ -113,3 +113,40 @@ def test_dot_with_normalized_is_projection_length_times_length():
     n_b = b.normalize()     # (1,0)
     projection = a.dot(n_b) # should be a.x = 3
     assert projection == pytest.approx(3.0)
+
+
+def test_in_place_mutators_return_self_and_do_not_allocate():
+    a = vec2(1.0, 2.0)
+    b = vec2(3.0, -1.0)
+    assert a.iadd(b) is a
+    assert (a.x, a.y) == (4.0, 1.0)
+    assert a.isub(b) is a
+    assert (a.x, a.y) == (1.0, 2.0)
+    assert a.imul(3) is a
+    assert (a.x, a.y) == (3.0, 6.0)
+    assert a.scale_add(b, 0.5) is a
+    assert a.x == pytest.approx(4.5)
+    assert a.y == pytest.approx(5.5)
+    assert a.set(0.0, -1.0) is a
+    assert (a.x, a.y) == (0.0, -1.0)
+
+
+def test_copy_is_independent():
+    a = vec2(1.0, 2.0)
+    c = a.copy()
+    c.iadd(vec2(1.0, 1.0))
+    assert (a.x, a.y) == (1.0, 2.0)
+    assert (c.x, c.y) == (2.0, 3.0)
+
+
+def test_operators_keep_value_semantics():
+    a = vec2(1.0, 2.0)
+    alias = a
+    a += vec2(1.0, 1.0)
+    assert (alias.x, alias.y) == (1.0, 2.0)
+    assert (a.x, a.y) == (2.0, 3.0)
+
+
+def test_slots_reject_unknown_attributes():
+    with pytest.raises(AttributeError):
+        vec2().z = 1.0
@@ -0,0 +1,61 @@
+import csv
+import pytest
+
+from learning.agent import score
+from learning.plotting import headless_plotter, async_plotter, null_plotter, make_plotter
+
+def _score(percentage_broken: float, time: float) -> score:
+    s = score()
+    s.percentage_broken, s.time = percentage_broken, time
+    return s
+
+def _rows(path) -> list[list[str]]:
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+def test_headless_writes_csv_and_png(tmp_path):
+    p = headless_plotter(out_dir=str(tmp_path), png_interval=3600.0)
+    for i in range(3):
+        p.add_score(_score(10.0 * i, 1.5 + i))
+    p.close()
+    rows = _rows(tmp_path / 'scores.csv')
+    assert rows[0] == ['game', 'percentage_broken', 'time']
+    assert [r[0] for r in rows[1:]] == ['1', '2', '3']
+    assert [float(r[1]) for r in rows[1:]] == [0.0, 10.0, 20.0]
+    assert (tmp_path / 'progress.png').stat().st_size > 0  # the final render ignores png_interval
+
+def test_headless_continues_game_numbers_of_an_existing_log(tmp_path):
+    for games in (2, 3):
+        p = headless_plotter(out_dir=str(tmp_path))
+        for _ in range(games):
+            p.add_score(_score(50.0, 2.0))
+        p.close()
+    rows = _rows(tmp_path / 'scores.csv')
+    assert rows[0] == ['game', 'percentage_broken', 'time'] and rows.count(rows[0]) == 1
+    assert [r[0] for r in rows[1:]] == ['1', '2', '3', '4', '5']
+
+def test_async_plotter_process_exits_on_close(monkeypatch):
+    monkeypatch.setenv('MPLBACKEND', 'Agg')  # inherited by the spawned plotting process
+    p = async_plotter()
+    p.add_score(_score(25.0, 3.0))
+    p.plot()
+    p.close()
+    assert not p._process.is_alive() and p._process.exitcode == 0
+
+def test_null_plotter_ignores_scores(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    p = make_plotter('none')
+    assert isinstance(p, null_plotter)
+    p.add_score(_score(10.0, 1.0))
+    p.plot()
+    p.close()
+    assert list(tmp_path.iterdir()) == []
+
+def test_make_plotter_modes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    p = make_plotter('headless')
+    assert isinstance(p, headless_plotter)
+    p.close()
+    assert (tmp_path / 'plots' / 'scores.csv').exists()
+    with pytest.raises(ValueError):
+        make_plotter('window')
@@ -0,0 +1,61 @@
+import json
+import pytest
+
+import learning.profiling as profiling
+from learning.profiling import train_profiler
+
+def run_steps(stats, n):
+    for _ in range(n):
+        stats.begin_step()
+        stats.lap('sim')
+        stats.lap('act')
+        stats.count('env_steps', 2)
+        stats.end_step()
+
+
+def test_laps_and_counters_accumulate():
+    stats = train_profiler(interval=1e9, log_path=None)
+    run_steps(stats, 5)
+    assert stats.steps == 5
+    assert set(stats.phases) == {'sim', 'act'}
+    assert stats.counters == {'env_steps': 10}
+
+
+def test_summary_logs_json_and_resets_window(tmp_path):
+    log = tmp_path / "stats.jsonl"
+    stats = train_profiler(interval=1e9, log_path=str(log))
+    run_steps(stats, 3)
+    record = stats.summary()
+    assert record['counters'] == {'env_steps': 6}
+    assert record['rates']['env_steps_per_sec'] > 0
+    assert stats.counters == {} and stats.total_counters == {'env_steps': 6}
+    assert stats.summary() is None  # nothing happened since
+    stats.close()
+
+    lines = log.read_text().splitlines()
+    assert len(lines) == 1
+    assert json.loads(lines[0])['step'] == 3
+
+
+def test_cprofile_window_writes_trace(tmp_path, monkeypatch):
+    monkeypatch.setattr(profiling, 'PROFILE_DIR', str(tmp_path))
+    stats = train_profiler(interval=1e9, log_path=None, profile='cprofile', profile_start=2, profile_steps=3)
+    run_steps(stats, 10)
+    stats.close()
+    assert [p.name for p in tmp_path.iterdir()] == ['train-2-5.prof']
+
+
+def test_unknown_profile_mode_rejected():
+    with pytest.raises(ValueError):
+        train_profiler(log_path=None, profile='perf')
+
+
+def test_env_step_reports_sim_reward_and_encode_phases():
+    from learning.env import BreakoutEnv
+    stats = train_profiler(interval=1e9, log_path=None)
+    env = BreakoutEnv(profiler=stats)
+    env.reset()
+    stats.begin_step()
+    env.step(1)
+    stats.end_step()
+    assert set(stats.phases) == {'sim', 'reward', 'encode'}
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+
+from game.breakout_sim import breakout_sim, paddle_move, WinState, SimSnapshot
+from game.vector_sim import vector_sim
+from game.constants import SCREEN_SIZE, BRICK_ROWS, BRICK_SIZE, PADDLE_SIZE, BALL_RADIUS, PADDLE_SPEED, SIM_DT
+from display.raster import (pixel_renderer, vector_pixel_renderer, frame_stack, render_all, BRICK_LEVEL, PADDLE_LEVEL,
+                            BALL_LEVEL)
+
+MOVES = [paddle_move.LEFT, paddle_move.STAY, paddle_move.RIGHT]
+
+def make_game():
+    return breakout_sim(size=SCREEN_SIZE, brick_rows=BRICK_ROWS, brick_size=BRICK_SIZE, paddle_size=PADDLE_SIZE,
+                        ball_radius=BALL_RADIUS, paddle_vel=PADDLE_SPEED)
+
+def play_until_brick_breaks(game):
+    for i in range(20000):
+        game.step(SIM_DT, MOVES[(i // 40) % 3])
+        if game.bricks_left < len(game.bricks) or game.win_state != WinState.ONGOING:
+            break
+    assert game.bricks_left < len(game.bricks)
+
+
+def test_frame_shows_bricks_paddle_and_ball():
+    game = make_game()
+    frame = pixel_renderer(game, height=84, width=84).render()
+    assert frame.shape == (84, 84) and frame.dtype == np.uint8
+    assert (frame == PADDLE_LEVEL).any() and (frame == BALL_LEVEL).any()
+    assert (frame == BRICK_LEVEL).sum() > 0
+    ys, xs = np.nonzero(frame == BALL_LEVEL)
+    assert abs(xs.mean() - 42) <= 1 and abs(ys.mean() - 42) <= 1
+
+
+def test_cached_layer_is_patched_when_a_brick_breaks():
+    game = make_game()
+    renderer = pixel_renderer(game, height=60, width=80)
+    before = renderer.bricks.copy()
+    play_until_brick_breaks(game)
+    np.testing.assert_array_equal(renderer.bricks, pixel_renderer(game, height=60, width=80).bricks)
+    assert (renderer.bricks != before).any()
+
+    game.reset()
+    np.testing.assert_array_equal(renderer.bricks, before)
+
+
+def test_close_stops_tracking():
+    game = make_game()
+    renderer = pixel_renderer(game)
+    renderer.close()
+    assert game.brick_hit_listeners == [] and game.reset_listeners == []
+
+
+def test_render_all_and_out_buffer():
+    games = [make_game() for _ in range(3)]
+    play_until_brick_breaks(games[1])
+    renderers = [pixel_renderer(g) for g in games]
+    batch = render_all(renderers)
+    assert batch.shape == (3, 84, 84)
+    for i, r in enumerate(renderers):
+        np.testing.assert_array_equal(batch[i], r.render())
+    out = np.zeros((84, 84), dtype=np.uint8)
+    assert renderers[0].render(out=out) is out
+
+
+@pytest.mark.parametrize("size", [(84, 84), (48, 64)])
+def test_vector_renderer_matches_per_game_renderer(size):
+    rng = np.random.default_rng(0)
+    vsim = vector_sim(4, size=SCREEN_SIZE, brick_rows=BRICK_ROWS, brick_size=BRICK_SIZE, paddle_size=PADDLE_SIZE,
+                      ball_radius=BALL_RADIUS, paddle_vel=PADDLE_SPEED)
+    renderer = vector_pixel_renderer(vsim, *size)
+    game = make_game()
+    single = pixel_renderer(game, *size)
+    for step in range(3000):
+        vsim.step(SIM_DT, rng.integers(-1, 2, 4))
+        if step % 100:
+            continue
+        frames = renderer.render()
+        for e in range(4):
+            alive = vsim.bricks_alive[e].ravel()
+            mask = sum(1 << int(i) for i in np.flatnonzero(alive))
+            game.restore(SimSnapshot(vsim.ball_pos[e, 0], vsim.ball_pos[e, 1], 0.0, 0.0, vsim.paddle_x[e], mask, 0.0, 0,
+                                     int(alive.sum()), 0))
+            np.testing.assert_array_equal(frames[e], single.render())
+    assert vsim.bricks_alive.sum() < vsim.bricks_alive.size  # bricks were broken along the way
+
+
+def test_frame_stack_keeps_newest_frames_in_order():
+    stack = frame_stack((2, 3), depth=3)
+    for i in range(1, 6):
+        view = stack.push(np.full((2, 3), i))
+    assert view.shape == (3, 2, 3)
+    assert view[:, 0, 0].tolist() == [3, 4, 5]
+    assert stack.reset(np.full((2, 3), 9))[:, 0, 0].tolist() == [9, 9, 9]
+
+
+def test_batched_frame_stack_resets_selected_games():
+    stack = frame_stack((2, 4, 4), depth=2)
+    stack.push(np.stack([np.full((4, 4), 1), np.full((4, 4), 2)]))
+    stack.push(np.stack([np.full((4, 4), 3), np.full((4, 4), 4)]))
+    assert stack.frames().shape == (2, 2, 4, 4)
+    frames = stack.reset(np.stack([np.full((4, 4), 7), np.full((4, 4), 8)]), mask=np.array([False, True]))
+    assert frames[:, :, 0, 0].tolist() == [[1, 3], [8, 8]]
@@ -0,0 +1,102 @@
+import json
+import numpy as np
+import pytest
+
+from game.breakout_sim import breakout_sim, paddle_move, WinState
+from game.constants import SCREEN_SIZE, BRICK_ROWS, BRICK_SIZE, PADDLE_SIZE, BALL_RADIUS, PADDLE_SPEED, TRAIN_SIM_DT
+from game.recording import episode_recorder, episode_recording, INDEX_FILE
+
+MOVES = [paddle_move.LEFT, paddle_move.STAY, paddle_move.RIGHT]
+REPEAT = 2
+
+def make_game():
+    return breakout_sim(size=SCREEN_SIZE, brick_rows=BRICK_ROWS, brick_size=BRICK_SIZE, paddle_size=PADDLE_SIZE,
+                        ball_radius=BALL_RADIUS, paddle_vel=PADDLE_SPEED, continuous=True)
+
+def play(game, recorder, seed, max_steps=2000):
+    """Play one episode, chasing the ball with a few random moves mixed in. Returns the states seen after each step."""
+    rng = np.random.default_rng(seed)
+    game.reset(seed)
+    recorder.begin_episode(seed)
+    trace = []
+    for _ in range(max_steps):
+        dx = game.ball.position.x - game.paddle.position.x
+        move = MOVES[rng.integers(0, 3)] if rng.random() < 0.2 else paddle_move.LEFT if dx < 0 else paddle_move.RIGHT
+        game.step_n(TRAIN_SIM_DT, move, REPEAT)
+        recorder.record(move)
+        trace.append((game.ball.position.x, game.ball.position.y, game.paddle.position.x, game.bricks_left))
+        if game.win_state != WinState.ONGOING:
+            break
+    recorder.end_episode(None if game.win_state != WinState.ONGOING else 'TRUNCATED')
+    return trace
+
+
+@pytest.fixture
+def recorded(tmp_path):
+    game = make_game()
+    recorder = episode_recorder(str(tmp_path), game, dt=TRAIN_SIM_DT, action_repeat=REPEAT, chunk_steps=100)
+    traces = [play(game, recorder, seed) for seed in (1, 2, 3)]
+    recorder.close()
+    return tmp_path, traces
+
+
+def test_episodes_read_back_across_chunks(recorded):
+    path, traces = recorded
+    recording = episode_recording(str(path))
+    assert len(recording) == 3
+    assert len(recording.index['chunks']) > 3  # chunk_steps=100 splits episodes over several chunks
+    for i, trace in enumerate(traces):
+        steps = recording.steps(i)
+        assert recording.episodes[i]['seed'] == i + 1
+        assert len(steps['move']) == len(trace)
+        got = np.column_stack([steps['ball_x'], steps['ball_y'], steps['paddle_x'], steps['bricks_left']])
+        np.testing.assert_array_equal(got, np.array(trace))
+
+
+def test_brick_hits_are_recorded_per_episode(recorded):
+    path, traces = recorded
+    recording = episode_recording(str(path))
+    for i, trace in enumerate(traces):
+        hits = recording.hits(i)
+        bricks_left = np.array([t[3] for t in trace])
+        broken_at = np.flatnonzero(np.diff(np.concatenate([[len(make_game().bricks)], bricks_left])))
+        assert sorted(set(hits[:, 0].tolist())) == broken_at.tolist()
+        assert len(hits) == recording.episodes[i]['bricks_broken']
+        assert len(set(hits[:, 1].tolist())) == len(hits)
+
+
+def test_resimulation_reproduces_and_detects_tampering(recorded):
+    path, _ = recorded
+    recording = episode_recording(str(path))
+    assert [recording.resimulate(i) for i in range(len(recording))] == [None, None, None]
+
+    del recording  # drop its memory maps before rewriting a chunk
+    moves_file = sorted(path.glob("chunk-*.move.npy"))[0]
+    moves = np.load(moves_file)
+    moves[10] = -moves[10] if moves[10] else 1
+    np.save(moves_file, moves)
+    assert episode_recording(str(path)).resimulate(0) == 10
+
+
+def test_recorder_appends_and_rejects_other_setups(recorded):
+    path, _ = recorded
+    game = make_game()
+    recorder = episode_recorder(str(path), game, dt=TRAIN_SIM_DT, action_repeat=REPEAT, chunk_steps=100)
+    play(game, recorder, seed=4)
+    recorder.close()
+    recording = episode_recording(str(path))
+    assert len(recording) == 4 and recording.resimulate(3) is None
+    with pytest.raises(ValueError):
+        episode_recorder(str(path), game, dt=TRAIN_SIM_DT, action_repeat=REPEAT + 1)
+
+
+def test_index_only_lists_flushed_episodes(tmp_path):
+    game = make_game()
+    recorder = episode_recorder(str(tmp_path), game, dt=TRAIN_SIM_DT, action_repeat=REPEAT, chunk_steps=10**6)
+    play(game, recorder, seed=1)
+    recorder.flush()
+    recorder.begin_episode(2)  # started but nothing played: not recorded
+    recorder.close()
+    index = json.loads((tmp_path / INDEX_FILE).read_text())
+    assert len(index['episodes']) == 1 and len(index['chunks']) == 1
+    assert index['episodes'][0]['steps'] == index['chunks'][0]['steps']
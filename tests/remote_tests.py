@@ -0,0 +1,97 @@
+import threading
+import numpy as np
+import pytest
+
+import display.remote as remote
+from display.remote import remote_display, _apply_snapshot, _read_snapshot, _sim_config, SEQ
+from game.breakout_sim import breakout_sim, paddle_move
+from game.constants import SCREEN_SIZE, BRICK_ROWS, BRICK_SIZE, PADDLE_SIZE, BALL_RADIUS, PADDLE_SPEED, TRAIN_SIM_DT
+
+class _no_process:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def start(self):
+        pass
+
+    def join(self, timeout=None):
+        pass
+
+    def is_alive(self):
+        return False
+
+class _inline_context:
+    """Stands in for the spawn context so remote_display's writer side runs without a render process."""
+    Event = staticmethod(threading.Event)
+    Process = _no_process
+
+class _recording_display:
+    def __init__(self):
+        self.invalidated = []
+        self.resets = 0
+
+    def invalidate_brick(self, b):
+        self.invalidated.append(b.index)
+
+    def reset(self, game):
+        self.resets += 1
+
+@pytest.fixture
+def writer(monkeypatch):
+    monkeypatch.setattr(remote.mp, 'get_context', lambda method: _inline_context)
+    game = breakout_sim(size=SCREEN_SIZE, brick_rows=BRICK_ROWS, brick_size=BRICK_SIZE, paddle_size=PADDLE_SIZE,
+                        ball_radius=BALL_RADIUS, paddle_vel=PADDLE_SPEED, continuous=True)
+    disp = remote_display(game)
+    yield game, disp
+    disp.close()
+
+def _play_until_hit(game: breakout_sim):
+    start = game.bricks_left
+    for _ in range(20000):
+        move = paddle_move.LEFT if game.ball.position.x < game.paddle.position.x else paddle_move.RIGHT
+        game.step_n(TRAIN_SIM_DT, move, 1)
+        if game.bricks_left < start:
+            return
+    pytest.fail("no brick was hit")
+
+def test_snapshot_tracks_brick_hits_and_resets(writer):
+    game, disp = writer
+    replica = breakout_sim(**_sim_config(game))
+    alive = np.ones(len(replica.bricks), dtype=bool)
+    shown = _recording_display()
+    frame = np.empty_like(disp.snapshot)
+
+    _play_until_hit(game)
+    assert disp.snapshot[SEQ] % 2 == 0  # brick flags go through the seqlock too
+    disp.render()
+    assert _read_snapshot(disp.snapshot, frame)
+    _apply_snapshot(frame, replica, alive, shown)
+    hit = [b.index for b in game.bricks if not b.alive]
+    assert sorted(shown.invalidated) == hit and shown.resets == 0
+    assert [b.alive for b in replica.bricks] == [b.alive for b in game.bricks]
+    assert replica.ball.position.x == game.ball.position.x and replica.bricks_left == game.bricks_left
+
+    game.reset()
+    assert _read_snapshot(disp.snapshot, frame)
+    _apply_snapshot(frame, replica, alive, shown)
+    assert shown.resets == 1 and all(b.alive for b in replica.bricks)
+    assert replica.paddle.position.x == game.paddle.position.x
+
+def test_reader_rejects_frames_written_during_the_copy(writer):
+    _, disp = writer
+    frame = np.empty_like(disp.snapshot)
+    disp._begin_write()
+    assert not _read_snapshot(disp.snapshot, frame)  # writer mid-update
+    disp.render()
+    assert _read_snapshot(disp.snapshot, frame)
+
+    class racing:
+        """Snapshot whose writer completes a whole update while the reader copies it."""
+        def __getitem__(self, i):
+            return disp.snapshot[i]
+
+        def __array__(self, dtype=None, copy=None):
+            disp.render()
+            return disp.snapshot
+
+    assert not _read_snapshot(racing(), frame)
@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+import torch
+
+from learning.replay import ReplayBuffer, PrioritizedReplayBuffer, SumTree
+
+def fill(buffer, n, start=0):
+    for i in range(start, start + n):
+        state = np.full(buffer.state_size, i, dtype=np.float32)
+        buffer.append(state, i % 3, float(i), state + 1, i % 5 == 0)
+
+
+def test_append_stores_fields():
+    buffer = ReplayBuffer(capacity=4, state_size=2)
+    slot = buffer.append(np.array([1.0, 2.0]), np.array([0, 0, 1]), 0.5, np.array([3.0, 4.0]), True)
+    assert slot == 0
+    assert len(buffer) == 1
+    assert buffer.states[0].tolist() == [1.0, 2.0]
+    assert buffer.next_states[0].tolist() == [3.0, 4.0]
+    assert buffer.actions[0] == 2  # one-hot stored as its index
+    assert buffer.rewards[0] == pytest.approx(0.5)
+    assert buffer.dones[0]
+
+
+def test_ring_overwrites_oldest():
+    buffer = ReplayBuffer(capacity=3, state_size=1)
+    fill(buffer, 5)
+    assert len(buffer) == 3
+    assert sorted(buffer.rewards.tolist()) == [2.0, 3.0, 4.0]
+
+
+def test_small_buffer_samples_everything():
+    buffer = ReplayBuffer(capacity=10, state_size=1)
+    fill(buffer, 4)
+    states, actions, rewards, next_states, dones = buffer.sample(8)
+    assert rewards.tolist() == [0.0, 1.0, 2.0, 3.0]
+
+
+def test_sample_is_consistent_across_fields():
+    buffer = ReplayBuffer(capacity=100, state_size=3, seed=0)
+    fill(buffer, 100)
+    states, actions, rewards, next_states, dones = buffer.sample(32)
+    assert states.shape == (32, 3) and states.dtype == np.float32
+    assert actions.dtype == np.int8 and dones.dtype == bool
+    assert np.all(states[:, 0] == rewards)
+    assert np.all(next_states == states + 1)
+    assert np.all(actions == rewards.astype(int) % 3)
+    assert np.all(dones == (rewards.astype(int) % 5 == 0))
+
+
+def test_sample_tensors_on_cpu():
+    buffer = ReplayBuffer(capacity=10, state_size=2, seed=0)
+    fill(buffer, 10)
+    states, actions, rewards, next_states, dones = buffer.sample_tensors(4, torch.device('cpu'))
+    assert states.shape == (4, 2) and states.dtype == torch.float32
+    assert actions.dtype == torch.int8
+    assert dones.dtype == torch.bool
+
+
+def test_extend_wraps_like_repeated_append():
+    appended = ReplayBuffer(capacity=5, state_size=2)
+    extended = ReplayBuffer(capacity=5, state_size=2)
+    fill(appended, 3)
+    fill(extended, 3)
+    states = np.arange(8, dtype=np.float32).reshape(4, 2)
+    for i in range(4):
+        appended.append(states[i], i % 3, float(i), states[i] * 2, False)
+    extended.extend(states, np.arange(4) % 3, np.arange(4, dtype=np.float32), states * 2, np.zeros(4, dtype=bool))
+    assert len(extended) == len(appended) == 5
+    for field in ("states", "next_states", "actions", "rewards", "dones"):
+        assert np.array_equal(getattr(extended, field), getattr(appended, field))
+    appended.append(states[0], 0, 0.0, states[0], False)
+    extended.append(states[0], 0, 0.0, states[0], False)
+    assert np.array_equal(extended.states, appended.states)
+
+
+def test_state_dict_round_trip_keeps_order_and_sampler():
+    buffer = ReplayBuffer(capacity=4, state_size=1, seed=3)
+    fill(buffer, 6)  # wrapped: holds transitions 2..5
+    state = buffer.state_dict()
+    assert state['rewards'].tolist() == [2.0, 3.0, 4.0, 5.0]
+
+    restored = ReplayBuffer(capacity=4, state_size=1, seed=99)
+    restored.load_state_dict(state)
+    assert len(restored) == 4
+    assert sorted(restored.rewards.tolist()) == [2.0, 3.0, 4.0, 5.0]
+    assert buffer.sample_indices(2).tolist() == restored.sample_indices(2).tolist()
+    fill(restored, 1, start=6)  # overwrites the oldest (2)
+    assert sorted(restored.rewards.tolist()) == [3.0, 4.0, 5.0, 6.0]
+
+
+def test_sum_tree_totals_and_find():
+    tree = SumTree(5)
+    tree.update(np.arange(5), np.array([1.0, 2.0, 3.0, 0.0, 4.0]))
+    assert tree.total == pytest.approx(10.0)
+    assert tree.find(np.array([0.0, 0.99, 1.0, 2.5, 5.99, 6.0, 9.99])).tolist() == [0, 0, 1, 1, 2, 4, 4]
+    tree.update(np.array([4, 4]), np.array([7.0, 0.5]))  # last write wins
+    assert tree.total == pytest.approx(6.5)
+    assert tree[np.array([4])].tolist() == [0.5]
+
+
+def test_prioritized_sampling_follows_priorities():
+    buffer = PrioritizedReplayBuffer(capacity=4, state_size=1, seed=0, alpha=1.0, eps=0.0)
+    fill(buffer, 4)
+    buffer.update_priorities(np.arange(4), np.array([1.0, 0.0, 0.0, 3.0]))
+    counts = np.zeros(4)
+    for _ in range(200):
+        idx, weights, (states, *_rest) = buffer.sample_prioritized(4)
+        counts += np.bincount(idx, minlength=4)
+        assert np.array_equal(states[:, 0], idx.astype(np.float32))
+        assert weights.max() == pytest.approx(1.0) and (weights > 0).all()
+    assert counts[1] == counts[2] == 0
+    assert counts[3] / counts.sum() == pytest.approx(0.75, abs=0.02)
+
+
+def test_importance_weights_favour_rare_samples():
+    buffer = PrioritizedReplayBuffer(capacity=4, state_size=1, seed=0, alpha=1.0, beta=1.0, eps=0.0)
+    fill(buffer, 4)
+    buffer.update_priorities(np.arange(4), np.array([2.0, 2.0, 4.0, 0.0]))
+    idx, weights, _ = buffer.sample_prioritized(4)  # one draw from each quarter of the total priority
+    assert idx.tolist() == [0, 1, 2, 2]
+    assert weights.tolist() == pytest.approx([1.0, 1.0, 0.5, 0.5])
+
+
+def test_new_transitions_get_max_priority():
+    buffer = PrioritizedReplayBuffer(capacity=8, state_size=1, alpha=1.0, eps=0.0)
+    fill(buffer, 2)
+    buffer.update_priorities(np.array([0, 1]), np.array([5.0, 0.5]))
+    buffer.extend(np.zeros((2, 1), np.float32), np.zeros(2), np.zeros(2, np.float32), np.zeros((2, 1), np.float32),
+                  np.zeros(2, bool))
+    buffer.append(np.zeros(1), 0, 0.0, np.zeros(1), False)
+    assert buffer.tree[np.arange(5)].tolist() == [5.0, 0.5, 5.0, 5.0, 5.0]
+
+
+def test_prioritized_state_dict_round_trip():
+    buffer = PrioritizedReplayBuffer(capacity=4, state_size=1, seed=3, alpha=1.0, eps=0.0)
+    fill(buffer, 6)  # wrapped: holds transitions 2..5 in slots 2, 3, 0, 1
+    buffer.update_priorities(np.arange(4), np.array([4.0, 5.0, 2.0, 3.0]))
+    buffer.beta = 0.7
+    state = buffer.state_dict()
+    assert state['priorities'].tolist() == [2.0, 3.0, 4.0, 5.0]
+
+    restored = PrioritizedReplayBuffer(capacity=4, state_size=1, seed=99)
+    fill(restored, 4)
+    restored.load_state_dict(state)
+    assert restored.beta == 0.7
+    assert restored.tree.total == pytest.approx(14.0)
+    assert [restored.tree[i] for i in range(4)] == [restored.rewards[i] for i in range(4)]
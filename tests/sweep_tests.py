@@ -0,0 +1,46 @@
+import csv
+
+from learning.agent import TrainConfig, default_config, NUM_EPISODES
+from learning.sweep import SweepRunner, SuccessiveHalving, grid
+
+def test_grid_is_the_cartesian_product():
+    assert grid(lr=[1, 2], gamma=[3]) == [dict(lr=1, gamma=3), dict(lr=2, gamma=3)]
+
+def test_default_config_follows_the_module_constants(monkeypatch):
+    import learning.agent as agent_module
+    monkeypatch.setattr(agent_module, 'NUM_EPISODES', NUM_EPISODES + 7)
+    assert default_config().num_episodes == NUM_EPISODES + 7
+    assert default_config(lr=0.5).lr == 0.5
+    assert TrainConfig().num_episodes == NUM_EPISODES
+
+def test_successive_halving_keeps_the_top_fraction():
+    halving = SuccessiveHalving(max_episodes=30, min_episodes=2, eta=3)
+    assert halving.rungs == [2, 6, 18]
+    assert halving.report(1, 0.0)  # not a rung
+    assert halving.report(2, 5.0)  # first to arrive always continues
+    assert not halving.report(2, 1.0)
+    assert halving.report(2, 9.0)
+    assert not halving.report(2, 4.0)
+    assert halving.report(6, 0.0)
+
+def test_sweep_stops_laggards_and_reports_failures(tmp_path):
+    trials = [dict(lr=1e-3), dict(lr=1e-4), dict(target_update='bogus')]
+    for t in trials:
+        t.update(num_episodes=3, hidden_nodes=16)
+    runner = SweepRunner(trials, str(tmp_path), max_parallel=2, min_episodes=1, eta=2)
+    assert runner.halving.rungs == [1, 2]
+    runner.halving.results[1] = [100.0, 100.0]  # earlier trials that did far better
+    rows = runner.run()
+
+    by_trial = {r['trial']: r for r in rows}
+    assert by_trial[2]['status'] == 'failed' and 'bogus' in runner.trials[2]['error']
+    assert rows[-1]['trial'] == 2
+    for i in (0, 1):
+        assert by_trial[i]['status'] == 'stopped' and by_trial[i]['episodes'] == 1
+        assert (tmp_path / f'trial-{i:03d}' / 'checkpoints').is_dir()
+    with open(tmp_path / 'results.csv') as f:
+        results = list(csv.DictReader(f))
+    # a stopped trial finishes the game it was playing when told
+    assert sorted(int(r['trial']) for r in results) == [0, 0, 1, 1]
+    with open(tmp_path / 'trials.csv') as f:
+        assert {r['target_update'] for r in csv.DictReader(f)} == {'', 'bogus'}
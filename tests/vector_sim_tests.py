@@ -0,0 +1,79 @@
+import random
+
+import numpy as np
+import pytest
+
+from game.breakout_sim import breakout_sim, paddle_move, WinState
+from game.vector_sim import vector_sim
+from game.constants import SCREEN_SIZE, BRICK_ROWS, BRICK_SIZE, PADDLE_SIZE, BALL_RADIUS, PADDLE_SPEED, SIM_DT
+
+MOVES = [paddle_move.LEFT, paddle_move.STAY, paddle_move.RIGHT]
+
+def make_scalar():
+    return breakout_sim(size=SCREEN_SIZE, brick_rows=BRICK_ROWS, brick_size=BRICK_SIZE, paddle_size=PADDLE_SIZE,
+                        ball_radius=BALL_RADIUS, paddle_vel=PADDLE_SPEED)
+
+def make_vector(n):
+    return vector_sim(n, size=SCREEN_SIZE, brick_rows=BRICK_ROWS, brick_size=BRICK_SIZE, paddle_size=PADDLE_SIZE,
+                      ball_radius=BALL_RADIUS, paddle_vel=PADDLE_SPEED)
+
+
+def test_initial_state_matches_scalar_sim():
+    game = make_scalar()
+    vsim = make_vector(3)
+    assert vsim.bricks_alive.sum() == 3 * len(game.bricks)
+    assert np.all(vsim.ball_pos == [game.ball.position.x, game.ball.position.y])
+    assert np.all(vsim.paddle_x == game.paddle.position.x)
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_matches_scalar_sim_with_random_actions(seed):
+    rng = random.Random(seed)
+    n = 4
+    games = [make_scalar() for _ in range(n)]
+    vsim = make_vector(n)
+
+    for _ in range(3000):
+        moves = [rng.choice(MOVES) for _ in range(n)]
+        win_state, bricks_hit = vsim.step(SIM_DT, np.array([m.value for m in moves]))
+        for i, game in enumerate(games):
+            alive_before = sum(b.alive for b in game.bricks)
+            game.step(SIM_DT, moves[i])
+            assert bricks_hit[i] == (sum(b.alive for b in game.bricks) < alive_before)
+            assert win_state[i] == game.win_state.value
+            if game.win_state != WinState.ONGOING:
+                games[i] = make_scalar()
+                game = games[i]
+            assert vsim.ball_pos[i, 0] == game.ball.position.x
+            assert vsim.ball_pos[i, 1] == game.ball.position.y
+            assert vsim.ball_vel[i, 0] == game.ball.velocity.x
+            assert vsim.ball_vel[i, 1] == game.ball.velocity.y
+            assert vsim.paddle_x[i] == game.paddle.position.x
+            assert list(vsim.bricks_alive[i].ravel()) == [b.alive for b in game.bricks]
+
+
+def test_finished_games_auto_reset():
+    vsim = make_vector(2)
+    vsim.ball_pos[0] = (100, SCREEN_SIZE.y - 1)
+    vsim.ball_vel[0] = (0, 100)
+    vsim.bricks_alive[0, 0, 0] = False
+    win_state, _ = vsim.step(SIM_DT, np.zeros(2, dtype=np.int64))
+    assert win_state[0] == WinState.LOST.value
+    assert win_state[1] == WinState.ONGOING.value
+    assert vsim.bricks_alive[0].all()
+    assert vsim.game_time[0] == 0.0
+    assert vsim.game_time[1] == pytest.approx(SIM_DT)
+
+
+def test_clearing_every_brick_wins():
+    vsim = make_vector(2)
+    vsim.bricks_alive[0] = False
+    vsim.bricks_alive[0, -1, 0] = True
+    vsim.bricks_left[0] = 1
+    vsim.ball_pos[0] = (20, vsim.brick_y1[-1] + BALL_RADIUS - 1)
+    vsim.ball_vel[0] = (0, -100)
+    win_state, bricks_hit = vsim.step(SIM_DT, np.zeros(2, dtype=np.int64))
+    assert bricks_hit[0]
+    assert win_state[0] == WinState.WON.value
+    assert win_state[1] == WinState.ONGOING.value
+    assert vsim.bricks_left[0] == vsim.bricks_alive[0].size
@@ -1,9 +1,70 @@
-from learning.agent import train
+from learning.agent import (train, ACTION_REPEAT, PLOT_MODE, INFERENCE_BACKEND, TARGET_UPDATE, TARGET_SYNC_EVERY, TARGET_TAU,
+                            LONG_GRADIENT_STEPS)
+from learning.model import TARGET_UPDATE_MODES
+from learning.inference import INFERENCE_BACKENDS
+from learning.checkpoint import CHECKPOINT_DIR, CHECKPOINT_EVERY
+from learning.plotting import PLOT_MODES
+from learning.profiling import PROFILE_MODES, STATS_INTERVAL, STATS_LOG
+from learning.parallel import train_parallel
 import argparse
 
+# Options the actor/learner trainer (--workers) has no equivalent for
+SINGLE_PROCESS_FLAGS = ('--gui', '--gui-process', '--act-device', '--stats-interval', '--stats-log', '--profile', '--inference',
+                        '--checkpoint-dir', '--checkpoint-every', '--resume', '--record', '--dataset', '--offline-steps',
+                        '--offline-only')
+
 if __name__ == '__main__':
     parser = argparse.ArgumentParser(description="Train the Breakout agent.")
     parser.add_argument('--gui', action='store_true', help='Enable GUI display during training')
+    parser.add_argument('--gui-process', action='store_true', help='With --gui, render in a separate process instead of the training loop')
+    parser.add_argument('--action-repeat', type=int, default=ACTION_REPEAT, help='Sim ticks to repeat each chosen action for')
+    parser.add_argument('--device', default=None, help="Training device: cuda, cuda:N, mps, cpu or auto (default: $BREAKOUT_DEVICE or auto)")
+    parser.add_argument('--act-device', default=None, help="Device for action selection (default: $BREAKOUT_ACT_DEVICE or cpu)")
+    parser.add_argument('--threads', type=int, default=None, help="torch intra-op threads (default: $BREAKOUT_NUM_THREADS or min(4, cores))")
+    parser.add_argument('--workers', type=int, default=0, help='Actor processes feeding a central learner (0 = single-process training)')
+    parser.add_argument('--plot', choices=PLOT_MODES, default=PLOT_MODE,
+                        help='gui: live window in its own process, headless: CSV log + periodic PNG in ./plots, none: off')
+    parser.add_argument('--stats-interval', type=float, default=STATS_INTERVAL, help='Seconds between per-phase timing summaries')
+    parser.add_argument('--stats-log', default=STATS_LOG, help='JSON-lines file for the timing summaries ("" to disable)')
+    parser.add_argument('--profile', choices=PROFILE_MODES, default='none',
+                        help='Record a cProfile or torch.profiler trace of a window of training steps into ./profiles')
+    parser.add_argument('--inference', choices=INFERENCE_BACKENDS, default=INFERENCE_BACKEND,
+                        help='Action selection backend (numpy is fastest for CPU acting; compile has a slow first call)')
+    parser.add_argument('--checkpoint-dir', default=CHECKPOINT_DIR, help='Where training checkpoints are kept')
+    parser.add_argument('--checkpoint-every', type=int, default=CHECKPOINT_EVERY, help='Games between checkpoints (0 = only at the end)')
+    parser.add_argument('--resume', action='store_true', help='Continue from the latest checkpoint in --checkpoint-dir')
+    parser.add_argument('--target-update', choices=TARGET_UPDATE_MODES, default=TARGET_UPDATE,
+                        help='Bootstrap from the online model (none) or a target network updated by copy (hard) or averaging (polyak)')
+    parser.add_argument('--target-sync-every', type=int, default=TARGET_SYNC_EVERY, help='Gradient steps between hard target updates')
+    parser.add_argument('--tau', type=float, default=TARGET_TAU, help='Polyak averaging step for --target-update polyak')
+    parser.add_argument('--double-dqn', action='store_true', help='Use double-DQN bootstrap targets')
+    parser.add_argument('--long-gradient-steps', type=int, default=LONG_GRADIENT_STEPS,
+                        help='Gradient steps per long-memory batch, reusing its bootstrap targets')
+    parser.add_argument('--prioritized', action='store_true', help='Sample long-memory batches by TD error (prioritized replay)')
+    parser.add_argument('--record', default=None, metavar='DIR', help='Record every episode into DIR (see replay_episode.py)')
+    parser.add_argument('--dataset', default=None, metavar='DIR', help='Pre-fill replay memory from an offline dataset (see build_dataset.py)')
+    parser.add_argument('--offline-steps', type=int, default=0, help='With --dataset, long-memory batches streamed from it before playing')
+    parser.add_argument('--offline-only', action='store_true', help='With --dataset, stop after the offline batches instead of playing')
     args = parser.parse_args()
+    if args.action_repeat < 1:
+        parser.error("--action-repeat must be at least 1")
+    if args.long_gradient_steps < 1:
+        parser.error("--long-gradient-steps must be at least 1")
 
-    train(args.gui)
\ No newline at end of file
+    if args.workers > 0:
+        dests = {flag: flag.lstrip('-').replace('-', '_') for flag in SINGLE_PROCESS_FLAGS}
+        unsupported = [flag for flag, dest in dests.items() if getattr(args, dest) != parser.get_default(dest)]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} can't be combined with --workers (single-process training only)")
+        train_parallel(num_workers=args.workers, action_repeat=args.action_repeat, device=args.device, num_threads=args.threads,
+                       plot_mode=args.plot, target_update=args.target_update, target_sync_every=args.target_sync_every,
+                       tau=args.tau, double_dqn=args.double_dqn, long_gradient_steps=args.long_gradient_steps,
+                       prioritized=args.prioritized)
+    else:
+        train(args.gui, action_repeat=args.action_repeat, device=args.device, act_device=args.act_device, num_threads=args.threads,
+              plot_mode=args.plot, display_process=args.gui_process, stats_interval=args.stats_interval,
+              stats_log=args.stats_log or None, profile=args.profile, inference_backend=args.inference,
+              checkpoint_dir=args.checkpoint_dir, checkpoint_every=args.checkpoint_every, resume=args.resume,
+              target_update=args.target_update, target_sync_every=args.target_sync_every, tau=args.tau, double_dqn=args.double_dqn,
+              long_gradient_steps=args.long_gradient_steps, prioritized=args.prioritized, record_dir=args.record,
+              dataset_dir=args.dataset, offline_steps=args.offline_steps, offline_only=args.offline_only)
\ No newline at end of file